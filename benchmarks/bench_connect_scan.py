@@ -0,0 +1,94 @@
+"""
+asyncio TCP connect 사전 스캔 벤치마크 (로컬 리스너 팜)
+
+127.0.0.1의 포트 범위에 N개의 리스너를 열어두고
+- 동시 연결 수(concurrency)별 처리량(probes/s)과 첫 발견까지 걸린 시간
+- 설치되어 있으면 nmap -sT 전체 시간
+을 비교. --blackhole 로 응답 없는 주소를 함께 스캔해 적응형/고정 대기 시간 차이도 측정
+
+    python benchmarks/bench_connect_scan.py --ports 20000-29999 --listeners 200
+    python benchmarks/bench_connect_scan.py --concurrency 100 500 1000
+    python benchmarks/bench_connect_scan.py --blackhole 10.255.255.1 --ports 20000-20499
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.container.connect_scan import ConnectScanner, expand_ports
+
+
+async def open_listeners(ports: list, count: int) -> list:
+    """포트 범위 안에서 비어 있는 포트 count개에 리스너 생성"""
+    async def accept(reader, writer):
+        writer.close()
+
+    servers = []
+    for port in random.sample(ports, len(ports)):
+        if len(servers) >= count:
+            break
+        try:
+            servers.append(await asyncio.start_server(accept, "127.0.0.1", port))
+        except OSError:
+            continue
+    return servers
+
+
+def run_nmap(ports: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(["nmap", "-sT", "-Pn", "-n", "-T4", "-p", ports, "127.0.0.1"], capture_output=True)
+    return time.perf_counter() - start
+
+
+async def main_async(args):
+    ports = expand_ports(args.ports)
+    servers = await open_listeners(ports, args.listeners)
+    expected = sorted(s.sockets[0].getsockname()[1] for s in servers)
+    print(f"listener farm: {len(expected)} open ports in {args.ports} ({len(ports)} ports)")
+
+    print(f"{'concurrency':>12} {'seconds':>9} {'probes/s':>10} {'first open':>11} {'found':>7}")
+    for concurrency in args.concurrency:
+        scanner = ConnectScanner(concurrency=concurrency)
+        result = await scanner.scan("127.0.0.1", args.ports)
+        found = result["open"].get("127.0.0.1", [])
+        assert found == expected, f"missed {len(set(expected) - set(found))} ports"
+        print(f"{scanner.concurrency:>12} {result['seconds']:>9.2f} {result['probes_per_second']:>10} "
+              f"{result['first_open_seconds']:>10.3f}s {len(found):>7}")
+
+    if args.blackhole:
+        # 같은 스캔에 응답 없는 호스트를 섞어 대기 시간 정책 비교
+        print(f"\nwith unresponsive host {args.blackhole} (concurrency {args.concurrency[-1]}):")
+        for adaptive in (False, True):
+            scanner = ConnectScanner(concurrency=args.concurrency[-1], adaptive=adaptive)
+            result = await scanner.scan(f"127.0.0.1 {args.blackhole}", args.ports)
+            print(f"  {'adaptive' if adaptive else 'fixed':>8} timeout: {result['seconds']:.2f}s "
+                  f"(filtered {result['counts']['filtered']}, first open {result['first_open_seconds']}s)")
+
+    if shutil.which("nmap"):
+        print(f"\nnmap -sT -T4: {run_nmap(args.ports):.2f}s")
+    else:
+        print("\nnmap not installed - skipping nmap comparison")
+
+    for server in servers:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio TCP connect scan throughput against local listeners")
+    parser.add_argument("--ports", default="20000-29999", help="Port range to scan on 127.0.0.1")
+    parser.add_argument("--listeners", type=int, default=200, help="Number of listening ports in the range")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--blackhole", default="", help="Unresponsive address to add (e.g. 10.255.255.1)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+command_execution 호출당 컨테이너 확인 오버헤드 마이크로벤치마크
+
+기존 방식(docker ps 3회) vs ContainerManager 캐시 방식 비교
+Docker가 없는 환경에서는 --fake-docker 로 가짜 docker CLI를 사용
+
+    python benchmarks/bench_container_check.py --calls 50
+    python benchmarks/bench_container_check.py --calls 50 --fake-docker
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.container.manager import ContainerManager
+
+CONTAINER_NAME = "attacker"
+
+FAKE_DOCKER = """#!/bin/sh
+# 벤치마크용 가짜 docker CLI - 프로세스 생성 비용만 재현
+# FAKE_DOCKER_DELAY=0.03 처럼 지정하면 호출마다 CLI 기동 지연을 흉내냄
+[ -n "$FAKE_DOCKER_DELAY" ] && sleep "$FAKE_DOCKER_DELAY"
+case "$1" in
+  ps) echo "CONTAINER ID   NAMES"; echo "0123456789ab   attacker" ;;
+  inspect) echo "true" ;;
+  start) echo "$2" ;;
+  events) exec sleep 3600 ;;
+  exec) shift 2; exec "$@" ;;
+esac
+"""
+
+
+def legacy_check() -> None:
+    """기존 command_execution의 사전 확인 (docker ps 3회)"""
+    run = lambda args: subprocess.run(args, capture_output=True, text=True, encoding="utf-8", errors="ignore")
+    run(["docker", "ps"])
+    run(["docker", "ps", "-a", "--filter", f"name={CONTAINER_NAME}"])
+    running = run(["docker", "ps", "--filter", f"name={CONTAINER_NAME}"])
+    if CONTAINER_NAME not in running.stdout:
+        run(["docker", "start", CONTAINER_NAME])
+
+
+def measure(label: str, check, calls: int) -> float:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        check()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    mean = statistics.mean(samples)
+    print(f"{label:<22} mean {mean:8.3f} ms   p50 {statistics.median(samples):8.3f} ms   "
+          f"max {max(samples):8.3f} ms")
+    return mean
+
+
+def install_fake_docker() -> str:
+    bin_dir = tempfile.mkdtemp(prefix="fake-docker-")
+    path = os.path.join(bin_dir, "docker")
+    with open(path, "w") as f:
+        f.write(FAKE_DOCKER)
+    os.chmod(path, 0o755)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+    return bin_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Container check overhead per command_execution call")
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--fake-docker", action="store_true", help="Use a stub docker CLI instead of the real one")
+    args = parser.parse_args()
+
+    if args.fake_docker:
+        print(f"Using fake docker CLI: {install_fake_docker()}")
+
+    manager = ContainerManager(CONTAINER_NAME)
+    error = manager.ensure_running()
+    if error:
+        print(error)
+        return
+
+    print(f"Per-call pre-exec overhead over {args.calls} calls")
+    before = measure("legacy (3x docker ps)", legacy_check, args.calls)
+    after = measure("cached manager", manager.ensure_running, args.calls)
+    print(f"speedup: {before / max(after, 1e-6):.0f}x   stats: {manager.get_stats()}")
+    manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+AsyncResolver.resolve_many 벤치마크 (로컬 가짜 DNS 서버)
+
+FakeDNSServer에 N개의 이름을 등록하고 일부는 NXDOMAIN/SERVFAIL/잘린 응답(TC)/첫 UDP 질의 무시로 설정해
+- clean: 정상 응답만 있을 때 동시 질의 수별 처리량 (names/s)
+- faults: 재시도(응답 없음), TCP 전환(TC 비트), SERVFAIL 처리
+- failover: 첫 네임서버가 SERVFAIL만 주거나 응답하지 않을 때 다음 네임서버로 넘어가는지
+를 측정하고 결과가 서버 설정과 일치하는지 확인
+
+    python benchmarks/bench_dns_resolver.py --names 5000
+    python benchmarks/bench_dns_resolver.py --concurrency 50 200 1000 --query-timeout 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.container.dns_resolver import AsyncResolver
+from src.utils.container.fake_dns import FakeDNSServer
+
+DOMAIN = "bench.example"
+
+
+def make_zone(count: int, seed: int = 7) -> dict:
+    """이름 목록과 이름별 기대 결과 (A 레코드 / NXDOMAIN / SERVFAIL / 잘린 응답 / 첫 질의 무시)"""
+    rng = random.Random(seed)
+    names = [f"host{i}.{DOMAIN}" for i in range(count)]
+    records, nxdomain, servfail, truncate, drop = {}, [], [], [], []
+    for i, name in enumerate(names):
+        kind = rng.random()
+        if kind < 0.10:
+            nxdomain.append(name)
+            continue
+        if kind < 0.15:
+            servfail.append(name)
+            continue
+        records[name] = {"A": [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"]}
+        if kind < 0.20:
+            truncate.append(name)
+        elif kind < 0.25:
+            drop.append(name)
+    return {
+        "names": names, "records": records, "nxdomain": nxdomain,
+        "servfail": servfail, "truncate": truncate, "drop": drop,
+    }
+
+
+def check(result: dict, zone: dict) -> None:
+    """resolve_many 결과가 서버 설정과 같은지 확인"""
+    expected = {name: {"A": answers["A"]} for name, answers in zone["records"].items()}
+    assert result["resolved"] == expected, f"resolved mismatch ({len(result['resolved'])}/{len(expected)})"
+    assert sorted(result["nxdomain"]) == sorted(zone["nxdomain"]), "nxdomain mismatch"
+    assert result["errors"] == {name: "SERVFAIL" for name in zone["servfail"]}, "servfail mismatch"
+
+
+async def run(nameservers: list, names: list, concurrency: int, args) -> tuple:
+    resolver = AsyncResolver(nameservers, timeout=args.query_timeout, retries=args.retries, concurrency=concurrency)
+    try:
+        start = time.perf_counter()
+        result = await resolver.resolve_many(names, ["A"])
+        return result, time.perf_counter() - start
+    finally:
+        resolver.close()
+
+
+def row(label: str, result: dict, seconds: float, server: FakeDNSServer) -> str:
+    stats = result["stats"]
+    return (f"{label:>18} {seconds:>8.2f} {stats['names'] / seconds:>9.0f} {stats['queries']:>8} "
+            f"{stats['retries']:>8} {stats['tcp_fallbacks']:>5} {server.stats['udp_queries']:>8} "
+            f"{server.stats['tcp_queries']:>5}")
+
+
+async def main_async(args):
+    zone = make_zone(args.names)
+    names = zone["names"]
+    print(f"zone: {len(names)} names, {len(zone['records'])} with A records, {len(zone['nxdomain'])} NXDOMAIN, "
+          f"{len(zone['servfail'])} SERVFAIL, {len(zone['truncate'])} truncated, {len(zone['drop'])} dropped once")
+    print(f"{'scenario':>18} {'seconds':>8} {'names/s':>9} {'queries':>8} {'retries':>8} {'tcp':>5} "
+          f"{'srv udp':>8} {'srv tcp':>5}")
+
+    # 정상 응답만: 동시 질의 수별 처리량
+    clean_zone = {**zone, "servfail": [], "nxdomain": zone["nxdomain"] + zone["servfail"]}
+    for concurrency in args.concurrency:
+        with FakeDNSServer(zone["records"]) as server:
+            result, seconds = await run([server.address], names, concurrency, args)
+            check(result, clean_zone)
+            assert result["stats"]["retries"] == 0, "responses were lost (socket receive buffer overflow)"
+            print(row(f"clean c={concurrency}", result, seconds, server))
+
+    concurrency = args.concurrency[-1]
+
+    # 재시도 / TCP 전환 / SERVFAIL
+    with FakeDNSServer(zone["records"], servfail=zone["servfail"], truncate=zone["truncate"], drop=zone["drop"]) as server:
+        result, seconds = await run([server.address], names, concurrency, args)
+        check(result, zone)
+        assert result["stats"]["tcp_fallbacks"] == len(zone["truncate"]), "truncated answers were not retried over TCP"
+        assert server.stats["dropped"] == len(zone["drop"]), "dropped queries were not retried"
+        print(row("faults", result, seconds, server))
+
+    # 첫 네임서버가 고장난 경우 다음 네임서버로
+    for label, broken in (("failover servfail", {"rcode": "SERVFAIL"}), ("failover silent", {"silent": True})):
+        with FakeDNSServer(**broken) as bad, FakeDNSServer(zone["records"]) as good:
+            result, seconds = await run([bad.address, good.address], names, concurrency, args)
+            check(result, clean_zone)
+            assert result["stats"]["retries"] == len(names), "queries did not move to the next nameserver"
+            print(row(label, result, seconds, good))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AsyncResolver.resolve_many throughput against a local stub DNS server")
+    parser.add_argument("--names", type=int, default=2000, help="Number of names in the zone")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--query-timeout", type=float, default=0.5, help="Per-query timeout (dropped/silent cases)")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+실행 백엔드 비교 벤치마크 - docker CLI vs Docker Engine API (연결 풀)
+
+기본값은 Docker 없이 동작하도록 가짜 docker CLI / 가짜 Engine 소켓을 사용
+(프로토콜/연결 재사용 검증용 - 가짜 CLI는 Go 바이너리 기동 비용이 없어 수치 비교 의미 없음)
+실제 지연 시간 비교는 --real (attacker 컨테이너 필요)
+
+    python benchmarks/bench_exec_backend.py --calls 50
+    python benchmarks/bench_exec_backend.py --calls 50 --real
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_container_check import install_fake_docker
+from src.utils.container.backend import CLIBackend, EngineAPIBackend
+from src.utils.container.engine import DEFAULT_SOCKET_PATH
+from src.utils.container.fake_engine import FakeDockerEngine
+
+CONTAINER_NAME = "attacker"
+COMMAND = ["sh", "-c", "echo out; echo err >&2"]
+
+
+def measure(label: str, backend, calls: int) -> float:
+    result = backend.exec(CONTAINER_NAME, COMMAND)
+    assert result.returncode == 0 and result.stdout.strip() == "out", result
+
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        backend.exec(CONTAINER_NAME, COMMAND)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    mean = statistics.mean(samples)
+    print(f"{label:<12} mean {mean:8.3f} ms   p50 {statistics.median(samples):8.3f} ms   "
+          f"max {max(samples):8.3f} ms")
+    return mean
+
+
+def main():
+    parser = argparse.ArgumentParser(description="docker CLI vs Engine API exec latency")
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--real", action="store_true", help="Use the real docker CLI and daemon socket")
+    args = parser.parse_args()
+
+    engine = None
+    if args.real:
+        socket_path = os.getenv("DOCKER_SOCKET", DEFAULT_SOCKET_PATH)
+    else:
+        print("[fake mode] stub CLI and fake engine - use --real for meaningful latency numbers")
+        install_fake_docker()
+        engine = FakeDockerEngine().start()
+        socket_path = engine.socket_path
+
+    try:
+        print(f"exec latency over {args.calls} calls: {COMMAND}")
+        cli = measure("docker CLI", CLIBackend(), args.calls)
+        api_backend = EngineAPIBackend(socket_path)
+        api = measure("Engine API", api_backend, args.calls)
+        print(f"speedup: {cli / max(api, 1e-6):.1f}x   client stats: {api_backend.client.get_stats()}")
+    finally:
+        if engine is not None:
+            engine.stop()
+
+
+if __name__ == "__main__":
+    main()
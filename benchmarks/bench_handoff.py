@@ -0,0 +1,196 @@
+"""
+에이전트 핸드오프 비용 벤치마크 (대화 기록 길이별)
+
+- reducer: 기록 길이마다 핸드오프 Command의 messages 업데이트 크기(메시지 수, 직렬화 KB - 체크포인트에
+  기록되는 양)와 부모 상태에 add_messages로 반영하는 시간
+  "append 1" 열은 메시지 하나만 추가할 때의 기준값, "overhead" 열은 핸드오프 반영 시간에서 기준값을 뺀 값
+- graph: 가짜 모델 두 에이전트로 만든 swarm(InMemorySaver)에서 사용자 턴마다 핸드오프 1회를 실행하며
+  기록이 길어질 때 턴당 시간 측정
+
+기존 방식(전체 기록 + 도구 메시지)과 현재 방식(현재 에이전트 턴 메시지 + 도구 메시지)을 비교
+현재 방식에서 일정한 것은 업데이트 크기와 기준값 대비 overhead뿐이고, 반영 시간 자체와 그래프 턴당 시간은
+add_messages가 매번 기존 기록 전체를 훑으므로 두 방식 모두 기록 길이에 비례해 늘어남
+
+    python benchmarks/bench_handoff.py --history 100 1000 5000 20000
+    python benchmarks/bench_handoff.py --graph --turns 400
+"""
+
+import argparse
+import statistics
+import sys
+import os
+import time
+import uuid
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import InjectedToolCallId, tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.graph.message import add_messages
+from langgraph.prebuilt import InjectedState, create_react_agent
+from langgraph.types import Command
+from typing_extensions import Annotated
+
+from src.utils.swarm.handoff import METADATA_KEY_HANDOFF_DESTINATION, create_handoff_tool
+from src.utils.swarm.swarm import create_swarm
+
+
+def create_legacy_handoff_tool(*, agent_name: str, name: str):
+    """이전 구현: 전체 기록을 다시 보내는 핸드오프 도구 (비교용)"""
+
+    @tool(name, description=f"Transfer to {agent_name}")
+    def handoff_to_agent(
+        state: Annotated[dict, InjectedState],
+        tool_call_id: Annotated[str, InjectedToolCallId],
+    ):
+        tool_message = ToolMessage(
+            content=f"Successfully transferred to {agent_name}", name=name, tool_call_id=tool_call_id,
+        )
+        return Command(
+            goto=agent_name,
+            graph=Command.PARENT,
+            update={"messages": state["messages"] + [tool_message], "active_agent": agent_name},
+        )
+
+    handoff_to_agent.metadata = {METADATA_KEY_HANDOFF_DESTINATION: agent_name}
+    return handoff_to_agent
+
+
+def make_history(length: int) -> list:
+    """사용자/AI/도구 메시지가 섞인 ID 있는 대화 기록 (마지막은 에이전트 턴을 시작한 사용자 메시지)"""
+    messages = []
+    while len(messages) < length:
+        call_id = uuid.uuid4().hex
+        messages += [
+            HumanMessage(content="scan the next host " * 10, id=uuid.uuid4().hex),
+            AIMessage(content="", tool_calls=[{"name": "nmap", "args": {"target": "10.0.0.1"}, "id": call_id}], id=uuid.uuid4().hex),
+            ToolMessage(content="22/tcp open ssh\n" * 20, tool_call_id=call_id, id=uuid.uuid4().hex),
+            AIMessage(content="Found ssh. " * 20, id=uuid.uuid4().hex),
+        ]
+    return messages[:length - 1] + [HumanMessage(content="now hand off to the planner", id=uuid.uuid4().hex)]
+
+
+def agent_turn() -> list:
+    """핸드오프 직전 에이전트 턴: 도구 호출 1회 후 핸드오프 도구 호출"""
+    call_id = uuid.uuid4().hex
+    return [
+        AIMessage(content="", tool_calls=[{"name": "nmap", "args": {"target": "10.0.0.2"}, "id": call_id}], id=uuid.uuid4().hex),
+        ToolMessage(content="80/tcp open http\n" * 20, tool_call_id=call_id, id=uuid.uuid4().hex),
+        AIMessage(content="", tool_calls=[{"name": "transfer_to_planner", "args": {}, "id": "handoff"}], id=uuid.uuid4().hex),
+    ]
+
+
+def run_handoff(handoff_tool, messages: list) -> Command:
+    return handoff_tool.func(state={"messages": messages}, tool_call_id="handoff")
+
+
+def median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def bench_reducer(lengths: list, repeat: int) -> None:
+    serde = JsonPlusSerializer()
+    tools = {
+        "full history": create_legacy_handoff_tool(agent_name="Planner", name="transfer_to_planner"),
+        "turn only": create_handoff_tool(agent_name="Planner", name="transfer_to_planner"),
+    }
+    print(f"{'history':>8} {'append 1 ms':>12} {'handoff':>13} {'update msgs':>12} {'update KB':>10} "
+          f"{'reducer ms':>11} {'overhead ms':>12}")
+    for length in lengths:
+        parent = make_history(length)
+        subgraph_messages = parent + agent_turn()
+        baseline = median_ms(lambda: add_messages(parent, [AIMessage(content="ok", id=uuid.uuid4().hex)]), repeat)
+        for label, handoff_tool in tools.items():
+            command = run_handoff(handoff_tool, subgraph_messages)
+            merged = add_messages(parent, command.update["messages"])
+            assert len(merged) == len(subgraph_messages) + 1, "handoff lost messages"
+            update = command.update["messages"]
+            size = len(serde.dumps_typed(update)[1]) / 1024
+            reducer = median_ms(
+                lambda: add_messages(parent, run_handoff(handoff_tool, subgraph_messages).update["messages"]), repeat,
+            )
+            print(f"{length:>8} {baseline:>12.2f} {label:>13} {len(update):>12} {size:>10.1f} "
+                  f"{reducer:>11.2f} {reducer - baseline:>12.2f}")
+    print("\nreducer ms grows with history for both variants: add_messages scans the whole existing list "
+          "on every update. Only the update size and the overhead over a one-message append stay flat.")
+
+
+class HandoffModel(BaseChatModel):
+    """사용자 메시지를 받으면 다른 에이전트로 핸드오프, 그 외에는 바로 답하는 가짜 모델"""
+
+    target: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "handoff-bench"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if isinstance(messages[-1], HumanMessage):
+            call = {"name": f"transfer_to_{self.target.lower()}", "args": {}, "id": uuid.uuid4().hex}
+            message = AIMessage(content="", tool_calls=[call])
+        else:
+            message = AIMessage(content="Done. " * 20)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def build_swarm(handoff_factory):
+    agents = [
+        create_react_agent(
+            HandoffModel(target=target),
+            tools=[handoff_factory(agent_name=target, name=f"transfer_to_{target.lower()}")],
+            name=name,
+        )
+        for name, target in (("Planner", "Reconnaissance"), ("Reconnaissance", "Planner"))
+    ]
+    return create_swarm(agents, default_active_agent="Planner").compile(checkpointer=InMemorySaver())
+
+
+def bench_graph(turns: int, report_every: int) -> None:
+    factories = {"full history": create_legacy_handoff_tool, "turn only": create_handoff_tool}
+    results = {}
+    for label, factory in factories.items():
+        app = build_swarm(factory)
+        config = {"configurable": {"thread_id": label}}
+        samples = []
+        for turn in range(1, turns + 1):
+            start = time.perf_counter()
+            state = app.invoke({"messages": [HumanMessage(content=f"turn {turn}")]}, config)
+            samples.append(time.perf_counter() - start)
+            if turn % report_every == 0:
+                results.setdefault(turn, {})[label] = (len(state["messages"]), statistics.median(samples[-report_every:]))
+    print(f"{'turn':>6} {'messages':>9} {'full history ms':>16} {'turn only ms':>13}")
+    for turn, row in results.items():
+        messages = row["turn only"][0]
+        assert row["full history"][0] == messages, "handoff variants diverged"
+        print(f"{turn:>6} {messages:>9} {row['full history'][1] * 1000:>16.2f} {row['turn only'][1] * 1000:>13.2f}")
+    print("\nPer-turn time grows with history for both variants (add_messages and checkpointing scan the full list).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Handoff state update cost as conversation history grows")
+    parser.add_argument("--history", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--graph", action="store_true", help="Also run handoffs through a compiled swarm")
+    parser.add_argument("--turns", type=int, default=400, help="User turns (one handoff each) for --graph")
+    args = parser.parse_args()
+
+    bench_reducer(args.history, args.repeat)
+    if args.graph:
+        print()
+        bench_graph(args.turns, max(1, args.turns // 8))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+terminal.command_exec 명령당 지연 시간 벤치마크
+
+- 기존 방식: send-keys / wait-for / cat status / cat output / rm (docker exec 5회)
+- 단일 exec 방식: src.utils.container.tmux.run_in_session (docker exec 1회)
+
+기본은 가짜 docker CLI + 로컬 tmux 사용 (--delay 로 docker CLI 기동 지연 흉내)
+줄어드는 것은 docker exec 기동 횟수뿐이므로 차이는 exec 기동 지연이 클 때만 나타남
+(--delay 없이는 차이 없음, --delay 0.03에서 약 211ms → 192ms)
+실제 컨테이너 대상 비교는 --real (attacker 컨테이너 필요)
+
+    python benchmarks/bench_session_exec.py --calls 30
+    python benchmarks/bench_session_exec.py --calls 30 --delay 0.03
+    python benchmarks/bench_session_exec.py --calls 30 --real
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_container_check import install_fake_docker
+from src.utils.container.backend import CLIBackend
+from src.utils.container.tmux import run_in_session
+
+CONTAINER_NAME = "attacker"
+SESSION_ID = "bench-session"
+COMMAND = "echo hello; ls / | head -3"
+
+
+async def legacy_session_exec(backend: CLIBackend, session_id: str, command: str) -> str:
+    """기존 command_exec와 동일한 파일 폴링 방식"""
+    run = lambda args: backend.aexec(CONTAINER_NAME, args)
+    channel = f"done-{session_id}-{uuid.uuid4().hex[:8]}"
+    timestamp = int(time.time())
+    output_file = f"/tmp/cmd_output_{session_id}_{timestamp}.txt"
+    status_file = f"/tmp/cmd_status_{session_id}_{timestamp}.txt"
+
+    full_command = f"({command}) > {output_file} 2>&1; echo $? > {status_file}; tmux wait-for -S {channel}"
+    await run(["tmux", "send-keys", "-t", session_id, full_command, "Enter"])
+    await run(["tmux", "wait-for", channel])
+    status = await run(["cat", status_file])
+    output = await run(["cat", output_file])
+    await run(["rm", "-f", output_file, status_file])
+    if int(status.stdout.strip()) != 0:
+        raise Exception(f"Command failed with exit code {status.stdout.strip()}")
+    return output.stdout.strip()
+
+
+async def single_exec(backend: CLIBackend, session_id: str, command: str) -> str:
+    exit_code, output = await run_in_session(backend, CONTAINER_NAME, session_id, command)
+    if exit_code != 0:
+        raise Exception(f"Command failed with exit code {exit_code}")
+    return output.strip()
+
+
+async def measure(label: str, func, backend: CLIBackend, calls: int) -> float:
+    expected = await legacy_session_exec(backend, SESSION_ID, COMMAND)
+    result = await func(backend, SESSION_ID, COMMAND)
+    assert result == expected, (result, expected)
+
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await func(backend, SESSION_ID, COMMAND)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    mean = statistics.mean(samples)
+    print(f"{label:<14} mean {mean:8.3f} ms   p50 {statistics.median(samples):8.3f} ms   "
+          f"max {max(samples):8.3f} ms")
+    return mean
+
+
+async def main_async(args):
+    backend = CLIBackend()
+    await backend.aexec(CONTAINER_NAME, ["tmux", "kill-session", "-t", SESSION_ID])
+    created = await backend.aexec(CONTAINER_NAME, ["tmux", "new-session", "-d", "-s", SESSION_ID])
+    assert created.returncode == 0, created.stderr
+
+    try:
+        print(f"per-command latency over {args.calls} calls: '{COMMAND}'")
+        legacy = await measure("file polling", legacy_session_exec, backend, args.calls)
+        single = await measure("single exec", single_exec, backend, args.calls)
+        print(f"speedup: {legacy / max(single, 1e-6):.1f}x")
+    finally:
+        await backend.aexec(CONTAINER_NAME, ["tmux", "kill-session", "-t", SESSION_ID])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="terminal command_exec latency: file polling vs single exec")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated docker CLI start-up delay (fake mode)")
+    parser.add_argument("--real", action="store_true", help="Use the real docker CLI and attacker container")
+    args = parser.parse_args()
+
+    if not args.real:
+        install_fake_docker()
+        if args.delay:
+            os.environ["FAKE_DOCKER_DELAY"] = str(args.delay)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+MCP 도구 동시 호출 처리량 벤치마크
+
+N개의 호출자가 동시에 같은 도구를 부를 때
+- 기존 동기 핸들러 (이벤트 루프에서 subprocess.run → 직렬화)
+- 비동기 핸들러 (CommandRunner + create_subprocess_exec)
+의 처리량(calls/s)을 비교. 기본은 가짜 docker CLI 사용
+
+    python benchmarks/bench_tool_concurrency.py --callers 1 4 16 --work 0.2
+    python benchmarks/bench_tool_concurrency.py --limit 4   # 도구 동시 실행 제한 적용
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from bench_container_check import install_fake_docker
+from src.utils.container.backend import CLIBackend
+from src.utils.container.execution import CommandRunner, ToolLimits
+from src.utils.container.manager import ContainerManager
+from src.utils.container.singleflight import SingleFlight
+
+CONTAINER_NAME = "attacker"
+
+
+def sync_tool(command: str) -> str:
+    """기존 동기 도구 핸들러와 동일한 실행 방식"""
+    result = subprocess.run(
+        ["docker", "exec", CONTAINER_NAME, "sh", "-c", command],
+        capture_output=True, text=True, encoding="utf-8", errors="ignore"
+    )
+    return result.stdout.strip()
+
+
+async def run_sync_handlers(callers: int, command: str) -> float:
+    # FastMCP는 동기 도구를 이벤트 루프에서 직접 호출하므로 호출들이 직렬화됨
+    async def call():
+        return sync_tool(command)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(callers)))
+    return time.perf_counter() - start
+
+
+async def run_async_handlers(runner: CommandRunner, callers: int, command: str) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(runner.run(command, tool="nmap") for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+    assert all(r == "done" for r in results), results[:3]
+    return elapsed
+
+
+async def main_async(args):
+    backend = CLIBackend()
+    limits = ToolLimits({"nmap": args.limit} if args.limit else {})
+    manager = ContainerManager(CONTAINER_NAME, backend)
+    # 같은 명령을 동시에 보내므로 병합(single-flight)을 끄고 실제 동시 실행을 측정
+    runner = CommandRunner(CONTAINER_NAME, backend=backend, manager=manager, limits=limits,
+                           flights=SingleFlight(enabled=False))
+    command = f"sleep {args.work}; echo done"
+
+    print(f"each call: '{command}'   nmap limit: {limits.limit_for('nmap')}")
+    print(f"{'callers':>8} {'sync calls/s':>14} {'async calls/s':>15} {'speedup':>9}")
+    for callers in args.callers:
+        sync_elapsed = await run_sync_handlers(callers, command)
+        async_elapsed = await run_async_handlers(runner, callers, command)
+        print(f"{callers:>8} {callers / sync_elapsed:>14.2f} {callers / async_elapsed:>15.2f} "
+              f"{sync_elapsed / async_elapsed:>8.1f}x")
+    manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent MCP tool call throughput")
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--work", type=float, default=0.2, help="Seconds of work per call")
+    parser.add_argument("--limit", type=int, default=0, help="Concurrency limit for the tool (0 = default)")
+    parser.add_argument("--real", action="store_true", help="Use the real docker CLI")
+    args = parser.parse_args()
+
+    if not args.real:
+        install_fake_docker()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -36,13 +36,15 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 # Decepticon imports
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from src.utils.llm.models import (
     list_available_models, 
     check_ollama_connection,
     validate_api_key
 )
 from src.graphs.swarm import create_dynamic_swarm  # 동적 swarm 생성 함수 import
+from src.utils.llm.configurable import with_model
+from src.utils.mcp.mcp_loader import get_mcp_registry
+from src.utils.mcp.session_manager import get_mcp_sessions
 from src.utils.llm.config_manager import (
     update_llm_config, 
     get_current_llm_config,
@@ -211,6 +213,10 @@ class DecepticonCLI:
             self.tools_config = {}  # 초기화
             root = Tree("[bold cyan]📦 MCP Agents & Tools[/bold cyan]", guide_style="bold bright_blue")
 
+            # 모든 서버를 동시에 조회 (결과는 에이전트 생성 시 그대로 재사용)
+            registry = get_mcp_registry()
+            discovered = await registry.discover(list(self.agents_config))
+
             for agent_name, agent_info in self.agents_config.items():
                 agent_node = root.add(f"[bold green]🧠 Agent:[/bold green] {agent_name}")
 
@@ -218,13 +224,7 @@ class DecepticonCLI:
                     agent_node.add("[dim italic]⚠️  No MCP servers configured[/dim italic]")
                     continue
 
-                for server_name, server_config in agent_info["servers"].items():
-                    if "transport" not in server_config:
-                        server_config["transport"] = "streamable_http" if "url" in server_config else "stdio"
-
-                    client = MultiServerMCPClient({server_name: server_config})
-                    tools = await client.get_tools() if client else []
-
+                for server_name, (server_config, tools) in discovered.get(agent_name, {}).items():
                     server_node = agent_node.add(f"[bold yellow]🖥️  Server:[/bold yellow] {server_name}")
                     if "url" in server_config:
                         server_node.add(f"[dim]🌐  URL: {server_config['url']}[/dim]")
@@ -240,7 +240,9 @@ class DecepticonCLI:
                                 "agent": agent_name,
                             }
                     else:
-                        server_node.add("[yellow]⚠️ No tools available (MCP server might be offline)[/yellow]")
+                        error = registry.error(server_name, server_config)
+                        detail = f": {markup.escape(error)}" if error else " (MCP server might be offline)"
+                        server_node.add(f"[yellow]⚠️ No tools available{detail}[/yellow]")
 
             self.console.print(Panel(
                 Group(root),
@@ -394,6 +396,8 @@ class DecepticonCLI:
                 # LLM 인스턴스 생성
                 status.update("[bold green]Loading LLM instance...")
                 self.current_llm = get_current_llm()
+                # 이 세션에서 사용할 모델 (swarm은 실행 시 config로 모델 선택)
+                self.config = with_model(self.config, model_info)
                 
                 status.update("[bold green]Memory configuration updated!")
                 time.sleep(0.5)
@@ -483,14 +487,33 @@ class DecepticonCLI:
                         server_node.add(f"[dim]URL: {server_config['url']}[/dim]")
                     
                     # 실제 도구 목록 표시
-                    if self.tools_config:
+                    # 이 에이전트/서버에서 조회된 도구만 표시
+                    server_tools = [
+                        info for info in self.tools_config.values()
+                        if info["agent"] == agent_name and info["server"] == server_name
+                    ]
+                    if server_tools:
                         tools_node = server_node.add("[bold magenta]Available Tools[/bold magenta]")
-                        for tool_name, tool_info in self.tools_config.items():
+                        for tool_info in server_tools:
                             tools_node.add(f"[white]  {tool_info['display_name']}[/white]")
                     else:
                         server_node.add("[yellow]No tools loaded yet[/yellow]")
             
             self.console.print(root)
+
+            # 서버별 도구 호출 지연 시간 (장기 MCP 세션)
+            session_stats = get_mcp_sessions().get_stats()
+            if session_stats:
+                table = Table(title="MCP Tool Call Latency", box=box.ROUNDED)
+                for column in ("Server", "Calls", "Errors", "Reconnects", "p50", "p95", "p99", "Max"):
+                    table.add_column(column, justify="left" if column == "Server" else "right")
+                for label, stats in session_stats.items():
+                    latency = stats["latency"]
+                    table.add_row(
+                        label, str(stats["calls"]), str(stats["errors"]), str(stats["reconnects"]),
+                        *(f"{latency[k]:g}ms" if latency[k] is not None else "-" for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms")),
+                    )
+                self.console.print(table)
                 
         except Exception as e:
             self.console.print(Panel(
@@ -683,7 +706,7 @@ class DecepticonCLI:
         # 모델 변경 진행
         old_model_name = self.current_model['display_name'] if self.current_model else "Previous Model"
         
-        with Status("[bold green]Changing model and recreating agents...", console=self.console) as status:
+        with Status("[bold green]Changing model...", console=self.console) as status:
             try:
                 # 메모리 설정 업데이트
                 status.update("[bold green]Updating model configuration...")
@@ -700,9 +723,11 @@ class DecepticonCLI:
                 status.update("[bold green]Loading new LLM instance...")
                 self.current_llm = get_current_llm()
                 
-                # 새로운 모델로 에이전트들 재생성
-                status.update("[bold green]Recreating AI agents with new model...")
-                self.swarm = await create_dynamic_swarm()
+                # 에이전트는 다시 만들지 않고 실행 config의 모델만 교체
+                self.config = with_model(self.config, new_model_info)
+                if self.swarm is None:
+                    status.update("[bold green]Creating AI agents...")
+                    self.swarm = await create_dynamic_swarm()
                 
                 # 모델 변경 후 새로운 로깅 세션 시작
                 if self.logging_session_id:
@@ -875,12 +900,18 @@ class DecepticonCLI:
             main_task = progress.add_task("[bold green]🤖 Working...", total=None)
 
             try:
-                async for namespace, output in self.swarm.astream(
+                async for namespace, mode, output in self.swarm.astream(
                     inputs,
-                    stream_mode="updates",
+                    stream_mode=["updates", "custom"],
                     config=self.config if self.config else None,  # type: ignore
                     subgraphs=True
                 ):
+                    # 실행 중인 도구의 중간 출력은 흐리게 표시만 하고 보관하지 않음
+                    if mode == "custom":
+                        if isinstance(output, dict) and output.get("type") == "tool_output":
+                            progress.console.print(Text(output.get("content", "").rstrip("\n"), style="dim"))
+                        continue
+
                     step_count += 1
                     event_count += 1  # ✅ 이벤트 카운트 증가
 
@@ -10,7 +10,8 @@ from typing import Dict, Any, List, Optional
 from frontend.web.utils.constants import (
     CSS_PATH_TERMINAL,
     CSS_CLASS_TERMINAL_CONTAINER,
-    CSS_CLASS_MAC_TERMINAL_HEADER
+    CSS_CLASS_MAC_TERMINAL_HEADER,
+    TERMINAL_STREAM_MAX_CHARS
 )
 
 
@@ -20,6 +21,9 @@ class TerminalUIComponent:
     def __init__(self):
         """컴포넌트 초기화"""
         self.placeholder = None
+        # 실행 중인 도구의 실시간 출력 엔트리
+        self._stream_entry: Optional[Dict[str, Any]] = None
+        self._stream_text = ""
     
     def apply_terminal_css(self):
         """터미널 CSS 스타일 적용"""
@@ -244,9 +248,82 @@ class TerminalUIComponent:
     
     def clear_terminal(self):
         """터미널 디스플레이 초기화"""
+        self._stream_entry = None
+        self._stream_text = ""
         if self.placeholder:
             self.placeholder.empty()
 
+    def add_command(self, command: str):
+        """터미널 히스토리에 명령어 추가 후 다시 렌더링
+        
+        Args:
+            command: 명령어 텍스트
+        """
+        from frontend.web.core.terminal_processor import get_terminal_processor
+        terminal_processor = get_terminal_processor()
+        terminal_processor.update_terminal_history([
+            {"type": "command", "content": terminal_processor.sanitize_output(command)}
+        ])
+        self.render_terminal_display(terminal_processor.get_terminal_history())
+
+    def add_output(self, output: str):
+        """터미널 히스토리에 출력 추가 후 다시 렌더링
+        
+        Args:
+            output: 출력 텍스트
+        """
+        from frontend.web.core.terminal_processor import get_terminal_processor
+        terminal_processor = get_terminal_processor()
+        terminal_processor.update_terminal_history([
+            {"type": "output", "content": terminal_processor.sanitize_output(output)}
+        ])
+        self.render_terminal_display(terminal_processor.get_terminal_history())
+
+    def append_stream_output(self, tool_name: str, chunk: str):
+        """실행 중인 도구의 출력 조각을 실시간 엔트리에 이어 붙이기
+        
+        최근 TERMINAL_STREAM_MAX_CHARS 글자만 유지해 긴 출력에도 렌더링 비용 일정
+        
+        Args:
+            tool_name: 도구 표시 이름
+            chunk: 출력 조각
+        """
+        from frontend.web.core.terminal_processor import get_terminal_processor
+        terminal_processor = get_terminal_processor()
+
+        if self._stream_entry is None:
+            self.add_command(tool_name)
+            self._stream_entry = {"type": "output", "content": "", "streaming": True}
+            self._stream_text = ""
+            terminal_processor.update_terminal_history([self._stream_entry])
+
+        self._stream_text = (self._stream_text + chunk)[-TERMINAL_STREAM_MAX_CHARS:]
+        self._stream_entry["content"] = terminal_processor.sanitize_output(self._stream_text)
+        self.render_terminal_display(terminal_processor.get_terminal_history())
+
+    def finish_stream(self, final_output: Optional[str] = None) -> bool:
+        """실시간 출력 엔트리를 최종 결과로 교체하고 스트리밍 종료
+        
+        Args:
+            final_output: 도구 최종 결과 (None이면 스트리밍된 내용 유지)
+            
+        Returns:
+            bool: 진행 중이던 스트리밍 엔트리가 있었는지 여부
+        """
+        if self._stream_entry is None:
+            return False
+
+        from frontend.web.core.terminal_processor import get_terminal_processor
+        terminal_processor = get_terminal_processor()
+
+        if final_output is not None:
+            self._stream_entry["content"] = terminal_processor.sanitize_output(final_output)
+        self._stream_entry.pop("streaming", None)
+        self._stream_entry = None
+        self._stream_text = ""
+        self.render_terminal_display(terminal_processor.get_terminal_history())
+        return True
+
     
     def display_terminal_in_container(self, container, terminal_history: List[Dict[str, Any]]):
         """컨테이너 내부에 터미널 표시
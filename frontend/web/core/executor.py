@@ -17,6 +17,7 @@ from src.utils.llm.config_manager import (
     get_current_llm_config,
     get_current_llm
 )
+from src.utils.llm.configurable import with_model
 from src.utils.message import (
     extract_message_content,
     get_message_type,
@@ -84,8 +85,10 @@ class Executor:
             
             # LLM 인스턴스 생성
             self._current_llm = get_current_llm()
+            # 이 스레드에서 사용할 모델 (swarm은 실행 시 config로 모델 선택)
+            self._config = RunnableConfig(**with_model(self._config, self._current_model))
             
-            # 동적으로 swarm 생성 
+            # 동적으로 swarm 생성 (같은 도구 구성이면 컴파일된 swarm 재사용)
             self._swarm = await create_dynamic_swarm()
             
             # 초기화 완료
@@ -115,6 +118,8 @@ class Executor:
             execution_config = config
         else:
             execution_config = self._config
+        # 이 실행기에서 선택한 모델로 실행 (다른 대화는 다른 모델 사용 가능)
+        execution_config = RunnableConfig(**with_model(execution_config, self._current_model))
         
         # 메시지 ID 추적 초기화
         self._processed_message_ids = set()
@@ -124,20 +129,33 @@ class Executor:
         try:
             step_count = 0
             
-            # 이제 타입이 안전함
+            # updates: 노드 단위 메시지 / custom: 실행 중인 도구의 중간 출력
             stream_result = self._swarm.astream(
                 inputs,
-                stream_mode="updates",
+                stream_mode=["updates", "custom"],
                 config=execution_config,
                 subgraphs=True
             )
             
             async for stream_item in stream_result:
-                # stream_item이 튜플인지 확인
-                if not isinstance(stream_item, tuple) or len(stream_item) != 2:
+                # stream_item이 (namespace, mode, chunk) 튜플인지 확인
+                if not isinstance(stream_item, tuple) or len(stream_item) != 3:
                     continue
                     
-                namespace, output = stream_item
+                namespace, mode, output = stream_item
+
+                if mode == "custom":
+                    if isinstance(output, dict) and output.get("type") == "tool_output":
+                        yield {
+                            "type": "tool_stream",
+                            "agent_name": get_agent_name(namespace),
+                            "tool_name": output.get("tool_name", ""),
+                            "tool_display_name": parse_tool_name(output.get("tool_name", "")),
+                            "content": output.get("content", ""),
+                            "timestamp": datetime.now().isoformat()
+                        }
+                    continue
+
                 step_count += 1
                 
                 # output이 딕셔너리인지 확인
@@ -256,8 +274,10 @@ class Executor:
             # 새로운 LLM 인스턴스 생성
             self._current_llm = get_current_llm()
             
-            # 새로운 모델로 에이전트들 재생성
-            self._swarm = await create_dynamic_swarm()
+            # 에이전트는 다시 만들지 않고 실행 config의 모델만 교체
+            self._config = RunnableConfig(**with_model(self._config, model_info))
+            if self._swarm is None:
+                self._swarm = await create_dynamic_swarm()
             
             return True
             
@@ -98,6 +98,19 @@ class WorkflowHandler:
                 user_input,
                 config=st.session_state.thread_config
             ):
+                # 도구 중간 출력은 터미널에만 표시 (이벤트 히스토리에 쌓지 않음)
+                if event.get("type") == "tool_stream":
+                    if terminal_ui:
+                        try:
+                            terminal_ui.append_stream_output(
+                                event.get("tool_display_name", "Tool"),
+                                event.get("content", "")
+                            )
+                        except Exception as e:
+                            if st.session_state.get("debug_mode", False):
+                                print(f"Terminal stream update error: {e}")
+                    continue
+
                 event_count += 1
                 st.session_state.event_history.append(event)
                 
@@ -213,9 +226,10 @@ class WorkflowHandler:
                 content = frontend_message.get("content", "")
                 
                 if tool_name and content:
-                    # 명령어와 출력 직접 추가 (이전 버전 방식)
-                    terminal_ui.add_command(tool_name)
-                    terminal_ui.add_output(content)
+                    # 스트리밍 중이던 엔트리가 있으면 최종 결과로 교체, 없으면 명령어와 출력 직접 추가
+                    if not terminal_ui.finish_stream(content):
+                        terminal_ui.add_command(tool_name)
+                        terminal_ui.add_output(content)
                     
                     # 디버깅 로그
                     if st.session_state.get("debug_mode", False):
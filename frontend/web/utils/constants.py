@@ -46,6 +46,9 @@ CSS_CLASS_STATUS_COMPLETED = "status-completed"
 CSS_CLASS_TERMINAL_CONTAINER = "terminal-container"
 CSS_CLASS_MAC_TERMINAL_HEADER = "mac-terminal-header"
 
+# 실행 중 도구 출력 스트리밍 시 터미널에 유지할 최대 글자 수 (최근 출력 기준)
+TERMINAL_STREAM_MAX_CHARS = 20000
+
 # 세션 상태 키
 SESSION_KEY_EXECUTOR_READY = "executor_ready"
 SESSION_KEY_CURRENT_MODEL = "current_model"
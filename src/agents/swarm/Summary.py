@@ -1,24 +1,20 @@
 from langgraph.prebuilt import create_react_agent
-from langchain_mcp_adapters.client import MultiServerMCPClient
 from langmem import create_manage_memory_tool, create_search_memory_tool
 from src.prompts.prompt_loader import load_prompt
 from src.tools.handoff import handoff_to_initial_access, handoff_to_reconnaissance, handoff_to_planner
-from src.utils.llm.config_manager import get_current_llm
+from src.utils.llm.configurable import get_configurable_llm
 from src.utils.memory import get_store
 
 from src.utils.mcp.mcp_loader import load_mcp_tools
 
 async def make_summary_agent():
-    # 메모리에서 LLM 로드 (없으면 기본값 사용)
-    llm = get_current_llm()
-    if llm is None:
-        from langchain_anthropic import ChatAnthropic
-        llm = ChatAnthropic(model_name="claude-3-5-sonnet-latest", temperature=0, timeout=60, stop=None)
-        print("Warning: Using default LLM model (Claude 3.5 Sonnet)")
+    # 모델은 실행 시 config["configurable"]의 model_name/provider로 결정 (없으면 전역 설정 모델)
+    llm = get_configurable_llm()
     
     # 중앙 집중식 store 사용
     store = get_store()
     
+    # MCP 도구 호출은 서버별 장기 세션을 공유 (src/utils/mcp/session_manager.py)
     mcp_tools = await load_mcp_tools(agent_name=["summary"])
 
     swarm_tools = [
@@ -4,11 +4,19 @@ from src.agents.swarm.Planner import make_planner_agent
 from src.agents.swarm.Summary import make_summary_agent
 from src.utils.swarm.swarm import create_swarm
 from src.utils.memory import get_checkpointer, get_store
+from src.utils.mcp.mcp_loader import load_mcp_tools, mcp_tools_fingerprint
+from collections import OrderedDict
+from typing import Any, Dict, Optional
 import asyncio
+import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 컴파일된 swarm 보관 개수 (MCP 도구 구성별, 0이면 캐시 안 함)
+SWARM_CACHE_SIZE_ENV = "DECEPTICON_SWARM_CACHE_SIZE"
+DEFAULT_SWARM_CACHE_SIZE = 4
+
 # 중앙 집중식 persistence 인스턴스
 checkpointer = get_checkpointer()
 store = get_store() 
@@ -33,17 +41,19 @@ store = get_store()
 
 # 동적 에이전트 생성 함수
 async def create_agents():
-    """사용자가 모델을 선택한 후 에이전트들을 동적으로 생성"""
-    recon = await make_recon_agent()
-    initaccess = await make_initaccess_agent()
-    planner = await make_planner_agent()
-    summary = await make_summary_agent()
+    """사용자가 모델을 선택한 후 에이전트들을 동적으로 생성 (네 에이전트를 동시에)"""
+    # 모든 MCP 서버 도구를 한 번에 동시 조회 (각 에이전트는 캐시된 도구 목록 사용)
+    await load_mcp_tools()
+    recon, initaccess, planner, summary = await asyncio.gather(
+        make_recon_agent(),
+        make_initaccess_agent(),
+        make_planner_agent(),
+        make_summary_agent(),
+    )
     return [recon, initaccess, planner, summary]
 
-async def create_dynamic_swarm():
-    """동적으로 swarm 생성 - 모델 선택 후 호출"""
-    logger.info("Creating dynamic swarm with InMemory persistence")
-    
+async def build_swarm():
+    """에이전트 생성 + swarm 컴파일"""
     agents = await create_agents()
     workflow = create_swarm(
         agents=agents,
@@ -57,3 +67,87 @@ async def create_dynamic_swarm():
     
     logger.info("Swarm compiled with InMemory checkpointer and store")
     return compiled_workflow
+
+
+class SwarmCache:
+    """컴파일된 swarm LRU 캐시 - MCP 도구 구성 해시별
+
+    대화 상태는 checkpointer에 thread_id 별로 저장되므로 컴파일된 그래프는 대화 간에 공유 가능하고,
+    모델은 실행 시 config["configurable"]로 정해지므로 모델을 바꿔도 같은 그래프 사용
+    (새 대화, 모델 변경은 다시 컴파일하지 않음)
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        if max_entries is None:
+            max_entries = int(os.getenv(SWARM_CACHE_SIZE_ENV, DEFAULT_SWARM_CACHE_SIZE))
+        self.max_entries = max(0, max_entries)
+        self._swarms: "OrderedDict[str, Any]" = OrderedDict()
+        # 같은 키를 동시에 요청하면 진행 중인 빌드를 공유
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._stats = {"hits": 0, "builds": 0, "evictions": 0}
+
+    async def key(self) -> str:
+        return await mcp_tools_fingerprint()
+
+    async def get(self, fresh: bool = False):
+        key = await self.key()
+        if not fresh and key in self._swarms:
+            self._swarms.move_to_end(key)
+            self._stats["hits"] += 1
+            logger.info(f"Reusing compiled swarm for tool set {key}")
+            return self._swarms[key]
+
+        task = self._pending.get(key)
+        if fresh or task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(build_swarm())
+            self._pending[key] = task
+        try:
+            swarm = await asyncio.shield(task)
+        finally:
+            if task.done() and self._pending.get(key) is task:
+                del self._pending[key]
+
+        if self._swarms.get(key) is not swarm:
+            self._stats["builds"] += 1
+            self.put(key, swarm)
+        return swarm
+
+    def put(self, key: str, swarm: Any) -> None:
+        if not self.max_entries:
+            return
+        self._swarms[key] = swarm
+        self._swarms.move_to_end(key)
+        while len(self._swarms) > self.max_entries:
+            self._swarms.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        self._swarms.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "entries": list(self._swarms),
+            "max_entries": self.max_entries,
+        }
+
+
+_swarm_cache: Optional[SwarmCache] = None
+
+
+def get_swarm_cache() -> SwarmCache:
+    """전역 swarm 캐시 반환"""
+    global _swarm_cache
+    if _swarm_cache is None:
+        _swarm_cache = SwarmCache()
+    return _swarm_cache
+
+
+async def create_dynamic_swarm(fresh: bool = False):
+    """동적으로 swarm 생성 - 모델 선택 후 호출
+
+    같은 MCP 도구 구성으로 컴파일한 swarm이 캐시에 있으면 재사용 (fresh=True면 다시 빌드)
+    모델은 실행 config에서 선택 (src/utils/llm/configurable.py)
+    """
+    logger.info("Creating dynamic swarm with InMemory persistence")
+    return await get_swarm_cache().get(fresh=fresh)
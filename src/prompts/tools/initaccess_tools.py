@@ -14,13 +14,31 @@ INITACCESS_TOOLS_PROMPT = """
 - Service search: `searchsploit("Apache 2.4.29", ["-t"])`
 - CVE lookup: `searchsploit("--cve", "CVE-2021-44228")`
 - Exact match: `searchsploit("OpenSSH 7.4", ["-e"])`
+- Many services at once: `searchsploit_batch(["vsftpd 2.3.4", "OpenSSH 4.7", "Samba 3.0.20"])` → results per query (use after a service scan)
 
 ### hydra - Credential Attacks
 **When to use**: Brute force authentication when weak credentials suspected
 **Available wordlists**: 
 - Users: `root/data/wordlist/user.txt`
 - Passwords: `root/data/wordlist/password.txt`
-
+- Large wordlists: `hydra_parallel("ssh://TARGET", login_file="root/data/wordlist/user.txt", password_file="root/data/wordlist/password.txt", shards=4)` → splits the password list across parallel hydra processes and stops every shard on the first valid credential (`stop_after=K` to collect more)
+- Lockout-sensitive services: lower `max_connections` (total connections across all shards); do not pass `-t`, it is derived from `max_connections`
+- All hydra runs against the same host/port/service share one connection budget; a run started while the budget is used up waits for it (reported as `queued_seconds`)
+
+### Background Jobs - Long-Running Attacks
+**When to use**: Large wordlists or multiple targets where hydra runs for minutes
+- Start: `start_job("hydra", "ssh://TARGET", ["-L", "root/data/wordlist/user.txt", "-P", "root/data/wordlist/password.txt"])` → returns `job_id`
+- Check / read / stop: `job_status(job_id)`, `job_output(job_id, offset)` (continue from `next_offset`), `job_cancel(job_id)`
+Keep researching with `searchsploit` while the job runs.
+Every tool is killed after a per-tool time limit and returns its partial output; pass `timeout=SECONDS` when a run legitimately needs longer.
+
+### read_artifact - Large Output Paging
+Outputs above the size limit are returned as a head/tail preview plus an artifact ID.
+- Continue reading: `read_artifact("ARTIFACT_ID", offset, length)` → use the returned `next_offset` for the next page
+- Only page through what you need (e.g. grep-worthy sections), not the whole artifact
+
+### Cached Results
+Repeated `searchsploit` queries may return a result marked `[cached result, Ns old ...]`; pass `fresh=True` to search again.
 
 ## Attack Approach:
 1. **Research First**: Use `searchsploit` to find known vulnerabilities
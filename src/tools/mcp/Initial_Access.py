@@ -1,69 +1,42 @@
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from typing_extensions import Annotated
-from typing import List, Optional, Union
-import subprocess
+from typing import Dict, List, Optional, Union
+import asyncio
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.utils.container.artifacts import register_artifact_tools
+from src.utils.container.bruteforce import get_connection_budget, requested_tasks, run_sharded_hydra, target_key, with_tasks
+from src.utils.container.execution import CommandRunner, format_options
+from src.utils.container.exploitdb import IndexTimeout, SearchsploitEngine
+from src.utils.container.jobs import JobManager, register_job_tools
+from src.utils.container.output import OutputCallback, mcp_output_emitter
+from src.utils.container.pool import register_pool_tools
+from src.utils.container.result_cache import get_result_cache
 
 mcp = FastMCP("initial_access", port=3002)
 
 
-CONTAINER_NAME = "attacker"
+# 공격 컨테이너 풀에서 가장 한가한 컨테이너에 배치 (DECEPTICON_CONTAINERS)
+runner = CommandRunner()
+jobs = JobManager()
+cache = get_result_cache()
+# ExploitDB CSV 역색인 (지원하지 않는 옵션/CSV 없음이면 컨테이너 searchsploit 실행)
+exploitdb = SearchsploitEngine(runner.backend, runner.container_name)
 
-def command_execution(command: Annotated[str, "Commands to run on Kali Linux"]) -> Annotated[str, "Command Execution Result"]:
+async def command_execution(
+    command: Annotated[str, "Commands to run on Kali Linux"],
+    tool: str = "command",
+    on_output: Optional[OutputCallback] = None,
+    timeout: Optional[int] = None,
+) -> Annotated[str, "Command Execution Result"]:
     """
     Run one command at a time in a kali linux environment and return the result
     """
-    try:
-        # Docker 사용 가능 여부 확인
-        docker_check = subprocess.run(
-            ["docker", "ps"], 
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        if docker_check.returncode != 0:
-            return f"[-] Docker is not available: {docker_check.stderr.strip()}"
-            
-        # 컨테이너 존재 여부 확인
-        container_check = subprocess.run(
-            ["docker", "ps", "-a", "--filter", f"name={CONTAINER_NAME}"],
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        if CONTAINER_NAME not in container_check.stdout:
-            return f"[-] Container '{CONTAINER_NAME}' does not exist"
-        
-        # 컨테이너 실행 상태 확인
-        running_check = subprocess.run(
-            ["docker", "ps", "--filter", f"name={CONTAINER_NAME}"],
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        # 컨테이너가 실행 중이 아니면 시작
-        if CONTAINER_NAME not in running_check.stdout:
-            start_result = subprocess.run(
-                ["docker", "start", CONTAINER_NAME],
-                capture_output=True, text=True, encoding="utf-8", errors="ignore"
-            )
-            
-            if start_result.returncode != 0:
-                return f"[-] Failed to start container '{CONTAINER_NAME}': {start_result.stderr.strip()}"
-            
-        # ✅ Kali Linux 컨테이너에서 명령어 실행
-        result = subprocess.run(
-            ["docker", "exec", CONTAINER_NAME, "sh", "-c", command],
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        if result.returncode != 0:
-            return f"[-] Command execution error: {result.stderr.strip()}"
-        
-        return f"{result.stdout.strip()}"
-    
-    except FileNotFoundError:
-        return "[-] Docker command not found. Is Docker installed and in PATH?"
-    
-    except Exception as e:
-        return f"[-] Error: {str(e)} (Type: {type(e).__name__})"
+    return await runner.run(command, tool=tool, on_output=on_output, timeout=timeout)
+
 
 # @mcp.tool(description="Brute-force authentication attacks using Patator")
 # def patator(service: str, target: str, options: Optional[Union[str, List[str]]] = None) -> Annotated[str, "Command"]:
@@ -125,7 +98,12 @@ def command_execution(command: Annotated[str, "Commands to run on Kali Linux"])
 
 
 @mcp.tool(description="Brute-force authentication attacks")
-def hydra(target: str, options: Optional[Union[str, List[str]]] = None) -> Annotated[str, "Command"]:
+async def hydra(
+    target: str,
+    ctx: Context,
+    options: Optional[Union[str, List[str]]] = None,
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+) -> Annotated[str, "Command"]:
     if options is None:
         args_str = ""
     elif isinstance(options, list):
@@ -133,12 +111,82 @@ def hydra(target: str, options: Optional[Union[str, List[str]]] = None) -> Annot
     else:
         args_str = options
 
-    command = f"hydra {args_str} {target}"
-    return command_execution(command)
+    # 장시간 대입 공격 진행 상황을 클라이언트로 스트리밍
+    return await run_hydra(target, args_str, on_output=mcp_output_emitter(ctx, "hydra"), timeout=timeout)
+
+
+async def run_hydra(target: str, args_str: str, on_output: Optional[OutputCallback] = None,
+                    timeout: Optional[int] = None) -> str:
+    """hydra 실행 - 대상별 연결 예산(DECEPTICON_HYDRA_MAX_CONNECTIONS)에서 남은 만큼으로 -t 조정"""
+    async with get_connection_budget().reserve(target_key(target, args_str), requested_tasks(args_str)) as tasks:
+        command = f"hydra {with_tasks(args_str, tasks)} {target}"
+        return await command_execution(command, tool="hydra", on_output=on_output, timeout=timeout)
+
+
+@mcp.tool(description="Parallel brute-force: shard wordlists across hydra processes/containers and stop after the first K valid credentials")
+async def hydra_parallel(
+    target: Annotated[str, "Hydra target such as ssh://10.0.0.5 or '10.0.0.5 http-post-form \"/login:u=^USER^&p=^PASS^:F=failed\"'"],
+    ctx: Context,
+    login: Annotated[Optional[str], "Single username (-l)"] = None,
+    login_file: Annotated[Optional[str], "Username list path in the container (-L)"] = None,
+    password: Annotated[Optional[str], "Single password (-p)"] = None,
+    password_file: Annotated[Optional[str], "Password list path in the container (-P)"] = None,
+    options: Optional[Union[str, List[str]]] = None,
+    shards: Annotated[int, "Number of parallel hydra processes"] = 4,
+    stop_after: Annotated[int, "Stop all shards after this many valid credentials"] = 1,
+    max_connections: Annotated[Optional[int], "Total concurrent connections to the target across all shards"] = None,
+    timeout: Annotated[Optional[int], "Seconds before each shard is killed (default: per-tool limit)"] = None,
+) -> Annotated[dict, "Merged result: found credentials, shard summary, connection budget, errors"]:
+    # -t 는 max_connections를 샤드 수로 나눈 값으로 대체
+    return await run_sharded_hydra(
+        runner, target,
+        login=login, login_file=login_file, password=password, password_file=password_file,
+        options=format_options(options), shards=shards, stop_after=stop_after,
+        max_connections=max_connections, timeout=timeout,
+        on_output=mcp_output_emitter(ctx, "hydra"),
+    )
+
+
+async def native_search(search, timeout: Optional[int]):
+    """네이티브 색인 검색 - searchsploit 도구별 시간 제한 적용
+    시간 초과돼도 색인 갱신은 백그라운드에서 계속되어 다음 호출에 사용 (IndexTimeout에 적용한 제한 시간 전달)
+    """
+    deadline = runner.limits.timeout_for("searchsploit", timeout)
+    task = asyncio.ensure_future(search)
+    try:
+        return await (asyncio.wait_for(asyncio.shield(task), deadline) if deadline else task)
+    except asyncio.TimeoutError:
+        if task.done():
+            # 검색 자체가 낸 TimeoutError는 그대로 전달
+            raise
+        raise IndexTimeout(deadline)
+
+
+def index_timeout_message(error: IndexTimeout) -> str:
+    """색인 검색 시간 초과 결과 ("[-]"로 시작하므로 캐시되지 않음)"""
+    return (
+        f"[-] ExploitDB index is still being built (no answer within {error.deadline:g}s). "
+        f"Retry shortly to use it, or pass fresh=True to run searchsploit in the container instead."
+    )
+
+
+async def run_searchsploit(service_name: str, args_str: str, fresh: bool, timeout: Optional[int]) -> str:
+    """컨테이너 searchsploit 실행 (결과 캐시 사용)"""
+    command = f"searchsploit {args_str} {service_name}"
+    return await cache.get_or_run(
+        "searchsploit", {"target": service_name, "options": args_str},
+        lambda: command_execution(command, tool="searchsploit", timeout=timeout),
+        fresh=fresh,
+    )
 
 
 @mcp.tool(description="Search exploit database for vulnerabilities")
-def searchsploit(service_name: str, options: Optional[Union[str, List[str]]] = None) -> Annotated[str, "Command"]:
+async def searchsploit(
+    service_name: str,
+    options: Optional[Union[str, List[str]]] = None,
+    fresh: Annotated[bool, "Skip the exploit index and cached results and run searchsploit in the container again"] = False,
+    timeout: Annotated[Optional[int], "Seconds before the search is stopped (default: per-tool limit)"] = None,
+) -> Annotated[str, "Command"]:
     if options is None:
         args_str = ""
     elif isinstance(options, list):
@@ -146,8 +194,63 @@ def searchsploit(service_name: str, options: Optional[Union[str, List[str]]] = N
     else:
         args_str = options
 
-    command = f"searchsploit {args_str} {service_name}"
-    return command_execution(command)
+    # 색인 결과는 CSV mtime 확인 주기(DECEPTICON_EXPLOITDB_CHECK_INTERVAL) 안에서 최신이므로 캐시하지 않음
+    if not fresh:
+        try:
+            result = await native_search(exploitdb.search(service_name, args_str), timeout)
+        except IndexTimeout as e:
+            return index_timeout_message(e)
+        if result is not None:
+            return result
+
+    return await run_searchsploit(service_name, args_str, fresh, timeout)
+
+
+@mcp.tool(description="Search exploit database for many service/version strings at once")
+async def searchsploit_batch(
+    service_names: Annotated[List[str], "Queries such as 'vsftpd 2.3.4', 'OpenSSH 7.2'"],
+    options: Optional[Union[str, List[str]]] = None,
+    fresh: Annotated[bool, "Skip the exploit index and cached results and run searchsploit in the container again"] = False,
+    timeout: Annotated[Optional[int], "Seconds before the search is stopped (default: per-tool limit)"] = None,
+) -> Annotated[Dict[str, str], "searchsploit result per query"]:
+    args_str = format_options(options)
+    if not fresh:
+        try:
+            results = await native_search(exploitdb.search_many(service_names, args_str), timeout)
+        except IndexTimeout as e:
+            return {name: index_timeout_message(e) for name in service_names}
+        if results is not None:
+            return results
+
+    # 색인이 답할 수 없는 옵션/상태이므로 바로 컨테이너 searchsploit 실행
+    outputs = await asyncio.gather(*(
+        run_searchsploit(name, args_str, fresh, timeout) for name in service_names
+    ))
+    return dict(zip(service_names, outputs))
+
+# 백그라운드 실행 가능한 도구 (모두 "<tool> <options> <target>" 형식)
+JOB_TOOLS = ("hydra", "searchsploit")
+
+@mcp.tool(description="Start an exploitation tool (hydra, searchsploit) in the background and return a job ID immediately")
+async def start_job(
+    tool: Annotated[str, "Tool name: hydra or searchsploit"],
+    target: Annotated[str, "Target (hydra) or service name (searchsploit)"],
+    options: Optional[Union[str, List[str]]] = None,
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+) -> Annotated[dict, "Job information (use job_status / job_output / job_cancel with job_id)"]:
+    if tool not in JOB_TOOLS:
+        raise ValueError(f"Unsupported tool '{tool}'. Choose one of: {', '.join(JOB_TOOLS)}")
+    args_str = format_options(options)
+    command = f"{tool} {args_str} {target}"
+    if tool == "hydra":
+        job = jobs.submit(tool, command, lambda on_output: run_hydra(target, args_str, on_output, timeout))
+    else:
+        job = jobs.submit(tool, command, lambda on_output: command_execution(command, tool=tool, on_output=on_output, timeout=timeout))
+    return job.summary()
+
+register_job_tools(mcp, jobs)
+register_artifact_tools(mcp)
+register_pool_tools(mcp, runner.pool)
 
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
\ No newline at end of file
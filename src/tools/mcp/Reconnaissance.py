@@ -1,95 +1,346 @@
 # weather_server.py
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from typing_extensions import Annotated
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
+import asyncio
+import json
 # from src.tools.mcp.command_execution import command_execution
-import subprocess
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.utils.container.artifacts import get_artifact_store, register_artifact_tools
+from src.utils.container.connect_scan import ConnectScanner, service_scan_plan
+from src.utils.container.dns_resolver import AsyncResolver, reverse_name
+from src.utils.container.execution import CommandRunner, format_options
+from src.utils.container.http_probe import HttpProber, load_wordlist
+from src.utils.container.jobs import JobManager, register_job_tools
+from src.utils.container.nmap_fanout import NmapFanout, to_json
+from src.utils.container.nmap_xml import NmapXMLParser, format_host_line
+from src.utils.container.output import OutputCallback, OutputThrottle, mcp_output_emitter
+from src.utils.container.pool import register_pool_tools
+from src.utils.container.result_cache import get_result_cache
+from src.utils.container.scan_profiles import get_scan_profiles, register_profile_tools
 
-CONTAINER_NAME = "attacker"
 mcp = FastMCP("reconnaissance", port=3001)
+# 공격 컨테이너 풀에서 가장 한가한 컨테이너에 배치 (DECEPTICON_CONTAINERS)
+runner = CommandRunner()
+jobs = JobManager()
+cache = get_result_cache()
+# 네트워크별 RTT/손실률 기반 nmap 타이밍 (DECEPTICON_SCAN_PROFILES)
+profiles = get_scan_profiles()
+# 대역 스캔 분할 실행 (DECEPTICON_NMAP_MAX_RATE)
+fanout = NmapFanout(runner, profiles=profiles)
+# 호스트별 keep-alive 연결 풀 (DECEPTICON_HTTP_*)
+http = HttpProber()
 
-def command_execution(command: Annotated[str, "Commands to run on Kali Linux"]) -> Annotated[str, "Command Execution Result"]:
+async def command_execution(
+    command: Annotated[str, "Commands to run on Kali Linux"],
+    tool: str = "command",
+    on_output: Optional[OutputCallback] = None,
+    sink=None,
+    timeout: Optional[int] = None,
+) -> Annotated[str, "Command Execution Result"]:
     """
     Run one command at a time in a kali linux environment and return the result
     """
+    return await runner.run(command, tool=tool, on_output=on_output, sink=sink, timeout=timeout)
+
+async def structured_nmap(
+    target: str,
+    args_str: str,
+    on_output: Optional[OutputCallback] = None,
+    timeout: Optional[int] = None,
+) -> str:
+    """nmap -oX - 결과를 스트리밍 파싱해 간결한 JSON으로 반환 (전체 XML은 아티팩트로 보관)
+
+    같은 대상/옵션의 구조화 스캔이 실행 중이면 그 결과를 함께 받음
+    """
+    return await runner.flights.do(
+        ("nmap", "structured", target, args_str),
+        lambda emit: scan_nmap_xml(target, args_str, emit, timeout),
+        on_output,
+    )
+
+async def scan_nmap_xml(
+    target: str,
+    args_str: str,
+    on_output: Optional[OutputCallback] = None,
+    timeout: Optional[int] = None,
+) -> str:
+    parser = NmapXMLParser()
+    xml_artifact = get_artifact_store().writer(always=True)
+    throttle = OutputThrottle(on_output) if on_output else None
+
+    async def sink(data: bytes) -> None:
+        xml_artifact.write(data)
+        parser.feed(data)
+        # 원본 XML 대신 발견된 호스트 요약을 진행 상황으로 전달
+        if throttle:
+            for record in parser.pop_new_hosts():
+                await throttle.feed(format_host_line(record).encode())
+
     try:
-        # Docker 사용 가능 여부 확인
-        docker_check = subprocess.run(
-            ["docker", "ps"], 
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        if docker_check.returncode != 0:
-            return f"[-] Docker is not available: {docker_check.stderr.strip()}"
-            
-        # 컨테이너 존재 여부 확인
-        container_check = subprocess.run(
-            ["docker", "ps", "-a", "--filter", f"name={CONTAINER_NAME}"],
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        if CONTAINER_NAME not in container_check.stdout:
-            return f"[-] Container '{CONTAINER_NAME}' does not exist"
-        
-        # 컨테이너 실행 상태 확인
-        running_check = subprocess.run(
-            ["docker", "ps", "--filter", f"name={CONTAINER_NAME}"],
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        # 컨테이너가 실행 중이 아니면 시작
-        if CONTAINER_NAME not in running_check.stdout:
-            start_result = subprocess.run(
-                ["docker", "start", CONTAINER_NAME],
-                capture_output=True, text=True, encoding="utf-8", errors="ignore"
-            )
-            
-            if start_result.returncode != 0:
-                return f"[-] Failed to start container '{CONTAINER_NAME}': {start_result.stderr.strip()}"
-            
-        # ✅ Kali Linux 컨테이너에서 명령어 실행
-        result = subprocess.run(
-            ["docker", "exec", CONTAINER_NAME, "sh", "-c", command],
-            capture_output=True, text=True, encoding="utf-8", errors="ignore"
-        )
-        
-        if result.returncode != 0:
-            return f"[-] Command execution error: {result.stderr.strip()}"
-        
-        return f"{result.stdout.strip()}"
-    
-    except FileNotFoundError:
-        return "[-] Docker command not found. Is Docker installed and in PATH?"
-    
-    except Exception as e:
-        return f"[-] Error: {str(e)} (Type: {type(e).__name__})"
+        result = await command_execution(f'nmap -oX - {args_str} {target}', tool="nmap", sink=sink, timeout=timeout)
+        if throttle:
+            await throttle.flush()
+        if result.startswith("[-]"):
+            if not parser.hosts:
+                return result
+            # 시간 초과 등으로 중단돼도 그때까지 파싱된 호스트는 반환 (원본 XML 대신)
+            status = result.splitlines()[0]
+            return f"{status}\n" + get_artifact_store().compact(parser.to_json(xml_artifact.commit()), tool="nmap")
+
+        parser.close()
+        if parser.error:
+            # XML로 해석할 수 없으면 기존 텍스트 결과 그대로 반환
+            return result
+        # 호스트가 아주 많으면 JSON 요약도 아티팩트로 저장하고 앞/뒤만 반환
+        return get_artifact_store().compact(parser.to_json(xml_artifact.commit()), tool="nmap")
+    finally:
+        xml_artifact.discard()
+        # nmap이 측정한 호스트별 RTT를 네트워크 프로파일에 반영
+        profiles.observe_rtts(parser.timings)
 
 # MCP 도구 정의
 @mcp.tool(description="Network discovery and port scanning")
-def nmap(target: str, options: Optional[Union[str, List[str]]] = None) -> Annotated[str, "command execution Result"]:
+async def nmap(
+    target: str,
+    ctx: Context,
+    options: Optional[Union[str, List[str]]] = None,
+    structured: Annotated[bool, "Return compact JSON host/port/service records instead of raw text"] = False,
+    fresh: Annotated[bool, "Ignore cached results and run again"] = False,
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+    auto_timing: Annotated[bool, "Add timing flags learned for this network unless options already set timing"] = True,
+) -> Annotated[str, "command execution Result"]:
     if options is None:
         args_str = ""
     elif isinstance(options, list):
         args_str = " ".join(options)
     else:
         args_str = options
-    command = f'nmap {args_str} {target}'
-    return command_execution(command)
+    cache_args = {"target": target, "options": args_str, "structured": structured}
+    # 타이밍 옵션은 결과에 영향이 없으므로 캐시 키에는 사용자 옵션만 사용
+    run_args = profiles.tune_nmap_args(target, args_str)[0] if auto_timing else args_str
+    if structured:
+        return await cache.get_or_run(
+            "nmap", cache_args,
+            lambda: structured_nmap(target, run_args, on_output=mcp_output_emitter(ctx, "nmap"), timeout=timeout),
+            fresh=fresh,
+        )
+    command = f'nmap {run_args} {target}'
+    # 장시간 스캔 진행 상황을 클라이언트로 스트리밍
+    return await cache.get_or_run(
+        "nmap", cache_args,
+        lambda: command_execution(command, tool="nmap", on_output=mcp_output_emitter(ctx, "nmap"), timeout=timeout),
+        fresh=fresh,
+    )
+
+@mcp.tool(description="Parallel nmap for CIDR ranges, many hosts or wide port ranges: host discovery, then sharded scans merged per host")
+async def nmap_fanout(
+    target: Annotated[str, "CIDR, IPs or hostnames separated by spaces/commas"],
+    ctx: Context,
+    options: Optional[Union[str, List[str]]] = None,
+    shards: Annotated[int, "Number of concurrent nmap processes"] = 4,
+    discovery: Annotated[bool, "Drop hosts that do not answer a ping scan first (skipped with -Pn)"] = True,
+    max_rate: Annotated[Optional[float], "Total packets per second across all shards"] = None,
+    fresh: Annotated[bool, "Ignore cached results and run again"] = False,
+    timeout: Annotated[Optional[int], "Seconds before each shard is killed (default: per-tool limit)"] = None,
+) -> Annotated[str, "Compact JSON: hosts up, shard summary, merged host/port/service records"]:
+    args_str = format_options(options)
+    return await cache.get_or_run(
+        "nmap", {"target": target, "options": args_str, "fanout": shards, "discovery": discovery, "max_rate": max_rate},
+        lambda: fanout_json(target, args_str, shards, discovery, max_rate, mcp_output_emitter(ctx, "nmap"), timeout),
+        fresh=fresh,
+    )
+
+async def fanout_json(target, args_str, shards, discovery, max_rate, on_output, timeout) -> str:
+    summary = await fanout.run(
+        target, args_str, shards=shards, discovery=discovery, max_rate=max_rate, on_output=on_output, timeout=timeout,
+    )
+    # 호스트가 아주 많으면 JSON도 아티팩트로 저장하고 앞/뒤만 반환
+    result = get_artifact_store().compact(to_json(summary), tool="nmap")
+    failed = summary["shards"].get("failed", 0)
+    if failed or (summary["errors"] and not summary["hosts"]):
+        # 일부 샤드 실패 결과는 캐시하지 않도록 "[-]" 상태 줄을 앞에 붙임
+        return f"[-] {failed} of {summary['shards']['total']} nmap shards failed (partial results below)\n{result}"
+    return result
+
+@mcp.tool(description="Fast TCP connect pre-scan of many hosts/ports; optionally runs an nmap service scan on only the open ports")
+async def connect_scan(
+    target: Annotated[str, "IPs, CIDR ranges or hostnames separated by spaces/commas"],
+    ctx: Context,
+    ports: Annotated[Optional[str], "Port spec such as '1-65535' or '22,80,443,8000-9000' (default: nmap top 100)"] = None,
+    concurrency: Annotated[Optional[int], "Connection attempts in flight (default DECEPTICON_CONNECT_CONCURRENCY)"] = None,
+    max_timeout: Annotated[float, "Longest wait per port in seconds; shrinks per host as RTT is learned"] = 1.5,
+    service_scan: Annotated[bool, "Run nmap on each host's open ports only and include the structured results"] = False,
+    nmap_options: Optional[Union[str, List[str]]] = None,
+) -> Annotated[str, "JSON: open ports per host, probe stats, per-host nmap -p lists (and service scan results)"]:
+    # 같은 네트워크를 스캔한 적이 있으면 그때 측정한 RTT/손실률로 초기 대기 시간/동시 연결 수 결정
+    profile = profiles.get(target)
+    settings = profile.connect_settings() if profile else {}
+    scanner = ConnectScanner(
+        concurrency=concurrency or settings.get("concurrency"),
+        max_timeout=max_timeout,
+        initial_timeout=settings.get("initial_timeout"),
+        profiles=profiles,
+    )
+    result = await scanner.scan(target, ports, on_output=mcp_output_emitter(ctx, "connect_scan"))
+    plan = service_scan_plan(result["open"])
+    result["nmap_ports"] = plan
+
+    if service_scan and plan:
+        # 열린 포트만 서비스 스캔 - nmap 도구와 같은 캐시 키로 저장해 이후 같은 호출은 재사용
+        options = format_options(nmap_options) or "-sV"
+
+        async def scan_host(host: str, host_ports: str) -> str:
+            args_str = f"-Pn {options} -p {host_ports}"
+            return await cache.get_or_run(
+                "nmap", {"target": host, "options": args_str, "structured": True},
+                lambda: structured_nmap(host, args_str, on_output=mcp_output_emitter(ctx, "nmap")),
+            )
+
+        outputs = await asyncio.gather(*(scan_host(host, host_ports) for host, host_ports in plan.items()))
+        services = {}
+        for host, output in zip(plan, outputs):
+            # 캐시 표시/부분 실패 상태 줄은 떼고 JSON으로 포함
+            body = output.split("\n", 1)[-1] if output.startswith(("[cached", "[-]")) else output
+            try:
+                services[host] = json.loads(body)
+            except ValueError:
+                services[host] = output
+        result["services"] = services
+    return get_artifact_store().compact(to_json(result), tool="connect_scan")
 
 @mcp.tool(description="Web service analysis and content retrieval")
-def curl(target: str = "", options: str = "") -> Annotated[str, "command execution Result"]:
+async def curl(
+    target: str = "",
+    options: str = "",
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+) -> Annotated[str, "command execution Result"]:
     command = f'curl {options} {target}'
-    return command_execution(command)
+    return await command_execution(command, tool="curl", timeout=timeout)
+
+@mcp.tool(description="Fetch many URLs concurrently over pooled keep-alive connections, optionally crawling same-host links")
+async def http_fetch(
+    urls: Annotated[List[str], "Absolute URLs to fetch"],
+    method: str = "GET",
+    headers: Optional[Dict[str, str]] = None,
+    data: Annotated[Optional[str], "Request body (first request of each URL only)"] = None,
+    include_body: Annotated[bool, "Include the first 2000 characters of each unique body"] = True,
+    crawl_depth: Annotated[int, "Follow same-host links this many levels deep (0 = no crawl)"] = 0,
+    max_pages: Annotated[int, "Maximum URLs fetched including crawled pages"] = 50,
+) -> Annotated[str, "JSON pages with status/length/hash/title; identical bodies are listed once with same_as"]:
+    result = await http.fetch_many(
+        urls, method=method, headers=headers, data=data,
+        include_body=include_body, crawl_depth=crawl_depth, max_pages=max_pages,
+    )
+    return get_artifact_store().compact(to_json(result), tool="http_fetch")
+
+@mcp.tool(description="Probe many paths on a web server (content discovery) and return only interesting, non-duplicate responses")
+async def http_probe(
+    base_url: Annotated[str, "Base URL such as http://10.0.0.5/ or http://10.0.0.5/app/"],
+    paths: Annotated[Optional[List[str]], "Paths to try, e.g. ['admin', 'login.php', '.git/HEAD']"] = None,
+    wordlist: Annotated[Optional[str], "Wordlist file with one path per line (e.g. /root/data/wordlist/dirs.txt)"] = None,
+    extensions: Annotated[Optional[List[str]], "Also try each path with these extensions, e.g. ['php', 'bak']"] = None,
+    filter_status: Annotated[Optional[List[int]], "Status codes to drop (default [404])"] = None,
+    concurrency: Annotated[Optional[int], "Requests in flight (default DECEPTICON_HTTP_CONCURRENCY)"] = None,
+    calibrate: Annotated[bool, "Measure the soft-404 response with random paths and drop matches"] = True,
+) -> Annotated[str, "JSON: interesting responses (status, length, words, hash, title, location) and filter counts"]:
+    entries = list(paths or [])
+    if wordlist:
+        entries.extend(load_wordlist(wordlist))
+    if not entries:
+        raise ValueError("Provide paths or a wordlist")
+    result = await http.probe(
+        base_url, entries, extensions=extensions, filter_status=filter_status,
+        concurrency=concurrency, calibrate=calibrate,
+    )
+    return get_artifact_store().compact(to_json(result), tool="http_probe")
 
 @mcp.tool(description="DNS information gathering")
-def dig(target: str, options: str = "") -> Annotated[str, "command execution Result"]:
+async def dig(
+    target: str,
+    options: str = "",
+    fresh: Annotated[bool, "Ignore cached results and run again"] = False,
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+) -> Annotated[str, "command execution Result"]:
     command = f'dig {options} {target}'
-    return command_execution(command)
+    return await cache.get_or_run(
+        "dig", {"target": target, "options": options},
+        lambda: command_execution(command, tool="dig", timeout=timeout),
+        fresh=fresh,
+    )
+
+@mcp.tool(description="Resolve hundreds or thousands of DNS names at once (subdomain enumeration, PTR sweeps of IP addresses)")
+async def dig_bulk(
+    names: Annotated[List[str], "Names to resolve, labels such as 'www', 'mail' when domain is given, or IP addresses for PTR"],
+    record_types: Annotated[Optional[List[str]], "Record types: A, AAAA, CNAME, MX, NS, TXT, SOA, PTR, SRV, CAA (default: A)"] = None,
+    domain: Annotated[Optional[str], "Append this domain to every name (e.g. target.com)"] = None,
+    nameserver: Annotated[Optional[str], "Nameserver IP or IP:port (default: DECEPTICON_DNS_SERVERS or system resolver)"] = None,
+    concurrency: Annotated[Optional[int], "Maximum queries in flight"] = None,
+    retries: Annotated[int, "Retries per query on timeout/SERVFAIL"] = 2,
+    query_timeout: Annotated[float, "Seconds to wait for each answer"] = 2.0,
+) -> Annotated[dict, "resolved {name: {type: [values]}}, nxdomain, no_answer, errors"]:
+    if domain:
+        suffix = domain.strip(".").lower()
+
+        def qualify(name: str) -> str:
+            # 이미 도메인 안의 이름(라벨 경계 기준)이거나 PTR용 IP 주소면 그대로
+            bare = name.strip(".").lower()
+            if bare == suffix or bare.endswith("." + suffix) or reverse_name(bare) != bare:
+                return name
+            return f"{bare}.{suffix}"
+
+        names = [qualify(n) for n in names]
+    resolver = AsyncResolver(
+        [nameserver] if nameserver else None, timeout=query_timeout, retries=retries, concurrency=concurrency,
+    )
+    try:
+        return await resolver.resolve_many(names, record_types)
+    finally:
+        resolver.close()
 
 @mcp.tool(description="Domain registration and ownership lookup")
-def whois(target: str, options: str = "") -> Annotated[str, "command execution Result"]:
+async def whois(
+    target: str,
+    options: str = "",
+    fresh: Annotated[bool, "Ignore cached results and run again"] = False,
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+) -> Annotated[str, "command execution Result"]:
     command = f'whois {options} {target}'
-    return command_execution(command)
+    return await cache.get_or_run(
+        "whois", {"target": target, "options": options},
+        lambda: command_execution(command, tool="whois", timeout=timeout),
+        fresh=fresh,
+    )
+
+
+# 백그라운드 실행 가능한 도구 (모두 "<tool> <options> <target>" 형식)
+JOB_TOOLS = ("nmap", "curl", "dig", "whois")
+
+@mcp.tool(description="Start a reconnaissance tool (nmap, curl, dig, whois) in the background and return a job ID immediately")
+async def start_job(
+    tool: Annotated[str, "Tool name: nmap, curl, dig or whois"],
+    target: str,
+    options: Optional[Union[str, List[str]]] = None,
+    structured: Annotated[bool, "nmap only: return compact JSON records instead of raw text"] = False,
+    timeout: Annotated[Optional[int], "Seconds before the command is killed (default: per-tool limit)"] = None,
+) -> Annotated[dict, "Job information (use job_status / job_output / job_cancel with job_id)"]:
+    if tool not in JOB_TOOLS:
+        raise ValueError(f"Unsupported tool '{tool}'. Choose one of: {', '.join(JOB_TOOLS)}")
+    command = f'{tool} {format_options(options)} {target}'
+    if tool == "nmap" and structured:
+        # JSON 결과가 job 출력이 되도록 호스트 진행 줄은 스트리밍하지 않음
+        job = jobs.submit(tool, command, lambda on_output: structured_nmap(target, format_options(options), timeout=timeout))
+    else:
+        job = jobs.submit(tool, command, lambda on_output: command_execution(command, tool=tool, on_output=on_output, timeout=timeout))
+    return job.summary()
+
+register_job_tools(mcp, jobs)
+register_artifact_tools(mcp)
+register_pool_tools(mcp, runner.pool)
+register_profile_tools(mcp, profiles)
 
 
 if __name__ == "__main__":
@@ -1,49 +1,87 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from typing_extensions import Annotated
-from typing import List
+from typing import Dict, List, Optional
+import asyncio
 import subprocess
-import uuid
-import time
 import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+from src.utils.container.artifacts import get_artifact_store, register_artifact_tools
+from src.utils.container.backend import get_exec_backend
+from src.utils.container.execution import ToolLimits
+from src.utils.container.jobs import JobManager, register_job_tools
+from src.utils.container.output import OutputCallback, mcp_output_emitter
+from src.utils.container.pool import get_container_pool, register_pool_tools
+from src.utils.container.session_pool import TmuxSessionPool
+from src.utils.container.tmux import CommandTimeoutError, run_in_session
 
 
 mcp = FastMCP("terminal", port=3003)
 
-CONTAINER_NAME = "attacker"
+exec_backend = get_exec_backend()
+tool_limits = ToolLimits()
+# 세션은 가장 한가한 컨테이너에 만들고 이후 명령은 같은 컨테이너로 (DECEPTICON_CONTAINERS)
+container_pool = get_container_pool()
+session_pools: Dict[str, TmuxSessionPool] = {
+    name: TmuxSessionPool(exec_backend, name) for name in container_pool.containers
+}
+jobs = JobManager()
 
-def run(command: List[str]) -> subprocess.CompletedProcess:
-    """일반 docker exec 명령어 실행"""
-    return subprocess.run(
-        ["docker", "exec", CONTAINER_NAME] + command,
-        capture_output=True, text=True, encoding='utf-8'
-    )
+async def run(command: List[str], container: Optional[str] = None) -> subprocess.CompletedProcess:
+    """일반 docker exec 명령어 실행 (DECEPTICON_EXEC_BACKEND에 따라 CLI/Engine API)"""
+    return await exec_backend.aexec(container or container_pool.primary, command)
 
-def tmux_run(command: List[str]) -> subprocess.CompletedProcess:
+async def tmux_run(command: List[str], container: Optional[str] = None) -> subprocess.CompletedProcess:
     """tmux 명령어 실행"""
-    return run(["tmux"] + command)
+    return await run(["tmux"] + command, container)
+
+async def list_sessions(container: str) -> List[str]:
+    """컨테이너의 tmux 세션 이름 (풀에서 대기 중인 세션 제외)"""
+    result = await tmux_run(["list-sessions"], container)
+    if result.returncode != 0:
+        return []
+    sessions = [line.split(":")[0].strip() for line in result.stdout.strip().split('\n') if line.strip()]
+    return [name for name in sessions if not TmuxSessionPool.is_pool_session(name)]
+
+async def discover_sessions() -> List[str]:
+    """모든 컨테이너의 세션을 조회하고 세션 → 컨테이너 매핑 갱신 (서버 재시작 후 복구)"""
+    names = list(container_pool.containers)
+    found = await asyncio.gather(*(list_sessions(name) for name in names))
+    sessions = []
+    for container, container_sessions in zip(names, found):
+        for session in container_sessions:
+            container_pool.pin(session, container)
+            sessions.append(session)
+    return sessions
 
 @mcp.tool(description="Create new terminal sessions")
-def create_session(
+async def create_session(
     session_names: Annotated[List[str], "Session names to create"]
 ) -> Annotated[List[str], "List of created session names"]:
-    """새 tmux 터미널 세션들 생성"""
+    """새 tmux 터미널 세션들 생성 (세션 수가 가장 적은 컨테이너, 미리 준비된 풀 세션이 있으면 재사용)"""
     created_sessions = []
     
     for session_name in session_names:
-        result = tmux_run(["new-session", "-d", "-s", session_name])
-        if result.returncode != 0:
-            raise Exception(f"Failed to create session '{session_name}': {result.stderr}")
+        if container_pool.has_session(session_name):
+            raise Exception(f"Failed to create session '{session_name}': duplicate session: {session_name}")
+        container = await container_pool.select(for_session=True)
+        await session_pools[container.name].acquire(session_name)
+        container_pool.pin(session_name, container.name)
         created_sessions.append(session_name)
     
     return created_sessions
     
 
 @mcp.tool(description="List all active sessions")
-def session_list() -> Annotated[List[str], "List of session IDs"]:
-    result = tmux_run(["list-sessions"])
-    if result.returncode != 0:
-        return []
-    return [line.split(":")[0].strip() for line in result.stdout.strip().split('\n') if line.strip()]
+async def session_list() -> Annotated[List[str], "List of session IDs"]:
+    for pool in session_pools.values():
+        pool.ensure_started()
+    return await discover_sessions()
+
+@mcp.tool(description="Show terminal session pool statistics")
+async def session_pool_status() -> Annotated[dict, "Session pool hit/miss statistics per container"]:
+    return {name: pool.get_stats() for name, pool in session_pools.items()}
 
 # @mcp.tool(description="Execute command in session")
 # def command_exec(
@@ -124,73 +162,87 @@ def session_list() -> Annotated[List[str], "List of session IDs"]:
 #         raise Exception(f"Failed to execute command: {str(e)}")
 
 @mcp.tool(description="Execute command in session")
-def command_exec(
+async def command_exec(
     session_id: Annotated[str, "Session ID"],
     command: Annotated[str, "Command to execute"],
+    ctx: Context,
+    timeout: Annotated[Optional[int], "Seconds before the command is interrupted (default: per-tool limit)"] = None,
 ) -> Annotated[str, "Command output"]:
     """command execute with file redirection and exit code checking"""
+    async with tool_limits.slot("command_exec"):
+        return await session_exec(
+            session_id, command, on_output=mcp_output_emitter(ctx, "command_exec"),
+            timeout=tool_limits.timeout_for("command_exec", timeout),
+        )
+
+@mcp.tool(description="Start a command in a session in the background and return a job ID immediately")
+async def start_job(
+    session_id: Annotated[str, "Session ID"],
+    command: Annotated[str, "Command to execute"],
+    timeout: Annotated[Optional[int], "Seconds before the command is interrupted (default: per-tool limit)"] = None,
+) -> Annotated[dict, "Job information (use job_status / job_output / job_cancel with job_id)"]:
+    """세션에서 명령을 백그라운드로 실행 (실행 중에는 같은 세션에 다른 명령을 보내지 말 것)
+
+    job_cancel 시 run_in_session이 세션의 명령을 중단
+    """
+    async def run_job(on_output: OutputCallback) -> str:
+        async with tool_limits.slot("command_exec"):
+            return await session_exec(
+                session_id, command, on_output=on_output,
+                timeout=tool_limits.timeout_for("command_exec", timeout),
+            )
+
+    job = jobs.submit("command_exec", f"[{session_id}] {command}", run_job)
+    return job.summary()
+
+register_job_tools(mcp, jobs)
+register_artifact_tools(mcp)
+register_pool_tools(mcp, container_pool)
+
+async def session_exec(
+    session_id: str,
+    command: str,
+    on_output: Optional[OutputCallback] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """tmux 세션에서 명령 실행 후 출력 반환 (실패 시 예외, 시간 초과 시 부분 출력)
+
+    명령 전송부터 출력/종료 코드 회수까지 exec 한 번으로 처리
+    on_output이 있으면 실행 중 출력을 조각 단위로 전달
+    세션을 만든 컨테이너에서 실행 (모르는 세션이면 전체 컨테이너에서 찾음)
+    """
     try:
-        channel = f"done-{session_id}-{uuid.uuid4().hex[:8]}"
-        timestamp = int(time.time())
-        output_file = f"/tmp/cmd_output_{session_id}_{timestamp}.txt"
-        status_file = f"/tmp/cmd_status_{session_id}_{timestamp}.txt"
+        if not container_pool.has_session(session_id):
+            await discover_sessions()
+        async with container_pool.lease(session_id) as container:
+            exit_code, output = await run_in_session(
+                exec_backend, container.name, session_id, command,
+                on_output=on_output, artifacts=get_artifact_store(), timeout=timeout
+            )
 
-        # 명령어 실행 후 상태 코드를 별도 파일에 저장
-        full_command = f"({command}) > {output_file} 2>&1; echo $? > {status_file}; tmux wait-for -S {channel}"
-        
-        result = tmux_run(["send-keys", "-t", session_id, full_command, "Enter"])
-        if result.returncode != 0:
-            raise Exception(f"Failed to execute command: {result.stderr}")
-        
-        wait_result = tmux_run(["wait-for", channel])
-        if wait_result.returncode != 0:
-            raise Exception(f"Command execution monitoring failed: {wait_result.stderr}")
-        
-        try:
-            # 상태 코드 확인
-            status_result = run(["cat", status_file])
-            if status_result.returncode != 0:
-                raise Exception(f"Failed to read status file: {status_result.stderr}")
-            
-            try:
-                exit_code = int(status_result.stdout.strip())
-            except ValueError:
-                raise Exception(f"Invalid exit code: {status_result.stdout.strip()}")
-            
-            # 출력 읽기
-            output_result = run(["cat", output_file])
-            if output_result.returncode != 0:
-                raise Exception(f"Failed to read output file: {output_result.stderr}")
-            
-            output = output_result.stdout
+        # 명령어 실패 시 예외 발생
+        if exit_code != 0:
+            raise Exception(f"Command failed with exit code {exit_code}: {output.strip()}")
+
+        return output.strip()
+
+    except CommandTimeoutError as e:
+        return str(e)
 
-            # 파일 정리
-            run(["rm", "-f", output_file, status_file])
-            
-            # 명령어 실패 시 예외 발생
-            if exit_code != 0:
-                raise Exception(f"Command failed with exit code {exit_code}: {output.strip()}")
-            
-            return output.strip()
-            
-        except Exception as e:
-            # 파일 정리 (에러 발생 시에도)
-            run(["rm", "-f", output_file, status_file])
-            raise Exception(f"Failed to process command result: {str(e)}")
-    
     except Exception as e:
         raise Exception(f"Failed to execute command: {str(e)}")
 
 @mcp.tool(description="Kill terminal sessions")
-def kill_session(
+async def kill_session(
     session_names: Annotated[List[str], "Session names to kill"]
 ) -> Annotated[List[str], "Results for each session"]:
-    """tmux 세션들 종료"""
+    """tmux 세션들 종료 (풀에 여유가 있으면 초기화 후 재사용)"""
     results = []
     
     for session_name in session_names:
         try:
-            result = tmux_run(["kill-session", "-t", session_name])
+            container = container_pool.unpin(session_name) or container_pool.container_for(session_name)
+            result = await session_pools[container].release(session_name)
             if result.returncode == 0:
                 results.append(f"Session {session_name} killed successfully")
             else:
@@ -201,9 +253,12 @@ def kill_session(
     return results
 
 @mcp.tool(description="Kill server, Kill all session")
-def kill_server() -> Annotated[str, "Result"]:
+async def kill_server() -> Annotated[str, "Result"]:
     try:
-        tmux_run(["kill-server"])
+        for name, pool in session_pools.items():
+            await tmux_run(["kill-server"], name)
+            pool.reset()
+        container_pool.clear_sessions()
         return f"Server killed"
 
     except Exception as e:
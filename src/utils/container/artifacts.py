@@ -0,0 +1,216 @@
+"""
+대용량 도구 출력 아티팩트 저장소 - MCP 서버 공용
+임계값을 넘는 출력은 디스크에 내용 주소(sha256) 기반으로 저장하고
+에이전트에게는 앞/뒤 일부 + 아티팩트 ID만 반환 (체크포인트/프롬프트/로그 크기 절감)
+
+    DECEPTICON_ARTIFACT_DIR=artifacts       # 저장 위치 (MCP 서버들이 공유)
+    DECEPTICON_ARTIFACT_THRESHOLD=8192      # 이 크기(bytes)를 넘는 출력만 아티팩트로 저장
+    DECEPTICON_ARTIFACT_PREVIEW=1500        # 요약에 포함할 앞/뒤 글자 수
+"""
+
+import codecs
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+ARTIFACT_DIR_ENV = "DECEPTICON_ARTIFACT_DIR"
+ARTIFACT_THRESHOLD_ENV = "DECEPTICON_ARTIFACT_THRESHOLD"
+ARTIFACT_PREVIEW_ENV = "DECEPTICON_ARTIFACT_PREVIEW"
+
+DEFAULT_ARTIFACT_DIR = "artifacts"
+DEFAULT_THRESHOLD = 8 * 1024
+DEFAULT_PREVIEW = 1500
+DEFAULT_READ_LENGTH = 8 * 1024
+MAX_READ_LENGTH = 64 * 1024
+
+ARTIFACT_ID_LENGTH = 16
+ARTIFACT_ID_RE = re.compile(r"^[0-9a-f]{%d}$" % ARTIFACT_ID_LENGTH)
+# 요약 앞부분을 원본 바이트에서 만들기 위해 보관하는 바이트 수 (미리보기 글자당 UTF-8 최대 4바이트)
+BYTES_PER_CHAR = 4
+
+
+def decode_head(data: bytes, chars: int) -> Tuple[str, int]:
+    """원본 바이트 앞에서 chars 글자까지 디코딩 → (문자열, 사용한 바이트 수)
+
+    잘못된 UTF-8은 대체 문자로 바꾸되 바이트 수는 원본 기준이라 read_artifact offset으로 그대로 사용 가능
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts = []
+    count = 0
+    for index in range(len(data)):
+        piece = decoder.decode(data[index:index + 1])
+        if piece:
+            parts.append(piece)
+            count += len(piece)
+            if count >= chars:
+                return "".join(parts), index + 1
+    # 끝에 잘린 문자가 남아 있으면 그 앞까지만 사용
+    pending, _ = decoder.getstate()
+    return "".join(parts), len(data) - len(pending)
+
+
+class ArtifactWriter:
+    """출력을 받으면서 해시 계산, 임계값을 넘으면 임시 파일로 흘려 쓰기 (메모리 상한 유지)"""
+
+    def __init__(self, store: "ArtifactStore", threshold: int):
+        self.store = store
+        self.threshold = threshold
+        self.size = 0
+        # 요약 앞부분용 원본 앞부분 (아티팩트에 저장되는 바이트와 같음)
+        self.head = bytearray()
+        self._head_limit = store.preview * BYTES_PER_CHAR
+        self._hash = hashlib.sha256()
+        self._buffer = bytearray()
+        self._file = None
+
+    def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self.size += len(data)
+        if len(self.head) < self._head_limit:
+            self.head += data[:self._head_limit - len(self.head)]
+        if self._file is not None:
+            self._file.write(data)
+            return
+        self._buffer += data
+        if len(self._buffer) > self.threshold:
+            os.makedirs(self.store.root, exist_ok=True)
+            self._file = tempfile.NamedTemporaryFile(dir=self.store.root, prefix=".tmp-", delete=False)
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+
+    def commit(self) -> Optional[str]:
+        """임계값을 넘었으면 저장 후 아티팩트 ID 반환, 아니면 None"""
+        if self._file is None:
+            self._buffer = bytearray()
+            return None
+
+        self._file.close()
+        artifact_id = self._hash.hexdigest()[:ARTIFACT_ID_LENGTH]
+        path = self.store.path_for(artifact_id)
+        if os.path.exists(path):
+            # 같은 내용이 이미 저장되어 있음
+            os.unlink(self._file.name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(self._file.name, path)
+        self._file = None
+        return artifact_id
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            os.unlink(self._file.name)
+            self._file = None
+        self._buffer = bytearray()
+
+
+class ArtifactStore:
+    """내용 주소 기반 도구 출력 저장소"""
+
+    def __init__(self, root: Optional[str] = None, threshold: Optional[int] = None, preview: Optional[int] = None):
+        self.root = root or os.getenv(ARTIFACT_DIR_ENV, DEFAULT_ARTIFACT_DIR)
+        self.threshold = threshold if threshold is not None else int(os.getenv(ARTIFACT_THRESHOLD_ENV, DEFAULT_THRESHOLD))
+        self.preview = preview if preview is not None else int(os.getenv(ARTIFACT_PREVIEW_ENV, DEFAULT_PREVIEW))
+
+    def path_for(self, artifact_id: str) -> str:
+        if not ARTIFACT_ID_RE.match(artifact_id):
+            raise ValueError(f"Invalid artifact ID: {artifact_id}")
+        return os.path.join(self.root, artifact_id[:2], f"{artifact_id}.txt")
+
+    def writer(self, always: bool = False) -> ArtifactWriter:
+        """always=True면 크기와 관계없이 저장"""
+        return ArtifactWriter(self, -1 if always else self.threshold)
+
+    def put(self, data: bytes) -> str:
+        """임계값과 관계없이 저장 후 아티팩트 ID 반환"""
+        writer = self.writer(always=True)
+        writer.write(data)
+        return writer.commit()
+
+    def size(self, artifact_id: str) -> int:
+        return os.path.getsize(self.path_for(artifact_id))
+
+    def read(self, artifact_id: str, offset: int = 0, length: int = DEFAULT_READ_LENGTH) -> Dict[str, Any]:
+        """offset(bytes)부터 최대 length bytes 읽기 - UTF-8 문자 경계에 맞춰 조정"""
+        path = self.path_for(artifact_id)
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown artifact ID: {artifact_id}")
+
+        size = os.path.getsize(path)
+        offset = min(max(0, offset), size)
+        length = min(max(1, length), MAX_READ_LENGTH)
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+
+        # 멀티바이트 문자 중간에서 시작하면 다음 문자 시작까지 건너뜀
+        skip = 0
+        while skip < len(data) and (data[skip] & 0xC0) == 0x80:
+            skip += 1
+        # 끝에 잘린 문자는 다음 읽기로 넘김
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        content = decoder.decode(data[skip:], final=offset + len(data) >= size)
+        pending, _ = decoder.getstate()
+        next_offset = offset + len(data) - len(pending)
+
+        return {
+            "artifact_id": artifact_id,
+            "offset": offset,
+            "next_offset": next_offset,
+            "size": size,
+            "complete": next_offset >= size,
+            "content": content,
+        }
+
+    def summarize(self, text: str, artifact_id: str, tool: str = "command", raw_head: Optional[bytes] = None) -> str:
+        """앞/뒤 일부와 아티팩트 ID로 구성된 요약 반환
+
+        raw_head: 아티팩트에 저장된 원본의 앞부분 - text가 원본을 가공(strip/디코딩)한 것이면 전달해야
+        read_artifact로 이어 읽을 offset이 저장된 바이트와 맞음 (없으면 text 자체가 저장된 것으로 간주)
+        """
+        size = self.size(artifact_id)
+        if raw_head is None:
+            raw_head = text[:self.preview].encode("utf-8", errors="ignore")
+        head, continue_at = decode_head(bytes(raw_head), self.preview)
+        head = head.lstrip()
+        tail = text[-self.preview:] if len(text) > self.preview * 2 else text[self.preview:]
+        lines = text.count("\n") + 1
+        return (
+            f"{head}\n\n"
+            f"[... {tool} output truncated: {size} bytes / ~{lines} lines stored as artifact '{artifact_id}'. "
+            f"Use read_artifact(\"{artifact_id}\", offset={continue_at}, length) to read more ...]\n\n"
+            f"{tail}"
+        )
+
+    def compact(self, text: str, tool: str = "command") -> str:
+        """이미 문자열로 받은 출력이 임계값을 넘으면 저장 후 요약으로 대체"""
+        data = text.encode("utf-8", errors="ignore")
+        if len(data) <= self.threshold:
+            return text
+        return self.summarize(text, self.put(data), tool)
+
+
+_store: Optional[ArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """전역 아티팩트 저장소 인스턴스 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
+
+
+def register_artifact_tools(mcp, store: Optional[ArtifactStore] = None) -> None:
+    """read_artifact 도구를 FastMCP 서버에 등록"""
+    store = store or get_artifact_store()
+
+    @mcp.tool(description="Read part of a stored tool output artifact (pass next_offset to continue)")
+    async def read_artifact(artifact_id: str, offset: int = 0, length: int = DEFAULT_READ_LENGTH) -> Dict[str, Any]:
+        return store.read(artifact_id, offset, length)
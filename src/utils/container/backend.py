@@ -0,0 +1,275 @@
+"""
+컨테이너 명령 실행 백엔드 - MCP 서버 공용
+DECEPTICON_EXEC_BACKEND 하나로 전환
+    cli : docker CLI 프로세스 실행 (기본값)
+    api : Docker Engine API 유닉스 소켓 직접 통신 (연결 풀 재사용)
+모든 백엔드는 subprocess.CompletedProcess 형태로 결과를 반환해 기존 호출부와 호환
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import threading
+import logging
+from typing import Awaitable, Callable, Iterator, List, Optional, Union
+
+from src.utils.container.engine import (
+    DockerEngineClient, DockerEngineError, DEFAULT_SOCKET_PATH, STREAM_STDOUT, STREAM_STDERR
+)
+
+logger = logging.getLogger(__name__)
+
+# (stream_type, data) 출력 조각 콜백 - stream_type: STREAM_STDOUT / STREAM_STDERR
+ChunkCallback = Callable[[int, bytes], Awaitable[None]]
+
+EXEC_BACKEND_ENV = "DECEPTICON_EXEC_BACKEND"
+DOCKER_SOCKET_ENV = "DOCKER_SOCKET"
+
+# 컨테이너 상태를 바꾸는 이벤트들
+STATE_EVENTS = ("start", "restart", "die", "kill", "stop", "pause", "unpause", "destroy", "oom")
+
+
+class EventStream:
+    """컨테이너 이벤트 스트림 (다른 스레드에서 close 가능)"""
+
+    def __init__(self, actions: Iterator[str], closer):
+        self._actions = actions
+        self._closer = closer
+
+    def __iter__(self) -> Iterator[str]:
+        return self._actions
+
+    def close(self) -> None:
+        self._closer()
+
+
+class CLIBackend:
+    """docker CLI 기반 실행 백엔드"""
+
+    name = "cli"
+
+    def exec(self, container: str, command: List[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ["docker", "exec", container] + command,
+            capture_output=True, text=True, encoding="utf-8", errors="ignore"
+        )
+
+    async def aexec(self, container: str, command: List[str]) -> subprocess.CompletedProcess:
+        """이벤트 루프를 막지 않는 docker exec"""
+        args = ["docker", "exec", container] + command
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+            raise
+        return subprocess.CompletedProcess(
+            args, proc.returncode,
+            stdout.decode("utf-8", errors="ignore"),
+            stderr.decode("utf-8", errors="ignore"),
+        )
+
+    async def aexec_stream(self, container: str, command: List[str], on_chunk: ChunkCallback) -> int:
+        """출력을 조각 단위로 on_chunk에 전달하며 실행, exit code 반환"""
+        proc = await asyncio.create_subprocess_exec(
+            "docker", "exec", container, *command,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+
+        async def pump(reader: asyncio.StreamReader, stream_type: int):
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                await on_chunk(stream_type, data)
+
+        try:
+            await asyncio.gather(pump(proc.stdout, STREAM_STDOUT), pump(proc.stderr, STREAM_STDERR))
+            return await proc.wait()
+        except asyncio.CancelledError:
+            if proc.returncode is None:
+                proc.kill()
+            raise
+
+    def ensure_started(self, container: str) -> Optional[str]:
+        """docker inspect 한 번으로 존재/실행 여부를 확인하고 필요하면 시작
+
+        Returns:
+            Optional[str]: 실패 시 에러 메시지
+        """
+        try:
+            inspect = subprocess.run(
+                ["docker", "inspect", "-f", "{{.State.Running}}", container],
+                capture_output=True, text=True, encoding="utf-8", errors="ignore"
+            )
+        except FileNotFoundError:
+            return "[-] Docker command not found. Is Docker installed and in PATH?"
+
+        if inspect.returncode != 0:
+            stderr = inspect.stderr.strip()
+            if "No such object" in stderr or "No such container" in stderr:
+                return f"[-] Container '{container}' does not exist"
+            return f"[-] Docker is not available: {stderr}"
+
+        if inspect.stdout.strip() == "true":
+            return None
+
+        # 컨테이너가 실행 중이 아니면 시작
+        start_result = subprocess.run(
+            ["docker", "start", container],
+            capture_output=True, text=True, encoding="utf-8", errors="ignore"
+        )
+        if start_result.returncode != 0:
+            return f"[-] Failed to start container '{container}': {start_result.stderr.strip()}"
+        return None
+
+    def open_event_stream(self, container: str) -> EventStream:
+        cmd = [
+            "docker", "events",
+            "--filter", "type=container",
+            "--filter", f"container={container}",
+            "--format", "{{.Action}}",
+        ]
+        for event in STATE_EVENTS:
+            cmd += ["--filter", f"event={event}"]
+
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", errors="ignore"
+        )
+
+        def actions():
+            for line in proc.stdout:
+                if line.strip():
+                    yield line.strip()
+
+        def close():
+            if proc.poll() is None:
+                proc.terminate()
+
+        return EventStream(actions(), close)
+
+
+class EngineAPIBackend:
+    """Docker Engine API 기반 실행 백엔드"""
+
+    name = "api"
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        self.client = DockerEngineClient(socket_path)
+
+    def exec(self, container: str, command: List[str]) -> subprocess.CompletedProcess:
+        args = ["docker", "exec", container] + command
+        try:
+            output = self.client.exec_run(container, command)
+        except DockerEngineError as e:
+            # docker CLI와 동일하게 데몬 에러는 125로 매핑
+            return subprocess.CompletedProcess(args, 125, "", f"Error response from daemon: {e.message}")
+        except OSError as e:
+            return subprocess.CompletedProcess(args, 125, "", f"Cannot connect to the Docker daemon: {e}")
+
+        return subprocess.CompletedProcess(
+            args, output.exit_code,
+            output.stdout.decode("utf-8", errors="ignore"),
+            output.stderr.decode("utf-8", errors="ignore"),
+        )
+
+    async def aexec(self, container: str, command: List[str]) -> subprocess.CompletedProcess:
+        """소켓 I/O는 워커 스레드에서 수행 (연결 풀은 스레드 안전)"""
+        return await asyncio.to_thread(self.exec, container, command)
+
+    async def aexec_stream(self, container: str, command: List[str], on_chunk: ChunkCallback) -> int:
+        """프레임을 워커 스레드에서 읽어 이벤트 루프로 전달하며 실행, exit code 반환"""
+        loop = asyncio.get_running_loop()
+        frames: "asyncio.Queue[Optional[tuple]]" = asyncio.Queue()
+        client = self.client
+
+        def reader() -> int:
+            try:
+                exec_id = client.create_exec(container, command)
+                for frame in client.stream_exec(exec_id):
+                    loop.call_soon_threadsafe(frames.put_nowait, frame)
+            finally:
+                loop.call_soon_threadsafe(frames.put_nowait, None)
+            return client.exec_exit_code(exec_id)
+
+        try:
+            task = asyncio.ensure_future(asyncio.to_thread(reader))
+            while True:
+                frame = await frames.get()
+                if frame is None:
+                    break
+                await on_chunk(*frame)
+            return await task
+        except DockerEngineError as e:
+            await on_chunk(STREAM_STDERR, f"Error response from daemon: {e.message}".encode())
+            return 125
+        except OSError as e:
+            await on_chunk(STREAM_STDERR, f"Cannot connect to the Docker daemon: {e}".encode())
+            return 125
+
+    def ensure_started(self, container: str) -> Optional[str]:
+        try:
+            state = self.client.inspect_container(container).get("State", {})
+            if state.get("Running"):
+                return None
+            self.client.start_container(container)
+            return None
+        except DockerEngineError as e:
+            if e.status == 404:
+                return f"[-] Container '{container}' does not exist"
+            return f"[-] Failed to start container '{container}': {e.message}"
+        except OSError as e:
+            return f"[-] Docker is not available: {e}"
+
+    def open_event_stream(self, container: str) -> EventStream:
+        filters = {"type": ["container"], "container": [container], "event": list(STATE_EVENTS)}
+        conn_holder = {}
+
+        def actions():
+            for event in self.client.events(filters, conn_holder):
+                yield event.get("Action") or event.get("status", "")
+
+        def close():
+            conn = conn_holder.get("conn")
+            if conn is not None and conn.sock is not None:
+                try:
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+        return EventStream(actions(), close)
+
+
+ExecBackend = Union[CLIBackend, EngineAPIBackend]
+
+_backend: Optional[ExecBackend] = None
+_backend_lock = threading.Lock()
+
+
+def create_exec_backend(kind: Optional[str] = None) -> ExecBackend:
+    """설정값으로 실행 백엔드 생성"""
+    kind = (kind or os.getenv(EXEC_BACKEND_ENV, "cli")).lower()
+    if kind == "api":
+        socket_path = os.getenv(DOCKER_SOCKET_ENV, "")
+        if not socket_path:
+            docker_host = os.getenv("DOCKER_HOST", "")
+            socket_path = docker_host[len("unix://"):] if docker_host.startswith("unix://") else DEFAULT_SOCKET_PATH
+        logger.info(f"Using Docker Engine API exec backend ({socket_path})")
+        return EngineAPIBackend(socket_path)
+    if kind != "cli":
+        logger.warning(f"Unknown {EXEC_BACKEND_ENV}='{kind}', falling back to docker CLI")
+    return CLIBackend()
+
+
+def get_exec_backend() -> ExecBackend:
+    """전역 실행 백엔드 인스턴스 반환"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_exec_backend()
+        return _backend
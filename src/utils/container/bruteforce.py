@@ -0,0 +1,326 @@
+"""
+샤딩 병렬 hydra - Initial_Access MCP 서버용
+사용자×비밀번호 공간을 여러 hydra 프로세스(컨테이너 풀이면 여러 컨테이너)로 나눠 동시에 실행
+
+    DECEPTICON_HYDRA_MAX_CONNECTIONS=16   # 대상(host:port/서비스) 하나에 대한 전체 동시 연결 수 상한 (계정 잠금 방지)
+                                          # 프로세스 전역 예산 - 같은 대상에 동시에 실행되는 hydra 호출 전체 합계에 적용
+
+- 목록은 "N번째 줄마다" 방식으로 나눠 모든 샤드가 목록 앞부분(흔한 비밀번호)부터 시도
+- stop_after개의 계정을 찾으면 나머지 샤드를 취소 (컨테이너 안의 프로세스 그룹까지 종료)
+- 샤드 수 × 샤드별 -t 가 대상 예산에서 남은 연결 수를 넘지 않도록 조정 (남은 연결이 없으면 대기)
+"""
+
+import asyncio
+import os
+import re
+import shlex
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from src.utils.container.execution import CommandRunner
+from src.utils.container.output import OutputCallback
+
+MAX_CONNECTIONS_ENV = "DECEPTICON_HYDRA_MAX_CONNECTIONS"
+DEFAULT_MAX_CONNECTIONS = 16
+# -t를 지정하지 않았을 때 hydra의 기본 태스크 수
+HYDRA_DEFAULT_TASKS = 16
+MAX_ERRORS = 5
+
+# [22][ssh] host: 10.0.0.5   login: root   password: toor
+FOUND_RE = re.compile(
+    r"^\[(?P<port>\d+)\]\[(?P<service>[\w\-]+)\]\s+host:\s+(?P<host>\S+)"
+    r"(?:\s+login:\s+(?P<login>.*?))?(?:\s+password:\s+(?P<password>.*))?$"
+)
+ERROR_RE = re.compile(r"^\[ERROR\]\s*(.+)$")
+# 사용자가 지정한 -t N 은 연결 수 상한 계산값으로 대체
+THREADS_OPTION_RE = re.compile(r"(?:^|\s)-t\s*(\d+)")
+PORT_OPTION_RE = re.compile(r"(?:^|\s)-s\s*(\d+)")
+
+
+def parse_found(line: str) -> Optional[Dict[str, str]]:
+    match = FOUND_RE.match(line.strip())
+    if not match:
+        return None
+    return {key: (value or "").strip() for key, value in match.groupdict().items()}
+
+
+def target_key(target: str, options: str = "") -> str:
+    """연결 예산 키 "host:port/service" ("ssh://10.0.0.5:2222", "10.0.0.5 http-post-form ...", -s 포트)"""
+    try:
+        parts = shlex.split(target)
+    except ValueError:
+        parts = target.split()
+    first = parts[0] if parts else target
+    if "://" in first:
+        service, _, address = first.partition("://")
+        address = address.split("/")[0]
+    else:
+        service, address = (parts[1] if len(parts) > 1 else ""), first
+    host, port = address, ""
+    if address.count(":") == 1:
+        host, port = address.split(":")
+    port_option = PORT_OPTION_RE.search(options)
+    if port_option:
+        port = port_option.group(1)
+    return f"{host}:{port}/{service}".lower()
+
+
+def requested_tasks(options: str) -> int:
+    """옵션의 -t 값 (없으면 hydra 기본값)"""
+    match = THREADS_OPTION_RE.search(options)
+    return int(match.group(1)) if match else HYDRA_DEFAULT_TASKS
+
+
+def with_tasks(options: str, tasks: int) -> str:
+    """-t를 tasks로 바꾼 옵션"""
+    return f"{THREADS_OPTION_RE.sub(' ', options).strip()} -t {tasks}".strip()
+
+
+class ConnectionBudget:
+    """대상별 hydra 동시 연결 수 예산 - 같은 대상에 대한 호출이 여러 개여도 합계가 limit 이하"""
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = max(1, limit or int(os.getenv(MAX_CONNECTIONS_ENV, DEFAULT_MAX_CONNECTIONS)))
+        self._in_use: Dict[str, int] = {}
+        self._changed: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    async def acquire(self, key: str, wanted: int) -> int:
+        """남은 연결이 생길 때까지 기다린 뒤 min(wanted, 남은 연결 수)만큼 확보하고 그 수를 반환"""
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(lambda: self._in_use.get(key, 0) < self.limit)
+            granted = min(max(1, wanted), self.limit - self._in_use.get(key, 0))
+            self._in_use[key] = self._in_use.get(key, 0) + granted
+            return granted
+
+    async def release(self, key: str, count: int) -> None:
+        changed = self._condition()
+        async with changed:
+            remaining = self._in_use.get(key, 0) - count
+            if remaining > 0:
+                self._in_use[key] = remaining
+            else:
+                self._in_use.pop(key, None)
+            changed.notify_all()
+
+    @asynccontextmanager
+    async def reserve(self, key: str, wanted: int) -> AsyncIterator[int]:
+        granted = await self.acquire(key, wanted)
+        try:
+            yield granted
+        finally:
+            # 취소되어도 반납은 끝까지 수행
+            await asyncio.shield(self.release(key, granted))
+
+    def in_use(self, key: str) -> int:
+        return self._in_use.get(key, 0)
+
+
+_budget: Optional[ConnectionBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_connection_budget() -> ConnectionBudget:
+    """전역 대상별 연결 예산 반환"""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = ConnectionBudget()
+        return _budget
+
+
+def plan_shards(shards: int, max_connections: int) -> Tuple[int, int]:
+    """(샤드 수, 샤드별 -t) - 전체 연결 수가 상한을 넘지 않도록"""
+    max_connections = max(1, max_connections)
+    shards = max(1, min(shards, max_connections))
+    return shards, max(1, max_connections // shards)
+
+
+def build_shard_command(
+    target: str,
+    login: Optional[str],
+    login_file: Optional[str],
+    password: Optional[str],
+    password_file: Optional[str],
+    options: str,
+    threads: int,
+    shard: int,
+    shards: int,
+    stop_first: bool,
+) -> str:
+    """샤드 하나의 hydra 명령 - 비밀번호 목록(없으면 사용자 목록)의 shard번째 줄부터 shards줄마다 사용"""
+    sharded = password_file or login_file if shards > 1 else None
+    list_path = '"$d/list"'
+
+    if login_file:
+        login_arg = f"-L {list_path if sharded == login_file and not password_file else shlex.quote(login_file)}"
+    else:
+        login_arg = f"-l {shlex.quote(login or '')}"
+    if password_file:
+        password_arg = f"-P {list_path if sharded == password_file else shlex.quote(password_file)}"
+    else:
+        password_arg = f"-p {shlex.quote(password or '')}"
+
+    options = THREADS_OPTION_RE.sub(" ", options).strip()
+    # -I: 동시에 실행되는 샤드끼리 hydra.restore 대기(10초)에 걸리지 않도록
+    hydra = f"hydra -I {login_arg} {password_arg} -t {threads} {'-f ' if stop_first else ''}{options} {target}"
+    if not sharded:
+        return hydra
+    return (
+        f"d=$(mktemp -d) && sed -n '{shard + 1}~{shards}p' {shlex.quote(sharded)} > \"$d/list\" && "
+        # 목록이 샤드 수보다 짧으면 빈 샤드는 건너뜀
+        f"if [ -s \"$d/list\" ]; then {hydra}; rc=$?; else rc=0; fi; rm -rf \"$d\"; exit $rc"
+    )
+
+
+async def run_sharded_hydra(
+    runner: CommandRunner,
+    target: str,
+    login: Optional[str] = None,
+    login_file: Optional[str] = None,
+    password: Optional[str] = None,
+    password_file: Optional[str] = None,
+    options: str = "",
+    shards: int = 4,
+    stop_after: int = 1,
+    max_connections: Optional[int] = None,
+    timeout: Optional[int] = None,
+    on_output: Optional[OutputCallback] = None,
+    budget: Optional[ConnectionBudget] = None,
+) -> Dict[str, Any]:
+    """샤드를 동시에 실행하고 찾은 계정을 하나의 결과로 병합
+
+    연결 수는 max_connections와 대상 예산에서 남은 연결 수 중 작은 값 (남은 연결이 없으면 대기)
+
+    Raises:
+        ValueError: 사용자/비밀번호가 지정되지 않은 경우
+    """
+    if not (login or login_file) or not (password or password_file):
+        raise ValueError("Specify login or login_file, and password or password_file")
+    if not (password_file or login_file):
+        shards = 1
+    budget = budget or get_connection_budget()
+    if max_connections is None:
+        max_connections = budget.limit
+    key = target_key(target, options)
+    queued = time.monotonic()
+    async with budget.reserve(key, max_connections) as granted:
+        waited = time.monotonic() - queued
+        result = await _run_shards(
+            runner, target, login, login_file, password, password_file, options,
+            shards, stop_after, granted, timeout, on_output,
+        )
+    result["connections"].update({
+        "limit": max_connections, "target_budget": budget.limit, "queued_seconds": round(waited, 1),
+    })
+    return result
+
+
+async def _run_shards(
+    runner: CommandRunner,
+    target: str,
+    login: Optional[str],
+    login_file: Optional[str],
+    password: Optional[str],
+    password_file: Optional[str],
+    options: str,
+    shards: int,
+    stop_after: int,
+    connections: int,
+    timeout: Optional[int],
+    on_output: Optional[OutputCallback],
+) -> Dict[str, Any]:
+    shards, threads = plan_shards(shards, connections)
+    stop_after = max(1, stop_after)
+
+    found: "OrderedDict[Tuple[str, str, str], Dict[str, str]]" = OrderedDict()
+    errors: List[str] = []
+    enough = asyncio.Event()
+
+    async def record(line: str) -> None:
+        entry = parse_found(line)
+        if entry is not None:
+            key = (entry["host"], entry["login"], entry["password"])
+            if key not in found:
+                found[key] = entry
+                if on_output:
+                    await on_output(f"{line.strip()}\n")
+                if len(found) >= stop_after:
+                    enough.set()
+            return
+        error = ERROR_RE.match(line.strip())
+        if error and len(errors) < MAX_ERRORS and error.group(1) not in errors:
+            errors.append(error.group(1))
+
+    def shard_output() -> OutputCallback:
+        partial = ""
+
+        async def feed(text: str) -> None:
+            nonlocal partial
+            lines = (partial + text).split("\n")
+            partial = lines.pop()
+            for line in lines:
+                await record(line)
+
+        return feed
+
+    commands = [
+        build_shard_command(target, login, login_file, password, password_file, options,
+                            threads, shard, shards, stop_first=stop_after == 1)
+        for shard in range(shards)
+    ]
+    tasks = [
+        asyncio.ensure_future(runner.run(command, tool="hydra", on_output=shard_output(), timeout=timeout))
+        for command in commands
+    ]
+    stop_waiter = asyncio.ensure_future(enough.wait())
+
+    try:
+        pending = set(tasks)
+        while pending and not enough.is_set():
+            _, pending = await asyncio.wait(pending | {stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+            pending.discard(stop_waiter)
+        # 충분히 찾았으면 남은 샤드 취소 (runner가 컨테이너 안의 프로세스 그룹 종료)
+        for task in pending:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        stop_waiter.cancel()
+        for task in tasks:
+            task.cancel()
+
+    completed = failed = cancelled = 0
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            cancelled += 1
+            continue
+        if isinstance(result, BaseException):
+            failed += 1
+            errors.append(str(result))
+            continue
+        # 스트리밍 중 놓친 줄이 없도록 최종 결과도 확인
+        for line in result.splitlines():
+            await record(line)
+        if result.startswith("[-]"):
+            failed += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append(result.splitlines()[0])
+        else:
+            completed += 1
+
+    return {
+        "target": target,
+        "found": list(found.values())[:stop_after] if enough.is_set() else list(found.values()),
+        "stopped_early": enough.is_set() and cancelled > 0,
+        "shards": {"total": shards, "completed": completed, "failed": failed, "cancelled": cancelled},
+        "connections": {"per_shard": threads, "total": threads * shards},
+        "errors": errors[:MAX_ERRORS],
+    }
@@ -0,0 +1,266 @@
+"""
+asyncio TCP connect 사전 스캔 - Reconnaissance MCP 서버용
+무거운 nmap -sV 전에 열린 포트만 빠르게 찾아 서비스 스캔 대상을 좁힘
+
+    DECEPTICON_CONNECT_CONCURRENCY=500   # 동시에 진행 중인 연결 시도 수 (열 수 있는 파일 수 안에서)
+
+- 워커들이 (호스트, 포트) 목록을 포트 우선 순서로 나눠 가져가 한 호스트에 연결이 몰리지 않음
+- 호스트별 RTT를 TCP 재전송 타이머(RFC 6298)처럼 추정해 응답 없는 포트의 대기 시간을 줄임
+  (열림/닫힘 응답 모두 RTT 표본, 표본이 없으면 네트워크 프로파일 값 또는 최대 대기 시간 사용)
+- 시간 초과 포트는 응답한 적 있는 호스트에 한해 한 번 더 시도 (재시도에 응답하면 패킷 손실, 끝까지 응답이 없으면 필터링)
+- 스캔이 끝나면 호스트별 RTT/손실률을 네트워크 프로파일에 반영 (scan_profiles)
+- 도달 불가(EHOSTUNREACH 등) 호스트는 남은 포트를 건너뜀
+"""
+
+import asyncio
+import errno
+import os
+import socket
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.container.nmap_fanout import expand_targets, parse_port_spec
+from src.utils.container.output import OutputCallback
+from src.utils.container.scan_profiles import ScanProfileStore
+
+logger = logging.getLogger(__name__)
+
+CONNECT_CONCURRENCY_ENV = "DECEPTICON_CONNECT_CONCURRENCY"
+DEFAULT_CONCURRENCY = 500
+DEFAULT_MIN_TIMEOUT = 0.2
+DEFAULT_MAX_TIMEOUT = 1.5
+DEFAULT_RETRIES = 1
+# 열 수 있는 파일 수 중 스캔에 쓰지 않고 남겨둘 여유분
+RESERVED_FDS = 128
+
+UNREACHABLE_ERRNOS = {errno.EHOSTUNREACH, errno.ENETUNREACH, getattr(errno, "EHOSTDOWN", errno.EHOSTUNREACH)}
+
+# nmap --top-ports 100 (TCP)
+TOP_PORTS = [
+    7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113, 119, 135,
+    139, 143, 144, 179, 199, 389, 427, 443, 444, 445, 465, 513, 514, 515, 543, 544, 548, 554,
+    587, 631, 646, 873, 990, 993, 995, 1025, 1026, 1027, 1028, 1029, 1110, 1433, 1720, 1723,
+    1755, 1900, 2000, 2001, 2049, 2121, 2717, 3000, 3128, 3306, 3389, 3986, 4899, 5000, 5009,
+    5051, 5060, 5101, 5190, 5357, 5432, 5631, 5666, 5800, 5900, 6000, 6001, 6646, 7070, 8000,
+    8008, 8009, 8080, 8081, 8443, 8888, 9100, 9999, 10000, 32768, 49152, 49153, 49154, 49155,
+    49156, 49157,
+]
+
+
+def fd_limit() -> Optional[int]:
+    try:
+        import resource
+        return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    except (ImportError, ValueError, OSError):
+        return None
+
+
+def expand_ports(spec: Optional[str]) -> List[int]:
+    """"22,80,1000-2000" / "-" / None(nmap 상위 100개) → 포트 목록"""
+    if not spec or spec.strip().lower() in ("top", "top100"):
+        return list(TOP_PORTS)
+    ranges = parse_port_spec(spec)
+    if ranges is None:
+        raise ValueError(f"Invalid port specification: {spec}")
+    return [port for start, end in ranges for port in range(start, end + 1)]
+
+
+@dataclass
+class HostTiming:
+    """호스트별 연결 응답 시간 추정 (RFC 6298 SRTT/RTTVAR)"""
+
+    min_timeout: float = DEFAULT_MIN_TIMEOUT
+    max_timeout: float = DEFAULT_MAX_TIMEOUT
+    # 표본이 없을 때의 대기 시간 (None이면 max_timeout, 네트워크 프로파일이 있으면 그 값)
+    initial_timeout: Optional[float] = None
+    srtt: Optional[float] = None
+    rttvar: float = 0.0
+    samples: int = 0
+    timeouts: int = 0
+    probes: int = 0
+    # 첫 시도는 시간 초과였지만 재시도에 응답한 포트 수 (손실로 잃은 탐침)
+    recovered: int = 0
+
+    def sample(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.samples += 1
+
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return min(self.max_timeout, self.initial_timeout or self.max_timeout)
+        return min(self.max_timeout, max(self.min_timeout, self.srtt + 4 * self.rttvar, 2 * self.srtt))
+
+
+class ConnectScanner:
+    """동시 연결 수를 제한한 TCP connect 스캐너"""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        min_timeout: float = DEFAULT_MIN_TIMEOUT,
+        max_timeout: float = DEFAULT_MAX_TIMEOUT,
+        adaptive: bool = True,
+        initial_timeout: Optional[float] = None,
+        profiles: Optional[ScanProfileStore] = None,
+        retries: int = DEFAULT_RETRIES,
+    ):
+        concurrency = concurrency or int(os.getenv(CONNECT_CONCURRENCY_ENV, DEFAULT_CONCURRENCY))
+        limit = fd_limit()
+        if limit:
+            concurrency = min(concurrency, max(1, limit - RESERVED_FDS))
+        self.concurrency = max(1, concurrency)
+        self.min_timeout = min_timeout
+        self.max_timeout = max(max_timeout, min_timeout)
+        self.adaptive = adaptive
+        self.initial_timeout = initial_timeout
+        self.profiles = profiles
+        self.retries = max(0, retries)
+
+    async def _resolve(self, hosts: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """호스트명은 한 번만 해석 → ({호스트: 주소}, {호스트: 에러})"""
+        loop = asyncio.get_running_loop()
+        addresses, errors = {}, {}
+
+        async def resolve(host: str) -> None:
+            try:
+                info = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                addresses[host] = info[0][4][0]
+            except OSError as e:
+                errors[host] = str(e)
+
+        await asyncio.gather(*(resolve(host) for host in hosts))
+        return addresses, errors
+
+    async def scan(
+        self,
+        target: str,
+        ports: Optional[str] = None,
+        on_output: Optional[OutputCallback] = None,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        hosts = expand_targets(target)
+        port_list = expand_ports(ports)
+        addresses, errors = await self._resolve(hosts)
+        hosts = [host for host in hosts if host in addresses]
+
+        timings = {host: HostTiming(self.min_timeout, self.max_timeout, self.initial_timeout) for host in hosts}
+        open_ports: Dict[str, List[int]] = {host: [] for host in hosts}
+        unreachable: Dict[str, str] = {}
+        counts = {"open": 0, "closed": 0, "filtered": 0, "skipped": 0, "errors": 0}
+        first_open: Optional[float] = None
+
+        # 포트 우선 순서 (한 호스트에 연결이 몰리지 않도록)
+        work: Iterator[Tuple[str, int]] = ((host, port) for port in port_list for host in hosts)
+
+        async def attempt(host: str, port: int) -> str:
+            """연결 시도 한 번 → open / closed / filtered(시간 초과) / errors"""
+            timing = timings[host]
+            timeout = timing.timeout() if self.adaptive else self.max_timeout
+            probe_started = time.perf_counter()
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(addresses[host], port), timeout)
+            except asyncio.TimeoutError:
+                return "filtered"
+            except ConnectionRefusedError:
+                timing.sample(time.perf_counter() - probe_started)
+                return "closed"
+            except OSError as e:
+                if e.errno in UNREACHABLE_ERRNOS:
+                    unreachable[host] = os.strerror(e.errno)
+                return "errors"
+            timing.sample(time.perf_counter() - probe_started)
+            # FIN 대기 없이 바로 정리 (RST)
+            writer.transport.abort()
+            return "open"
+
+        async def record(host: str, port: int, status: str) -> None:
+            nonlocal first_open
+            counts[status] += 1
+            if status != "open":
+                return
+            open_ports[host].append(port)
+            if first_open is None:
+                first_open = time.perf_counter() - started
+            if on_output:
+                await on_output(f"{host}:{port} open\n")
+
+        async def probe(host: str, port: int) -> None:
+            timing = timings[host]
+            timing.probes += 1
+            status = await attempt(host, port)
+            if status == "filtered":
+                timing.timeouts += 1
+                timed_out.append((host, port))
+            await record(host, port, status)
+
+        async def retry(host: str, port: int) -> None:
+            for _ in range(self.retries):
+                status = await attempt(host, port)
+                if status == "filtered":
+                    continue
+                counts["filtered"] -= 1
+                if status != "errors":
+                    timings[host].recovered += 1
+                await record(host, port, status)
+                return
+
+        async def worker() -> None:
+            for host, port in work:
+                if host in unreachable:
+                    counts["skipped"] += 1
+                    continue
+                await probe(host, port)
+
+        async def retry_worker(items: Iterator[Tuple[str, int]]) -> None:
+            for host, port in items:
+                if host not in unreachable:
+                    await retry(host, port)
+
+        timed_out: List[Tuple[str, int]] = []
+        total = len(hosts) * len(port_list)
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, total) or 1)))
+
+        if self.retries and timed_out:
+            # 한 번도 응답하지 않은 호스트(꺼짐/전체 차단)는 재시도하지 않음
+            pending = iter([(h, p) for h, p in timed_out if timings[h].samples])
+            await asyncio.gather(*(retry_worker(pending) for _ in range(min(self.concurrency, len(timed_out)))))
+
+        elapsed = time.perf_counter() - started
+        if self.profiles is not None:
+            # 측정한 RTT/손실률을 네트워크 프로파일에 반영 (다음 스캔 타이밍 조정)
+            self.profiles.observe_rtts(
+                (host, t.srtt * 1000, t.rttvar * 1000) for host, t in timings.items() if t.srtt is not None
+            )
+            if self.retries:
+                # 끝까지 응답하지 않은 포트는 필터링이므로 손실 계산에서 제외
+                self.profiles.observe_probes(
+                    (host, t.probes - (t.timeouts - t.recovered), t.recovered) for host, t in timings.items()
+                )
+        results = {host: sorted(found) for host, found in open_ports.items() if found}
+        return {
+            "target": target,
+            "open": results,
+            "hosts_scanned": len(hosts),
+            "ports_per_host": len(port_list),
+            "probes": total,
+            "seconds": round(elapsed, 2),
+            "probes_per_second": round(total / elapsed) if elapsed else None,
+            "first_open_seconds": round(first_open, 3) if first_open is not None else None,
+            "counts": counts,
+            "rtt_ms": {
+                host: round(t.srtt * 1000, 1) for host, t in timings.items() if t.srtt is not None and host in results
+            },
+            "unreachable": unreachable,
+            "unresolved": errors,
+        }
+
+
+def service_scan_plan(open_ports: Dict[str, List[int]]) -> Dict[str, str]:
+    """호스트별 nmap -p 값 (열린 포트만)"""
+    return {host: ",".join(str(p) for p in ports) for host, ports in open_ports.items() if ports}
@@ -0,0 +1,350 @@
+"""
+대량 DNS 조회용 asyncio 리졸버 - Reconnaissance MCP 서버용
+이름마다 docker exec + dig를 실행하던 비용 없이 수백~수천 개 이름을 동시에 조회
+
+    DECEPTICON_DNS_SERVERS=10.0.0.53,1.1.1.1   # 사용할 네임서버 (기본: /etc/resolv.conf, "IP:포트" 가능)
+    DECEPTICON_DNS_CONCURRENCY=200             # 동시에 진행 중인 질의 수 상한
+
+- UDP 소켓 하나로 질의를 다중화하고 응답은 (ID, 질의 이름/타입)으로 매칭
+- 응답이 없으면 다음 네임서버로 재시도, 잘린 응답(TC)은 TCP로 다시 질의
+- 표준 라이브러리만 사용 (로컬 스텁 DNS 서버로 검증 가능)
+"""
+
+import asyncio
+import ipaddress
+import os
+import random
+import socket
+import struct
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DNS_SERVERS_ENV = "DECEPTICON_DNS_SERVERS"
+DNS_CONCURRENCY_ENV = "DECEPTICON_DNS_CONCURRENCY"
+DEFAULT_CONCURRENCY = 200
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_RETRIES = 2
+DEFAULT_NAMESERVER = "8.8.8.8"
+RESOLV_CONF = "/etc/resolv.conf"
+
+RECORD_TYPES = {
+    "A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "PTR": 12, "MX": 15,
+    "TXT": 16, "AAAA": 28, "SRV": 33, "CAA": 257, "ANY": 255,
+}
+TYPE_NAMES = {value: name for name, value in RECORD_TYPES.items()}
+RCODES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+CLASS_IN = 1
+UDP_PAYLOAD = 1232
+# 동시 질의가 많을 때 응답이 몰려도 소켓 수신 버퍼에서 버려지지 않도록
+UDP_RECEIVE_BUFFER = 4 * 1024 * 1024
+
+
+class DNSError(Exception):
+    """응답을 해석할 수 없음"""
+
+
+def parse_nameserver(spec: str) -> Tuple[str, int]:
+    """"1.1.1.1", "127.0.0.1:5353", "[::1]:53" → (주소, 포트)"""
+    spec = spec.strip()
+    if spec.startswith("["):
+        host, _, port = spec[1:].partition("]")
+        return host, int(port.lstrip(":") or 53)
+    if spec.count(":") == 1:
+        host, port = spec.split(":")
+        return host, int(port)
+    return spec, 53
+
+
+def system_nameservers(path: str = RESOLV_CONF) -> List[str]:
+    try:
+        with open(path) as f:
+            return [
+                line.split()[1] for line in f
+                if line.startswith("nameserver") and len(line.split()) > 1
+            ]
+    except OSError:
+        return []
+
+
+def reverse_name(name: str) -> str:
+    """IP 주소 → PTR 조회 이름 (1.2.3.4 → 4.3.2.1.in-addr.arpa), IP가 아니면 그대로"""
+    try:
+        return ipaddress.ip_address(name).reverse_pointer
+    except ValueError:
+        return name
+
+
+def encode_name(name: str) -> bytes:
+    labels = [label for label in name.rstrip(".").split(".") if label]
+    encoded = b""
+    for label in labels:
+        raw = label.encode("idna") if not label.isascii() else label.encode()
+        if len(raw) > 63:
+            raise ValueError(f"DNS label too long: {label}")
+        encoded += bytes([len(raw)]) + raw
+    return encoded + b"\x00"
+
+
+def encode_query(qid: int, name: str, qtype: int) -> bytes:
+    # RD=1, EDNS0 OPT 레코드로 큰 UDP 응답 허용
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 1)
+    question = encode_name(name) + struct.pack("!HH", qtype, CLASS_IN)
+    opt = b"\x00" + struct.pack("!HHIH", 41, UDP_PAYLOAD, 0, 0)
+    return header + question + opt
+
+
+def decode_name(data: bytes, offset: int) -> Tuple[str, int]:
+    """압축 포인터를 따라 이름 해석 → (이름, 다음 오프셋)"""
+    labels, end, jumps = [], None, 0
+    while True:
+        if offset >= len(data):
+            raise DNSError("Truncated name")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise DNSError("Name compression loop")
+            continue
+        if length == 0:
+            offset += 1
+            break
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", errors="replace"))
+        offset += 1 + length
+    return ".".join(labels), end if end is not None else offset
+
+
+def decode_rdata(data: bytes, offset: int, length: int, rtype: int) -> str:
+    rdata = data[offset:offset + length]
+    if rtype == 1 and length == 4:
+        return str(ipaddress.IPv4Address(rdata))
+    if rtype == 28 and length == 16:
+        return str(ipaddress.IPv6Address(rdata))
+    if rtype in (2, 5, 12):
+        return decode_name(data, offset)[0]
+    if rtype == 15:
+        preference = struct.unpack("!H", rdata[:2])[0]
+        return f"{preference} {decode_name(data, offset + 2)[0]}"
+    if rtype == 16:
+        parts, i = [], 0
+        while i < len(rdata):
+            parts.append(rdata[i + 1:i + 1 + rdata[i]].decode("utf-8", errors="replace"))
+            i += 1 + rdata[i]
+        return "".join(parts)
+    if rtype == 33:
+        priority, weight, port = struct.unpack("!HHH", rdata[:6])
+        return f"{priority} {weight} {port} {decode_name(data, offset + 6)[0]}"
+    if rtype == 6:
+        mname, next_offset = decode_name(data, offset)
+        rname, next_offset = decode_name(data, next_offset)
+        serial = struct.unpack("!I", data[next_offset:next_offset + 4])[0]
+        return f"{mname} {rname} {serial}"
+    if rtype == 257:
+        tag_length = rdata[1]
+        return f"{rdata[0]} {rdata[2:2 + tag_length].decode()} {rdata[2 + tag_length:].decode(errors='replace')}"
+    return rdata.hex()
+
+
+def decode_response(data: bytes) -> Dict[str, Any]:
+    """응답 패킷 → {"id", "rcode", "truncated", "question", "answers": [(이름, 타입, TTL, 값)]}"""
+    if len(data) < 12:
+        raise DNSError("Short DNS response")
+    qid, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+    offset = 12
+    question = None
+    for _ in range(qdcount):
+        qname, offset = decode_name(data, offset)
+        qtype = struct.unpack("!H", data[offset:offset + 2])[0]
+        offset += 4
+        question = (qname.lower(), qtype)
+
+    answers = []
+    for _ in range(ancount):
+        name, offset = decode_name(data, offset)
+        rtype, _, ttl, length = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        answers.append((name, rtype, ttl, decode_rdata(data, offset, length, rtype)))
+        offset += length
+    return {
+        "id": qid,
+        "rcode": RCODES.get(flags & 0x0F, str(flags & 0x0F)),
+        "truncated": bool(flags & 0x0200),
+        "question": question,
+        "answers": answers,
+    }
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, resolver: "AsyncResolver"):
+        self.resolver = resolver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.resolver._dispatch(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug(f"DNS socket error: {exc}")
+
+
+class AsyncResolver:
+    """UDP 소켓 하나로 다중화하는 DNS 스텁 리졸버"""
+
+    def __init__(
+        self,
+        nameservers: Optional[List[str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        concurrency: Optional[int] = None,
+    ):
+        if nameservers is None:
+            env = os.getenv(DNS_SERVERS_ENV, "")
+            nameservers = [s for s in env.split(",") if s.strip()] or system_nameservers() or [DEFAULT_NAMESERVER]
+        self.nameservers = [parse_nameserver(s) for s in nameservers]
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        if concurrency is None:
+            concurrency = int(os.getenv(DNS_CONCURRENCY_ENV, DEFAULT_CONCURRENCY))
+        self.concurrency = max(1, concurrency)
+
+        self._transports: Dict[int, asyncio.DatagramTransport] = {}
+        self._pending: Dict[Tuple[int, str, int], asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {"queries": 0, "retries": 0, "tcp_fallbacks": 0, "timeouts": 0}
+
+    async def _transport(self, family: int) -> asyncio.DatagramTransport:
+        transport = self._transports.get(family)
+        if transport is None or transport.is_closing():
+            loop = asyncio.get_running_loop()
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UDPProtocol(self), family=socket.AF_INET6 if family == 6 else socket.AF_INET,
+            )
+            try:
+                transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+            except OSError as e:
+                logger.debug(f"Could not enlarge DNS socket receive buffer: {e}")
+            self._transports[family] = transport
+        return transport
+
+    def _dispatch(self, data: bytes) -> None:
+        try:
+            response = decode_response(data)
+        except (DNSError, struct.error, IndexError, ValueError) as e:
+            logger.debug(f"Ignoring malformed DNS response: {e}")
+            return
+        if response["question"] is None:
+            return
+        future = self._pending.get((response["id"], *response["question"]))
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    def _new_id(self, name: str, qtype: int) -> int:
+        while True:
+            qid = random.randint(0, 0xFFFF)
+            if (qid, name, qtype) not in self._pending:
+                return qid
+
+    async def _query_udp(self, server: Tuple[str, int], name: str, qtype: int) -> Dict[str, Any]:
+        family = ipaddress.ip_address(server[0]).version
+        transport = await self._transport(family)
+        qid = self._new_id(name, qtype)
+        key = (qid, name, qtype)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            transport.sendto(encode_query(qid, name, qtype), server)
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(key, None)
+
+    async def _query_tcp(self, server: Tuple[str, int], name: str, qtype: int) -> Dict[str, Any]:
+        qid = random.randint(0, 0xFFFF)
+        query = encode_query(qid, name, qtype)
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(*server), self.timeout)
+        try:
+            writer.write(struct.pack("!H", len(query)) + query)
+            await writer.drain()
+            length = struct.unpack("!H", await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            return decode_response(await asyncio.wait_for(reader.readexactly(length), self.timeout))
+        finally:
+            writer.close()
+
+    async def query(self, name: str, rtype: str = "A") -> Dict[str, Any]:
+        """이름 하나 조회 → {"status": "NOERROR"|"NXDOMAIN"|...|"TIMEOUT", "answers": [...]}"""
+        qtype = RECORD_TYPES.get(rtype.upper())
+        if qtype is None:
+            return {"status": f"UNSUPPORTED TYPE {rtype}", "answers": []}
+        name = name.strip().rstrip(".").lower()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                # 재시도는 다음 네임서버로
+                server = self.nameservers[attempt % len(self.nameservers)]
+                self._stats["queries"] += 1
+                if attempt:
+                    self._stats["retries"] += 1
+                try:
+                    response = await self._query_udp(server, name, qtype)
+                    if response["truncated"]:
+                        self._stats["tcp_fallbacks"] += 1
+                        response = await self._query_tcp(server, name, qtype)
+                except (asyncio.TimeoutError, OSError, ValueError, DNSError, asyncio.IncompleteReadError):
+                    continue
+                # SERVFAIL/REFUSED는 다른 네임서버에서 다시 시도
+                if response["rcode"] in ("SERVFAIL", "REFUSED") and attempt < self.retries:
+                    continue
+                return {"status": response["rcode"], "answers": response["answers"]}
+
+        self._stats["timeouts"] += 1
+        return {"status": "TIMEOUT", "answers": []}
+
+    async def resolve_many(self, names: List[str], rtypes: Optional[List[str]] = None) -> Dict[str, Any]:
+        """여러 이름 × 레코드 타입을 동시에 조회해 간결한 결과로 정리
+        PTR 조회 시 IP 주소는 in-addr.arpa/ip6.arpa 이름으로 바꿔 묻고 결과는 IP 기준으로 정리
+
+        {"resolved": {이름: {타입: [값]}}, "nxdomain": [이름], "no_answer": [이름], "errors": {이름: 상태}}
+        """
+        names = list(dict.fromkeys(n.strip().rstrip(".").lower() for n in names if n.strip()))
+        rtypes = list(dict.fromkeys(t.upper() for t in rtypes or [])) or ["A"]
+        pairs = [(name, rtype) for name in names for rtype in rtypes]
+        results = await asyncio.gather(*(
+            self.query(reverse_name(name) if rtype == "PTR" else name, rtype) for name, rtype in pairs
+        ))
+
+        resolved: Dict[str, Dict[str, List[str]]] = {}
+        statuses: Dict[str, set] = {}
+        for (name, rtype), result in zip(pairs, results):
+            statuses.setdefault(name, set()).add(result["status"])
+            for _, answer_type, _, value in result["answers"]:
+                type_name = TYPE_NAMES.get(answer_type, str(answer_type))
+                values = resolved.setdefault(name, {}).setdefault(type_name, [])
+                if value not in values:
+                    values.append(value)
+
+        nxdomain, no_answer, errors = [], [], {}
+        for name in names:
+            if name in resolved:
+                continue
+            status = statuses.get(name, set())
+            if "NXDOMAIN" in status:
+                nxdomain.append(name)
+            elif "NOERROR" in status:
+                no_answer.append(name)
+            else:
+                errors[name] = ",".join(sorted(status))
+        return {
+            "resolved": resolved,
+            "nxdomain": nxdomain,
+            "no_answer": no_answer,
+            "errors": errors,
+            "stats": {"names": len(names), "types": rtypes, **self._stats},
+        }
+
+    def close(self) -> None:
+        for transport in self._transports.values():
+            transport.close()
+        self._transports.clear()
@@ -0,0 +1,251 @@
+"""
+Docker Engine API 클라이언트 - /var/run/docker.sock 직접 통신
+docker CLI 프로세스를 띄우지 않고 exec 생성/시작/결과 조회를 수행
+컨트롤 요청(create/inspect)은 keep-alive 연결 풀을 재사용
+"""
+
+import http.client
+import json
+import queue
+import socket
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+
+# 멀티플렉스 스트림 프레임 타입
+STREAM_STDIN = 0
+STREAM_STDOUT = 1
+STREAM_STDERR = 2
+
+FRAME_HEADER = struct.Struct(">BxxxL")
+
+
+class DockerEngineError(Exception):
+    """Docker Engine API 에러"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker Engine API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class ExecOutput:
+    """exec 실행 결과"""
+    exit_code: int
+    stdout: bytes
+    stderr: bytes
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """유닉스 소켓 위의 HTTP 연결"""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def read_frames(response) -> Iterator[Tuple[int, bytes]]:
+    """exec start 응답의 멀티플렉스 프레임 (stream_type, payload) 순회"""
+    while True:
+        header = response.read(FRAME_HEADER.size)
+        if len(header) < FRAME_HEADER.size:
+            return
+        stream_type, size = FRAME_HEADER.unpack(header)
+        payload = response.read(size) if size else b""
+        yield stream_type, payload
+
+
+class DockerEngineClient:
+    """연결 풀 기반 Docker Engine API 클라이언트"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, pool_size: int = 4, timeout: Optional[float] = None):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[UnixHTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self._stats = {"connections_opened": 0, "requests": 0, "execs": 0}
+
+    # ---- 연결 풀 ----
+
+    def _new_connection(self) -> UnixHTTPConnection:
+        with self._lock:
+            self._stats["connections_opened"] += 1
+        return UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+
+    def _acquire(self) -> UnixHTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _release(self, conn: UnixHTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """풀의 모든 연결 종료"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def get_stats(self) -> Dict[str, int]:
+        """연결/요청 통계 반환"""
+        stats = dict(self._stats)
+        stats["idle_connections"] = self._pool.qsize()
+        return stats
+
+    # ---- 요청 ----
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Tuple[int, Any]:
+        """풀 연결로 요청 후 JSON 응답 반환 (끊긴 연결은 한 번 재시도)"""
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError,
+                    http.client.CannotSendRequest, http.client.BadStatusLine):
+                # 서버가 유휴 연결을 닫은 경우 - 새 연결로 재시도
+                conn.close()
+                if attempt == 1:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+
+            with self._lock:
+                self._stats["requests"] += 1
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+
+            is_json = (response.getheader("Content-Type") or "").startswith("application/json")
+            result = json.loads(data) if data and is_json else data
+            if response.status >= 400:
+                message = result.get("message", "") if isinstance(result, dict) else data.decode(errors="ignore")
+                raise DockerEngineError(response.status, message)
+            return response.status, result
+
+        raise DockerEngineError(0, "unreachable")
+
+    def ping(self) -> bool:
+        """데몬 응답 확인"""
+        try:
+            status, _ = self._request("GET", "/_ping")
+        except (OSError, DockerEngineError):
+            return False
+        return status == 200
+
+    # ---- 컨테이너 ----
+
+    def inspect_container(self, name: str) -> Dict[str, Any]:
+        _, result = self._request("GET", f"/containers/{quote(name)}/json")
+        return result
+
+    def start_container(self, name: str) -> None:
+        self._request("POST", f"/containers/{quote(name)}/start")
+
+    def events(self, filters: Dict[str, List[str]], conn_holder: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """이벤트 스트림 (전용 연결 사용, 스트림 종료 시 반환)
+
+        conn_holder가 주어지면 연결을 담아 다른 스레드에서 끊을 수 있게 함
+        """
+        conn = self._new_connection()
+        if conn_holder is not None:
+            conn_holder["conn"] = conn
+        try:
+            conn.request("GET", f"/events?filters={quote(json.dumps(filters))}")
+            response = conn.getresponse()
+            if response.status != 200:
+                raise DockerEngineError(response.status, response.read().decode(errors="ignore"))
+            for line in response:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        finally:
+            conn.close()
+
+    # ---- exec ----
+
+    def create_exec(self, container: str, cmd: List[str], workdir: Optional[str] = None) -> str:
+        body = {
+            "AttachStdin": False,
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "Tty": False,
+            "Cmd": cmd,
+        }
+        if workdir:
+            body["WorkingDir"] = workdir
+        _, result = self._request("POST", f"/containers/{quote(container)}/exec", body)
+        return result["Id"]
+
+    def stream_exec(self, exec_id: str) -> Iterator[Tuple[int, bytes]]:
+        """exec 시작 후 stdout/stderr 프레임을 바로 스트리밍
+
+        시작된 exec 연결은 raw 스트림으로 전환되어 재사용할 수 없으므로 전용 연결 사용
+        """
+        conn = self._new_connection()
+        try:
+            body = json.dumps({"Detach": False, "Tty": False}).encode()
+            conn.request("POST", f"/exec/{exec_id}/start", body=body,
+                         headers={"Content-Type": "application/json"})
+            response = conn.getresponse()
+            if response.status >= 400:
+                raise DockerEngineError(response.status, response.read().decode(errors="ignore"))
+            yield from read_frames(response)
+        finally:
+            conn.close()
+
+    def inspect_exec(self, exec_id: str) -> Dict[str, Any]:
+        _, result = self._request("GET", f"/exec/{exec_id}/json")
+        return result
+
+    def exec_exit_code(self, exec_id: str, retries: int = 20) -> int:
+        """스트림 종료 후 exit code 조회 (프로세스 정리 지연 대비 짧게 재시도)"""
+        for _ in range(retries):
+            info = self.inspect_exec(exec_id)
+            if not info.get("Running") and info.get("ExitCode") is not None:
+                return info["ExitCode"]
+            time.sleep(0.01)
+        return -1
+
+    def exec_run(self, container: str, cmd: List[str], workdir: Optional[str] = None) -> ExecOutput:
+        """exec 생성 → 시작 → 출력 수집 → exit code 조회"""
+        with self._lock:
+            self._stats["execs"] += 1
+
+        exec_id = self.create_exec(container, cmd, workdir)
+        stdout, stderr = [], []
+        for stream_type, payload in self.stream_exec(exec_id):
+            (stderr if stream_type == STREAM_STDERR else stdout).append(payload)
+
+        return ExecOutput(
+            exit_code=self.exec_exit_code(exec_id),
+            stdout=b"".join(stdout),
+            stderr=b"".join(stderr),
+        )
@@ -0,0 +1,293 @@
+"""
+MCP 도구 공용 비동기 명령 실행기
+- 이벤트 루프를 막지 않는 exec (동시 요청 병렬 처리)
+- 도구별 동시 실행 수 제한 (DECEPTICON_TOOL_CONCURRENCY)
+- 실행 중 출력 스트리밍 (on_output 콜백) + 결과 버퍼 크기 상한 (DECEPTICON_MAX_OUTPUT_BYTES)
+- 대용량 출력은 아티팩트로 저장하고 요약만 반환 (DECEPTICON_ARTIFACT_THRESHOLD)
+- 실행 중인 동일 명령은 한 번만 실행하고 결과 공유 (DECEPTICON_COALESCE)
+- 도구별/호출별 실행 시간 제한 - 초과/취소 시 컨테이너 안의 프로세스 그룹 전체 종료 후 부분 출력 반환
+- 컨테이너 풀에서 가장 한가한 컨테이너에 배치 (DECEPTICON_CONTAINERS)
+
+    DECEPTICON_TOOL_CONCURRENCY="nmap=2,hydra=1,*=8"
+    DECEPTICON_TOOL_TIMEOUT="curl=120,dig=60,*=3600"   # 초 단위, 0이면 제한 없음
+"""
+
+import asyncio
+import os
+import shlex
+import uuid
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from src.utils.container.artifacts import ArtifactStore, get_artifact_store
+from src.utils.container.backend import ExecBackend, get_exec_backend
+from src.utils.container.engine import STREAM_STDERR
+from src.utils.container.manager import ContainerManager
+from src.utils.container.output import BoundedOutput, OutputCallback, OutputThrottle, format_timeout
+from src.utils.container.pool import ContainerPool, ContainerUnavailableError, get_container_pool
+from src.utils.container.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+TOOL_CONCURRENCY_ENV = "DECEPTICON_TOOL_CONCURRENCY"
+DEFAULT_TOOL_CONCURRENCY = 8
+
+TOOL_TIMEOUT_ENV = "DECEPTICON_TOOL_TIMEOUT"
+# 빠르게 끝나야 하는 조회 도구는 짧게, 스캔/대입 공격은 길게 (job도 같은 제한 적용)
+DEFAULT_TOOL_TIMEOUTS = {
+    "curl": 120,
+    "dig": 60,
+    "whois": 60,
+    "searchsploit": 120,
+    "command_exec": 600,
+    "*": 3600,
+}
+
+# 프로세스 그룹 종료 시 SIGTERM 후 SIGKILL까지 기다리는 시간(초)
+KILL_GRACE_PERIOD = 2
+
+
+def parse_tool_limits(spec: str, minimum: int = 1, env: str = TOOL_CONCURRENCY_ENV) -> Dict[str, int]:
+    """"nmap=2,hydra=1,*=8" 형식 파싱 (잘못된 항목은 무시)"""
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            limits[name.strip()] = max(minimum, int(value))
+        except ValueError:
+            logger.warning(f"Invalid {env} entry: '{item}'")
+    return limits
+
+
+def build_group_command(command: str, pid_file: str) -> str:
+    """새 세션(프로세스 그룹)에서 명령 실행 - 그룹 ID는 pid_file에 기록
+
+    docker exec 클라이언트를 종료해도 컨테이너 안의 프로세스는 남으므로
+    시간 초과/취소 시 이 그룹 전체를 종료
+    """
+    inner = f"echo $$ > {pid_file}; exec sh -c {shlex.quote(command)}"
+    return f"setsid -w sh -c {shlex.quote(inner)}; rc=$?; rm -f {pid_file}; exit $rc"
+
+
+def build_group_kill_command(pid_file: str, grace: int = KILL_GRACE_PERIOD) -> str:
+    """pid_file의 프로세스 그룹에 SIGTERM, grace초 안에 끝나지 않으면 SIGKILL
+
+    컨테이너 init이 고아 프로세스를 회수하지 않을 수 있어 좀비는 살아 있는 것으로 보지 않음
+    """
+    checks = grace * 10
+    alive = "ps -eo pgid=,stat= | awk -v p=\"$p\" '$1 == p && $2 !~ /^Z/' | grep -q ."
+    return (
+        f"p=$(cat {pid_file} 2>/dev/null); rm -f {pid_file}; [ -n \"$p\" ] || exit 0; "
+        f"kill -TERM -$p 2>/dev/null || exit 0; "
+        f"i=0; while [ $i -lt {checks} ] && {alive}; do sleep 0.1; i=$((i+1)); done; "
+        f"kill -KILL -$p 2>/dev/null; exit 0"
+    )
+
+
+def format_options(options: Optional[Union[str, List[str]]]) -> str:
+    """도구 옵션(문자열 또는 리스트)을 명령행 문자열로 변환"""
+    if options is None:
+        return ""
+    if isinstance(options, list):
+        return " ".join(options)
+    return options
+
+
+class ToolLimits:
+    """도구별 동시 실행 세마포어와 실행 시간 제한"""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default: int = DEFAULT_TOOL_CONCURRENCY,
+        timeouts: Optional[Dict[str, int]] = None,
+    ):
+        if limits is None:
+            limits = parse_tool_limits(os.getenv(TOOL_CONCURRENCY_ENV, ""))
+        self.default = limits.pop("*", default)
+        self.limits = limits
+        if timeouts is None:
+            timeouts = {
+                **DEFAULT_TOOL_TIMEOUTS,
+                **parse_tool_limits(os.getenv(TOOL_TIMEOUT_ENV, ""), minimum=0, env=TOOL_TIMEOUT_ENV),
+            }
+        self.timeouts = timeouts
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._running: Dict[str, int] = {}
+
+    def limit_for(self, tool: str) -> int:
+        return self.limits.get(tool, self.default)
+
+    def timeout_for(self, tool: str, requested: Optional[float] = None) -> Optional[float]:
+        """호출별 요청값 우선, 없으면 도구별 설정값 (0 이하면 제한 없음 → None)"""
+        timeout = requested if requested is not None else self.timeouts.get(tool, self.timeouts.get("*", 0))
+        return timeout if timeout and timeout > 0 else None
+
+    def semaphore(self, tool: str) -> asyncio.Semaphore:
+        if tool not in self._semaphores:
+            self._semaphores[tool] = asyncio.Semaphore(self.limit_for(tool))
+        return self._semaphores[tool]
+
+    @asynccontextmanager
+    async def slot(self, tool: str) -> AsyncIterator[None]:
+        """도구 실행 슬롯 확보 (제한 초과 시 대기)"""
+        async with self.semaphore(tool):
+            self._running[tool] = self._running.get(tool, 0) + 1
+            try:
+                yield
+            finally:
+                self._running[tool] -= 1
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """도구별 실행 중 개수/제한 반환"""
+        return {
+            tool: {"running": self._running.get(tool, 0), "limit": self.limit_for(tool)}
+            for tool in self._semaphores
+        }
+
+
+class CommandRunner:
+    """공격 컨테이너(풀)에서 셸 명령을 비동기로 실행
+
+    container_name을 지정하면 그 컨테이너 하나만 사용, 없으면 전역 컨테이너 풀 사용
+    """
+
+    def __init__(
+        self,
+        container_name: Optional[str] = None,
+        backend: Optional[ExecBackend] = None,
+        manager: Optional[ContainerManager] = None,
+        limits: Optional[ToolLimits] = None,
+        artifacts: Optional[ArtifactStore] = None,
+        flights: Optional[SingleFlight] = None,
+        pool: Optional[ContainerPool] = None,
+    ):
+        if pool is None:
+            if container_name is None:
+                pool = get_container_pool()
+            else:
+                pool = ContainerPool([container_name], managers={container_name: manager} if manager else None)
+        self.pool = pool
+        self.backend = backend or get_exec_backend()
+        self.limits = limits or ToolLimits()
+        self.artifacts = artifacts or get_artifact_store()
+        self.flights = flights or SingleFlight()
+
+    async def run(
+        self,
+        command: str,
+        tool: str = "command",
+        on_output: Optional[OutputCallback] = None,
+        sink: Optional[Callable[[bytes], Awaitable[None]]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """명령 실행 후 결과 문자열 반환 (실패 시 "[-] ..." 메시지)
+
+        같은 도구/명령이 실행 중이면 새로 실행하지 않고 그 결과를 함께 받음
+        (sink는 요청별 원본 출력이 필요하므로 병합하지 않음)
+
+        Args:
+            on_output: 실행 중 stdout 조각을 받을 콜백 (예: mcp_output_emitter)
+            sink: stdout 원본 bytes를 그대로 받을 콜백 (예: 스트리밍 파서)
+            timeout: 실행 시간 제한(초) - 없으면 도구별 설정값 (DECEPTICON_TOOL_TIMEOUT)
+        """
+        if sink is not None:
+            return await self._execute(command, tool, on_output, sink, timeout)
+        return await self.flights.do(
+            (tool, command),
+            lambda emit: self._execute(command, tool, emit, timeout=timeout),
+            on_output,
+        )
+
+    @property
+    def container_name(self) -> str:
+        return self.pool.primary
+
+    async def kill_group(self, container: str, pid_file: str) -> None:
+        """실행 중인 명령의 프로세스 그룹 종료 (실패는 무시)"""
+        try:
+            await self.backend.aexec(container, ["sh", "-c", build_group_kill_command(pid_file)])
+        except Exception as e:
+            logger.warning(f"Failed to kill process group ({pid_file}): {e}")
+
+    async def _execute(
+        self,
+        command: str,
+        tool: str,
+        on_output: Optional[OutputCallback] = None,
+        sink: Optional[Callable[[bytes], Awaitable[None]]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        stdout = BoundedOutput()
+        stderr = BoundedOutput()
+        # 전체 stdout은 아티팩트 후보로 디스크에 기록 (임계값 이하면 버림)
+        artifact = self.artifacts.writer()
+        throttle = OutputThrottle(on_output) if on_output else None
+        deadline = self.limits.timeout_for(tool, timeout)
+        pid_file = f"/tmp/decepticon-{uuid.uuid4().hex[:12]}.pgid"
+        timed_out = False
+
+        async def on_chunk(stream_type: int, data: bytes) -> None:
+            if stream_type == STREAM_STDERR:
+                stderr.write(data)
+                return
+            stdout.write(data)
+            artifact.write(data)
+            if sink:
+                await sink(data)
+            if throttle:
+                await throttle.feed(data)
+
+        try:
+            async with self.limits.slot(tool), self.pool.lease() as container:
+                # 컨테이너 상태 확인은 lease에서 수행 (캐시됨 - 실패/이벤트 발생 시에만 재확인)
+                # ✅ Kali Linux 컨테이너에서 명령어 실행 (프로세스 그룹 단위로 관리)
+                exec_command = ["sh", "-c", build_group_command(command, pid_file)]
+                try:
+                    returncode = await asyncio.wait_for(
+                        self.backend.aexec_stream(container.name, exec_command, on_chunk), deadline
+                    )
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    await self.kill_group(container.name, pid_file)
+                except asyncio.CancelledError:
+                    # 클라이언트 연결 종료/그래프 중단 - 취소와 관계없이 그룹 종료는 끝까지 수행
+                    await asyncio.shield(self.kill_group(container.name, pid_file))
+                    raise
+
+            if throttle:
+                await throttle.flush()
+
+            if timed_out:
+                output = stdout.getvalue().strip()
+                artifact_id = artifact.commit()
+                if artifact_id:
+                    output = self.artifacts.summarize(output, artifact_id, tool, raw_head=artifact.head)
+                return format_timeout(deadline, output)
+
+            if returncode != 0:
+                error = stderr.getvalue()
+                container.manager.report_exec_failure(returncode, error)
+                return f"[-] Command execution error: {error.strip()}"
+
+            output = stdout.getvalue().strip()
+            artifact_id = artifact.commit()
+            if artifact_id:
+                return self.artifacts.summarize(output, artifact_id, tool, raw_head=artifact.head)
+            return f"{output}"
+
+        except ContainerUnavailableError as e:
+            return str(e)
+
+        except FileNotFoundError:
+            return "[-] Docker command not found. Is Docker installed and in PATH?"
+
+        except Exception as e:
+            return f"[-] Error: {str(e)} (Type: {type(e).__name__})"
+
+        finally:
+            # 저장되지 않은 임시 파일 정리 (실패/취소 포함, commit 후에는 아무 일도 하지 않음)
+            artifact.discard()
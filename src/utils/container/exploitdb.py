@@ -0,0 +1,466 @@
+"""
+searchsploit 네이티브 검색 엔진 - Initial_Access MCP 서버용
+ExploitDB CSV(files_exploits.csv)를 한 번 읽어 역색인으로 유지하고
+searchsploit 호출마다 docker exec + 스크립트로 DB 전체를 훑던 비용 제거
+
+    DECEPTICON_EXPLOITDB_CSV=/usr/share/exploitdb/files_exploits.csv   # 로컬 CSV 경로 (없으면 공격 컨테이너에서 복사)
+    DECEPTICON_EXPLOITDB_CACHE=cache/exploitdb                          # 컨테이너에서 복사한 CSV 보관 위치
+    DECEPTICON_EXPLOITDB_CHECK_INTERVAL=300                             # 컨테이너 CSV mtime 확인 간격(초)
+
+CSV mtime이 바뀐 경우에만 색인을 다시 만들고, 지원하지 않는 옵션은 기존 searchsploit 실행으로 넘김
+"""
+
+import asyncio
+import csv
+import json
+import os
+import re
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from src.utils.container.backend import ExecBackend
+from src.utils.container.engine import STREAM_STDOUT
+
+logger = logging.getLogger(__name__)
+
+EXPLOITDB_CSV_ENV = "DECEPTICON_EXPLOITDB_CSV"
+EXPLOITDB_CACHE_ENV = "DECEPTICON_EXPLOITDB_CACHE"
+EXPLOITDB_CHECK_INTERVAL_ENV = "DECEPTICON_EXPLOITDB_CHECK_INTERVAL"
+
+CONTAINER_EXPLOITDB_DIR = "/usr/share/exploitdb"
+DEFAULT_CACHE_DIR = os.path.join("cache", "exploitdb")
+DEFAULT_CHECK_INTERVAL = 300.0
+
+# (searchsploit 결과 구분, CSV 파일명, 웹 URL 경로)
+DATABASES = (
+    ("exploits", "files_exploits.csv", "exploits"),
+    ("shellcodes", "files_shellcodes.csv", "shellcodes"),
+)
+
+# 네이티브 엔진이 처리하는 searchsploit 옵션 (그 외는 컨테이너 searchsploit로 실행)
+TITLE_OPTIONS = ("-t", "--title")
+JSON_OPTIONS = ("-j", "--json")
+WWW_OPTIONS = ("-w", "--www")
+SUPPORTED_OPTIONS = TITLE_OPTIONS + JSON_OPTIONS + WWW_OPTIONS
+
+TOKEN_SPLIT_RE = re.compile(r"[^a-z0-9.]+")
+# "2.4.49", "7" 또는 접미사가 붙은 점 표기 버전 "7.2p2", "2.4.49-1" (범위 비교에는 앞의 숫자 부분만 사용)
+VERSION_TERM_RE = re.compile(r"^(\d+(?:\.\d+)*)$|^(\d+(?:\.\d+)+)[a-z_+~-][a-z0-9._+~-]*$")
+# "2.4.17 < 2.4.38", "< 7.7", "2.6.x < 3.x"
+VERSION_RANGE_RE = re.compile(r"(?:(?<![\w.])(\d+(?:\.(?:\d+|x))*)\S*\s+)?<\s*(\d+(?:\.(?:\d+|x))*)")
+# "2.4.x"
+VERSION_WILDCARD_RE = re.compile(r"(?<![\d.])(\d+(?:\.\d+)*)\.x\b")
+# "Tomcat < 9.0.1 / < 8.5.23"처럼 범위 바로 앞이 "/"나 ","면 앞 범위의 제품을 이어받음
+RANGE_CHAIN_RE = re.compile(r"[/,]\s*$")
+
+# 이 길이 미만의 검색어는 trigram 없이 어휘 전체를 확인
+TRIGRAM = 3
+TERM_CACHE_SIZE = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    return [t.strip(".") for t in TOKEN_SPLIT_RE.split(text.lower()) if t.strip(".")]
+
+
+class IndexTimeout(Exception):
+    """색인 검색이 제한 시간 안에 끝나지 않음 (deadline: 적용한 제한 시간(초))"""
+
+    def __init__(self, deadline: float):
+        super().__init__(f"ExploitDB index did not answer within {deadline:g}s")
+        self.deadline = deadline
+
+
+def version_term(term: str) -> Optional[Tuple[int, ...]]:
+    """버전 형태 검색어의 숫자 부분 ("7.2p2" → (7, 2)), 버전이 아니면 None"""
+    match = VERSION_TERM_RE.match(term)
+    if not match:
+        return None
+    return parse_version(match.group(1) or match.group(2))[0]
+
+
+def parse_version(text: str) -> Tuple[Tuple[int, ...], bool]:
+    """"2.4.x" → ((2, 4), True) - x 이후는 와일드카드"""
+    parts = []
+    for part in text.split("."):
+        if part == "x":
+            return tuple(parts), True
+        parts.append(int(part))
+    return tuple(parts), False
+
+
+@dataclass(frozen=True)
+class VersionRange:
+    low: Optional[Tuple[int, ...]]
+    high: Optional[Tuple[int, ...]]
+    high_wildcard: bool = False
+    # 제목에서 범위 바로 앞의 단어 ("OpenSSH 2.3 < 7.7" → "openssh") - 이 범위가 속한 제품
+    product: str = ""
+
+    def contains(self, version: Tuple[int, ...]) -> bool:
+        if self.low is not None and version < self.low:
+            return False
+        if self.high is None:
+            return True
+        if self.high_wildcard:
+            return version[:len(self.high)] <= self.high
+        return version < self.high
+
+
+def preceding_word(text: str) -> str:
+    """text 끝에서 가장 가까운 숫자로 시작하지 않는 토큰"""
+    for token in reversed(tokenize(text)):
+        if not token[0].isdigit():
+            return token
+    return ""
+
+
+def extract_version_ranges(title: str) -> List[VersionRange]:
+    """제목의 버전 범위 표기와 그 범위가 속한 제품 단어 추출 ("< 7.7", "2.4.17 < 2.4.38", "2.6.x")"""
+    title = title.lower()
+    # (시작 위치, 끝 위치, 하한, 상한, 상한 와일드카드)
+    found = []
+    for match in VERSION_RANGE_RE.finditer(title):
+        low = parse_version(match.group(1))[0] if match.group(1) else None
+        high, wildcard = parse_version(match.group(2))
+        found.append((match.start(), match.end(), low, high, wildcard))
+    for match in VERSION_WILDCARD_RE.finditer(title):
+        prefix = parse_version(match.group(1))[0]
+        found.append((match.start(), match.end(), prefix, prefix, True))
+
+    ranges = []
+    previous_end, previous_product = 0, ""
+    for start, end, low, high, wildcard in sorted(found, key=lambda item: item[:2]):
+        before = title[:start]
+        if previous_product and start >= previous_end and RANGE_CHAIN_RE.search(title[previous_end:start]):
+            product = previous_product
+        else:
+            product = preceding_word(before)
+        ranges.append(VersionRange(low, high, wildcard, product))
+        previous_end, previous_product = max(previous_end, end), product
+    return ranges
+
+
+class ExploitIndex:
+    """ExploitDB CSV 한 개에 대한 역색인
+
+    제목/경로 토큰 → 행 번호 색인과 어휘 trigram 색인으로
+    searchsploit와 같은 부분 문자열(대소문자 무시) AND 검색을 수행
+    """
+
+    def __init__(self, rows: List[Dict[str, str]]):
+        self.rows = rows
+        self.title_postings: Dict[str, Set[int]] = {}
+        self.path_postings: Dict[str, Set[int]] = {}
+        self.ranges: Dict[int, List[VersionRange]] = {}
+
+        for row_id, row in enumerate(rows):
+            title = row.get("description", "")
+            for token in tokenize(title):
+                self.title_postings.setdefault(token, set()).add(row_id)
+            for token in tokenize(row.get("file", "")):
+                self.path_postings.setdefault(token, set()).add(row_id)
+            ranges = extract_version_ranges(title)
+            if ranges:
+                self.ranges[row_id] = ranges
+
+        self.vocab = sorted(set(self.title_postings) | set(self.path_postings))
+        self.trigrams: Dict[str, List[int]] = {}
+        for vocab_id, token in enumerate(self.vocab):
+            for gram in {token[i:i + TRIGRAM] for i in range(len(token) - TRIGRAM + 1)}:
+                self.trigrams.setdefault(gram, []).append(vocab_id)
+
+        self._term_cache: Dict[Tuple[str, bool], FrozenSet[int]] = {}
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ExploitIndex":
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            return cls(list(csv.DictReader(f)))
+
+    def _matching_tokens(self, term: str) -> Iterable[str]:
+        """term을 부분 문자열로 포함하는 어휘 토큰"""
+        if len(term) < TRIGRAM:
+            return (token for token in self.vocab if term in token)
+
+        candidates: Optional[Set[int]] = None
+        grams = sorted(
+            (self.trigrams.get(term[i:i + TRIGRAM], []) for i in range(len(term) - TRIGRAM + 1)),
+            key=len,
+        )
+        for ids in grams:
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+            if not candidates:
+                return ()
+        return (self.vocab[i] for i in candidates if term in self.vocab[i])
+
+    def term_rows(self, term: str, title_only: bool = False) -> FrozenSet[int]:
+        """검색어 하나와 일치하는 행 번호 (결과는 재사용)"""
+        key = (term, title_only)
+        cached = self._term_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # "mod_copy"처럼 구분자가 들어간 검색어는 토큰별 AND로 근사
+        parts = tokenize(term) or [term]
+        result: Optional[Set[int]] = None
+        for part in parts:
+            rows: Set[int] = set()
+            for token in self._matching_tokens(part):
+                rows |= self.title_postings.get(token, set())
+                if not title_only:
+                    rows |= self.path_postings.get(token, set())
+            result = rows if result is None else result & rows
+
+        if len(self._term_cache) >= TERM_CACHE_SIZE:
+            self._term_cache.clear()
+        self._term_cache[key] = frozenset(result or ())
+        return self._term_cache[key]
+
+    def search(self, query: str, title_only: bool = False) -> List[Dict[str, str]]:
+        """모든 검색어를 포함하는 행을 제목순으로 반환
+
+        버전 형태의 검색어(예: 2.4.49, 7.2p2)는 제목의 버전 범위("< 2.4.50", "2.4.x")에 속해도 일치로 판단
+        (범위 비교는 앞의 숫자 부분으로, 문자열 일치는 검색어 전체로 확인)
+        범위는 바로 앞 제품 단어가 검색어 단어와 일치할 때만 인정 ("apache 2.4.49"는 "Apache Tomcat < 9.0.1"과 불일치)
+        검색어에 단어가 없거나 점이 없는 버전("7")은 문자열 일치만 사용
+        """
+        terms = [t for t in query.lower().split() if t]
+        if not terms:
+            return []
+
+        versions = [(t, v) for t, v in ((t, version_term(t)) for t in terms) if v is not None]
+        words = [t for t in terms if version_term(t) is None]
+
+        # 문자열 검색어부터 작은 집합 순으로 교집합
+        candidates: Optional[Set[int]] = None
+        for rows in sorted((self.term_rows(t, title_only) for t in words), key=len):
+            candidates = set(rows) if candidates is None else candidates & rows
+            if not candidates:
+                return []
+
+        word_parts = [part for word in words for part in tokenize(word)]
+        for term, version in versions:
+            text_rows = self.term_rows(term, title_only)
+            if candidates is None:
+                candidates = set(text_rows)
+            elif len(version) < 2:
+                candidates &= text_rows
+            else:
+                candidates = {
+                    row_id for row_id in candidates
+                    if row_id in text_rows
+                    or any(
+                        r.contains(version) and any(part in r.product for part in word_parts)
+                        for r in self.ranges.get(row_id, ())
+                    )
+                }
+            if not candidates:
+                return []
+
+        return sorted((self.rows[i] for i in candidates), key=lambda row: row.get("description", "").lower())
+
+
+def split_options(options: str) -> Tuple[Set[str], bool]:
+    """(네이티브 처리 옵션 집합, 전부 지원 여부)"""
+    flags = set(options.split())
+    return flags, flags <= set(SUPPORTED_OPTIONS)
+
+
+def display_path(row: Dict[str, str], database: str) -> str:
+    """searchsploit 표와 같이 "exploits/" 접두사를 뺀 경로"""
+    path = row.get("file", "")
+    prefix = f"{database}/"
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def format_table(results: Dict[str, List[Dict[str, str]]], www: bool = False) -> str:
+    """searchsploit 기본 출력과 같은 제목 | 경로 표"""
+    lines = []
+    for database, _, url_path in DATABASES:
+        label = database.capitalize()
+        rows = results.get(database)
+        if rows is None:
+            continue
+        if not rows:
+            lines.append(f"{label}: No Results")
+            continue
+
+        header = f"{label[:-1]} Title"
+        right_header = "URL" if www else "Path"
+        values = [
+            (row.get("description", ""),
+             f"https://www.exploit-db.com/{url_path}/{row.get('id', '')}" if www else display_path(row, database))
+            for row in rows
+        ]
+        width = max(len(header) + 1, max(len(title) for title, _ in values))
+        right_width = max(len(right_header) + 1, max(len(path) for _, path in values))
+        rule = f"{'-' * (width + 1)} {'-' * (right_width + 1)}"
+        lines.extend([rule, f" {header.ljust(width - 1)} |  {right_header}", rule])
+        lines.extend(f"{title.ljust(width)} | {path}" for title, path in values)
+        lines.append(rule)
+    return "\n".join(lines)
+
+
+def format_json(query: str, results: Dict[str, List[Dict[str, str]]], db_dir: str) -> str:
+    """searchsploit -j와 같은 필드 구성"""
+
+    def record(row: Dict[str, str]) -> Dict[str, str]:
+        return {
+            "Title": row.get("description", ""),
+            "EDB-ID": row.get("id", ""),
+            "Date_Published": row.get("date_published", ""),
+            "Date_Added": row.get("date_added", ""),
+            "Date_Updated": row.get("date_updated", ""),
+            "Author": row.get("author", ""),
+            "Type": row.get("type", ""),
+            "Platform": row.get("platform", ""),
+            "Port": row.get("port", ""),
+            "Verified": row.get("verified", ""),
+            "Codes": row.get("codes", ""),
+            "Tags": row.get("tags", ""),
+            "Aliases": row.get("aliases", ""),
+            "Screenshot": row.get("screenshot_url", ""),
+            "Application": row.get("application_url", ""),
+            "Source": row.get("source_url", ""),
+            "Path": f"{db_dir}/{row.get('file', '')}",
+        }
+
+    payload: Dict[str, Any] = {"SEARCH": query}
+    for database, _, _ in DATABASES:
+        if database in results:
+            payload[f"DB_PATH_{database[:-1].upper()}"] = db_dir
+            payload[f"RESULTS_{database[:-1].upper()}"] = [record(row) for row in results[database]]
+    return json.dumps(payload, indent="\t", ensure_ascii=False)
+
+
+class SearchsploitEngine:
+    """CSV mtime이 바뀔 때만 색인을 다시 만드는 searchsploit 대체 엔진"""
+
+    def __init__(
+        self,
+        backend: Optional[ExecBackend] = None,
+        container_name: str = "attacker",
+        csv_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        check_interval: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.container_name = container_name
+        local_csv = os.getenv(EXPLOITDB_CSV_ENV, "")
+        # 로컬 CSV가 지정되면 같은 디렉토리의 shellcode CSV도 사용
+        self.csv_dir = csv_dir or (os.path.dirname(local_csv) if local_csv else None)
+        self.cache_dir = cache_dir or os.getenv(EXPLOITDB_CACHE_ENV, DEFAULT_CACHE_DIR)
+        if check_interval is None:
+            check_interval = float(os.getenv(EXPLOITDB_CHECK_INTERVAL_ENV, DEFAULT_CHECK_INTERVAL))
+        self.check_interval = check_interval
+
+        self.indexes: Dict[str, ExploitIndex] = {}
+        self._mtimes: Dict[str, float] = {}
+        self._last_check = 0.0
+        self._lock = asyncio.Lock()
+        self._stats = {"queries": 0, "builds": 0, "build_seconds": 0.0, "fallbacks": 0}
+
+    @property
+    def local(self) -> bool:
+        return self.csv_dir is not None
+
+    async def _container_mtimes(self) -> Dict[str, float]:
+        files = " ".join(f"{CONTAINER_EXPLOITDB_DIR}/{name}" for _, name, _ in DATABASES)
+        result = await self.backend.aexec(self.container_name, ["sh", "-c", f"stat -c '%n %Y' {files} 2>/dev/null"])
+        mtimes = {}
+        for line in result.stdout.splitlines():
+            path, _, mtime = line.rpartition(" ")
+            if mtime.isdigit():
+                mtimes[os.path.basename(path)] = float(mtime)
+        return mtimes
+
+    async def _copy_from_container(self, name: str) -> str:
+        """컨테이너 CSV를 로컬 캐시로 복사 후 경로 반환"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            async def on_chunk(stream_type: int, data: bytes) -> None:
+                if stream_type == STREAM_STDOUT:
+                    f.write(data)
+
+            returncode = await self.backend.aexec_stream(
+                self.container_name, ["cat", f"{CONTAINER_EXPLOITDB_DIR}/{name}"], on_chunk
+            )
+        if returncode != 0:
+            os.unlink(temp_path)
+            raise RuntimeError(f"Failed to copy {name} from container '{self.container_name}'")
+        os.replace(temp_path, path)
+        return path
+
+    async def refresh(self, force: bool = False) -> None:
+        """CSV mtime이 바뀐 데이터베이스만 색인 재생성"""
+        async with self._lock:
+            now = time.monotonic()
+            if not force and self.indexes and not self.local and now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+
+            if self.local:
+                mtimes = {
+                    name: os.path.getmtime(os.path.join(self.csv_dir, name))
+                    for _, name, _ in DATABASES if os.path.exists(os.path.join(self.csv_dir, name))
+                }
+            else:
+                mtimes = await self._container_mtimes()
+            if not mtimes:
+                raise RuntimeError("ExploitDB CSV not found")
+
+            for database, name, _ in DATABASES:
+                if name not in mtimes or (not force and self._mtimes.get(name) == mtimes[name]):
+                    continue
+                if self.local:
+                    path = os.path.join(self.csv_dir, name)
+                else:
+                    path = await self._copy_from_container(name)
+                started = time.perf_counter()
+                self.indexes[database] = await asyncio.to_thread(ExploitIndex.from_csv, path)
+                self._mtimes[name] = mtimes[name]
+                self._stats["builds"] += 1
+                self._stats["build_seconds"] = round(time.perf_counter() - started, 3)
+                logger.info(f"Indexed {len(self.indexes[database].rows)} {database} from {name}")
+
+    async def search_many(self, queries: List[str], options: str = "") -> Optional[Dict[str, str]]:
+        """여러 검색어를 한 번에 처리 - 지원하지 않는 옵션이거나 CSV를 읽지 못하면 None"""
+        flags, supported = split_options(options)
+        if not supported:
+            self._stats["fallbacks"] += 1
+            return None
+
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"ExploitDB index unavailable, using searchsploit: {e}")
+            self._stats["fallbacks"] += 1
+            return None
+
+        title_only = bool(flags & set(TITLE_OPTIONS))
+        outputs = {}
+        for query in queries:
+            self._stats["queries"] += 1
+            results = {
+                database: index.search(query, title_only)
+                for database, index in self.indexes.items()
+            }
+            if flags & set(JSON_OPTIONS):
+                outputs[query] = format_json(query, results, CONTAINER_EXPLOITDB_DIR)
+            else:
+                outputs[query] = format_table(results, www=bool(flags & set(WWW_OPTIONS)))
+        return outputs
+
+    async def search(self, query: str, options: str = "") -> Optional[str]:
+        outputs = await self.search_many([query], options)
+        return outputs[query] if outputs is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "entries": {database: len(index.rows) for database, index in self.indexes.items()},
+            "source": self.csv_dir if self.local else f"{self.container_name}:{CONTAINER_EXPLOITDB_DIR}",
+        }
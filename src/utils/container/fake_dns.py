@@ -0,0 +1,190 @@
+"""
+가짜 DNS 서버 - 실제 네임서버 없이 AsyncResolver(dig_bulk)를 테스트/벤치마크하기 위한 용도
+같은 포트에서 UDP/TCP 질의에 응답하고, 재시도/다음 네임서버/TCP 전환 경로를 일부러 유도할 수 있음
+
+    with FakeDNSServer({"www.example.com": {"A": ["10.0.0.5"]}}, truncate={"big.example.com"}) as dns:
+        resolver = AsyncResolver([dns.address])
+        ...
+
+- records에 없는 이름은 NXDOMAIN, 이름은 있지만 요청 타입 레코드가 없으면 답 없는 NOERROR
+- servfail: SERVFAIL로 응답할 이름 / rcode: 모든 질의에 같은 응답 코드 (고장난 네임서버 흉내)
+- truncate: UDP로는 TC 비트만 설정한 빈 응답 (TCP로 다시 물어야 답을 받음)
+- drop: 이름별 첫 UDP 질의는 응답하지 않음 (시간 초과 후 재시도) / silent: UDP 질의에 전혀 응답하지 않음
+"""
+
+import ipaddress
+import socket
+import socketserver
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.container.dns_resolver import RECORD_TYPES, decode_name, encode_name
+
+RCODE_VALUES = {"NOERROR": 0, "FORMERR": 1, "SERVFAIL": 2, "NXDOMAIN": 3, "NOTIMP": 4, "REFUSED": 5}
+FLAG_QR_RD_RA = 0x8180
+FLAG_TC = 0x0200
+DEFAULT_TTL = 60
+UDP_RECEIVE_BUFFER = 4 * 1024 * 1024
+
+
+def encode_rdata(rtype: int, value: str) -> bytes:
+    if rtype == RECORD_TYPES["A"]:
+        return ipaddress.IPv4Address(value).packed
+    if rtype == RECORD_TYPES["AAAA"]:
+        return ipaddress.IPv6Address(value).packed
+    if rtype in (RECORD_TYPES["CNAME"], RECORD_TYPES["NS"], RECORD_TYPES["PTR"]):
+        return encode_name(value)
+    raise ValueError(f"Unsupported record type for fake DNS: {rtype}")
+
+
+class _UDPServer(socketserver.UDPServer):
+    # 응답 생성은 짧으므로 한 스레드에서 순서대로 처리 (질의마다 스레드를 만들면 수신 버퍼가 넘침)
+    max_packet_size = 65535
+    dns: "FakeDNSServer"
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECEIVE_BUFFER)
+        super().server_bind()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    # TC 응답 뒤 TCP 재질의가 한꺼번에 몰려도 연결이 거부되지 않도록
+    request_queue_size = 1024
+    dns: "FakeDNSServer"
+
+
+class _UDPHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        data, sock = self.request
+        self.server.dns._count("udp_queries")
+        response = self.server.dns.answer(data)
+        if response is not None:
+            sock.sendto(response, self.client_address)
+
+
+class _TCPHandler(socketserver.StreamRequestHandler):
+    """2바이트 길이 접두사로 구분된 질의를 연결이 닫힐 때까지 처리"""
+
+    def handle(self):
+        while True:
+            header = self.rfile.read(2)
+            if len(header) < 2:
+                return
+            query = self.rfile.read(struct.unpack("!H", header)[0])
+            self.server.dns._count("tcp_queries")
+            response = self.server.dns.answer(query, tcp=True)
+            if response is None:
+                return
+            self.wfile.write(struct.pack("!H", len(response)) + response)
+
+
+class FakeDNSServer:
+    """로컬 UDP/TCP 스텁 DNS 서버 (백그라운드 스레드)"""
+
+    def __init__(
+        self,
+        records: Optional[Dict[str, Dict[str, List[str]]]] = None,
+        host: str = "127.0.0.1",
+        servfail: Iterable[str] = (),
+        truncate: Iterable[str] = (),
+        drop: Iterable[str] = (),
+        rcode: Optional[str] = None,
+        silent: bool = False,
+    ):
+        self.host = host
+        # 이름 → {타입: [값]}
+        self.records = {name.rstrip(".").lower(): answers for name, answers in (records or {}).items()}
+        self.servfail = {name.lower() for name in servfail}
+        self.truncate = {name.lower() for name in truncate}
+        self.drop = {name.lower() for name in drop}
+        self.rcode = rcode
+        self.silent = silent
+        self.port: Optional[int] = None
+        self.stats = {"udp_queries": 0, "tcp_queries": 0, "dropped": 0, "truncated": 0, "servfail": 0}
+        self._dropped: set = set()
+        self._lock = threading.Lock()
+        self._udp: Optional[_UDPServer] = None
+        self._tcp: Optional[_TCPServer] = None
+
+    @property
+    def address(self) -> str:
+        """AsyncResolver 네임서버 표기 ("IP:포트")"""
+        return f"{self.host}:{self.port}"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def answer(self, query: bytes, tcp: bool = False) -> Optional[bytes]:
+        """질의 패킷 → 응답 패킷 (None이면 응답하지 않음)"""
+        if len(query) < 12:
+            return None
+        qid = struct.unpack("!H", query[:2])[0]
+        name, offset = decode_name(query, 12)
+        qtype = struct.unpack("!H", query[offset:offset + 2])[0]
+        question = query[12:offset + 4]
+        name = name.lower()
+
+        if not tcp:
+            if self.silent:
+                return None
+            with self._lock:
+                if name in self.drop and name not in self._dropped:
+                    self._dropped.add(name)
+                    self.stats["dropped"] += 1
+                    return None
+
+        answers: List[Tuple[int, str]] = []
+        if self.rcode is not None:
+            rcode = RCODE_VALUES[self.rcode]
+        elif name in self.servfail:
+            rcode = RCODE_VALUES["SERVFAIL"]
+        elif name not in self.records:
+            rcode = RCODE_VALUES["NXDOMAIN"]
+        else:
+            rcode = RCODE_VALUES["NOERROR"]
+            for type_name, values in self.records[name].items():
+                if RECORD_TYPES.get(type_name.upper()) == qtype:
+                    answers += [(qtype, value) for value in values]
+        if rcode == RCODE_VALUES["SERVFAIL"]:
+            self._count("servfail")
+
+        flags = FLAG_QR_RD_RA | rcode
+        if not tcp and name in self.truncate:
+            # 실제 서버처럼 UDP 크기를 넘는 응답은 잘렸다고 표시하고 답은 비움
+            self._count("truncated")
+            flags |= FLAG_TC
+            answers = []
+
+        packet = struct.pack("!HHHHHH", qid, flags, 1, len(answers), 0, 0) + question
+        for rtype, value in answers:
+            rdata = encode_rdata(rtype, value)
+            # 이름은 질문(오프셋 12)을 가리키는 압축 포인터
+            packet += struct.pack("!HHHIH", 0xC00C, rtype, 1, DEFAULT_TTL, len(rdata)) + rdata
+        return packet
+
+    def start(self) -> "FakeDNSServer":
+        # UDP 포트를 먼저 잡고 같은 번호로 TCP 리스너 생성
+        self._udp = _UDPServer((self.host, 0), _UDPHandler)
+        self.port = self._udp.server_address[1]
+        self._tcp = _TCPServer((self.host, self.port), _TCPHandler)
+        for server, label in ((self._udp, "udp"), (self._tcp, "tcp")):
+            server.dns = self
+            threading.Thread(target=server.serve_forever, name=f"fake-dns-{label}", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        for server in (self._udp, self._tcp):
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+        self._udp = self._tcp = None
+
+    def __enter__(self) -> "FakeDNSServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,234 @@
+"""
+가짜 Docker Engine API 서버 - Docker 없이 API 백엔드를 테스트/벤치마크하기 위한 용도
+유닉스 소켓에서 Engine API 일부를 흉내내고 exec 명령은 로컬 프로세스로 실행
+
+    with FakeDockerEngine() as engine:
+        os.environ["DOCKER_SOCKET"] = engine.socket_path
+        ...
+"""
+
+import http.server
+import json
+import os
+import queue
+import re
+import selectors
+import socketserver
+import struct
+import subprocess
+import tempfile
+import threading
+import uuid
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+FRAME_HEADER = struct.Struct(">BxxxL")
+VERSION_PREFIX = re.compile(r"^/v\d+\.\d+")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    engine: "FakeDockerEngine"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.engine._count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    # UnixStreamServer는 client_address가 문자열이라 기본 구현이 깨짐
+    def address_string(self):
+        return "docker.sock"
+
+    def _path(self) -> str:
+        return VERSION_PREFIX.sub("", urlparse(self.path).path)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _send_json(self, status: int, data: Optional[Dict[str, Any]] = None):
+        payload = json.dumps(data).encode() if data is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        engine = self.server.engine
+        engine._count("requests")
+        path = self._path()
+
+        if path == "/_ping":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"OK")
+            return
+
+        match = re.fullmatch(r"/containers/([^/]+)/json", path)
+        if match:
+            name = match.group(1)
+            if name not in engine.containers:
+                return self._send_json(404, {"message": f"No such container: {name}"})
+            return self._send_json(200, {"Name": f"/{name}", "State": {"Running": engine.containers[name]}})
+
+        match = re.fullmatch(r"/exec/([^/]+)/json", path)
+        if match:
+            info = engine.execs.get(match.group(1))
+            if info is None:
+                return self._send_json(404, {"message": "No such exec instance"})
+            return self._send_json(200, {"Running": info["exit_code"] is None, "ExitCode": info["exit_code"]})
+
+        if path == "/events":
+            return self._stream_events()
+
+        self._send_json(404, {"message": "page not found"})
+
+    def do_POST(self):
+        engine = self.server.engine
+        engine._count("requests")
+        path = self._path()
+        body = self._body()
+
+        match = re.fullmatch(r"/containers/([^/]+)/start", path)
+        if match:
+            name = match.group(1)
+            if name not in engine.containers:
+                return self._send_json(404, {"message": f"No such container: {name}"})
+            engine.containers[name] = True
+            engine.emit_event("start")
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        match = re.fullmatch(r"/containers/([^/]+)/exec", path)
+        if match:
+            name = match.group(1)
+            if name not in engine.containers:
+                return self._send_json(404, {"message": f"No such container: {name}"})
+            if not engine.containers[name]:
+                return self._send_json(409, {"message": f"Container {name} is not running"})
+            exec_id = uuid.uuid4().hex
+            engine.execs[exec_id] = {"cmd": body.get("Cmd", []), "exit_code": None}
+            return self._send_json(201, {"Id": exec_id})
+
+        match = re.fullmatch(r"/exec/([^/]+)/start", path)
+        if match:
+            return self._start_exec(match.group(1))
+
+        self._send_json(404, {"message": "page not found"})
+
+    def _start_exec(self, exec_id: str):
+        engine = self.server.engine
+        info = engine.execs.get(exec_id)
+        if info is None:
+            return self._send_json(404, {"message": "No such exec instance"})
+
+        # 실제 Docker처럼 연결을 raw 스트림으로 전환하고 끝나면 닫음
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.docker.multiplexed-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        proc = subprocess.Popen(info["cmd"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        selector = selectors.DefaultSelector()
+        selector.register(proc.stdout, selectors.EVENT_READ, 1)
+        selector.register(proc.stderr, selectors.EVENT_READ, 2)
+        open_streams = 2
+        while open_streams:
+            for key, _ in selector.select():
+                chunk = os.read(key.fileobj.fileno(), 65536)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    open_streams -= 1
+                    continue
+                self.wfile.write(FRAME_HEADER.pack(key.data, len(chunk)) + chunk)
+                self.wfile.flush()
+        info["exit_code"] = proc.wait()
+
+    def _stream_events(self):
+        engine = self.server.engine
+        events: "queue.Queue[Optional[str]]" = queue.Queue()
+        engine._subscribers.append(events)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            while True:
+                action = events.get()
+                if action is None:
+                    break
+                self.wfile.write(json.dumps({"Type": "container", "Action": action}).encode() + b"\n")
+                self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            engine._subscribers.remove(events)
+
+
+class FakeDockerEngine:
+    """유닉스 소켓 기반 가짜 Docker Engine"""
+
+    def __init__(self, socket_path: Optional[str] = None, containers: Optional[Dict[str, bool]] = None):
+        if socket_path is None:
+            socket_path = os.path.join(tempfile.mkdtemp(prefix="fake-docker-"), "docker.sock")
+        self.socket_path = socket_path
+        # 컨테이너 이름 → 실행 여부
+        self.containers: Dict[str, bool] = containers if containers is not None else {"attacker": True}
+        self.execs: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"connections": 0, "requests": 0}
+        self._subscribers = []
+        self._stats_lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def emit_event(self, action: str) -> None:
+        """이벤트 스트림 구독자들에게 컨테이너 이벤트 전달"""
+        for subscriber in list(self._subscribers):
+            subscriber.put(action)
+
+    def stop_container(self, name: str) -> None:
+        self.containers[name] = False
+        self.emit_event("die")
+
+    def start(self) -> "FakeDockerEngine":
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = _Server(self.socket_path, _Handler)
+        self._server.engine = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-docker-engine", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        for subscriber in list(self._subscribers):
+            subscriber.put(None)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "FakeDockerEngine":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,309 @@
+"""
+비동기 HTTP 조회/경로 탐색 - Reconnaissance MCP 서버용
+URL마다 curl 프로세스를 띄우던 방식 대신 호스트별 keep-alive 연결 풀을 재사용
+
+    DECEPTICON_HTTP_CONCURRENCY=20      # 동시에 진행 중인 요청 수 (연결 풀 크기)
+    DECEPTICON_HTTP_MAX_BYTES=262144    # 응답 본문 읽기 상한 (초과분은 읽지 않음)
+    DECEPTICON_HTTP_TIMEOUT=10          # 요청별 시간 제한(초)
+
+- 응답마다 상태 코드/길이/단어 수/줄 수/본문 해시로 지문 생성 (중복 판단은 상태 코드/길이/해시/Location)
+- 경로 탐색 전에 존재하지 않는 임의 경로로 기준 응답(soft 404)을 측정해 같은 지문은 제외
+- 같은 지문의 응답은 첫 번째만 반환하고 나머지는 개수로만 집계
+- 경로 탐색은 고정된 수의 워커가 URL을 하나씩 꺼내 요청 (단어 목록 크기와 관계없이 태스크 수 일정)
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+import uuid
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_CONCURRENCY_ENV = "DECEPTICON_HTTP_CONCURRENCY"
+HTTP_MAX_BYTES_ENV = "DECEPTICON_HTTP_MAX_BYTES"
+HTTP_TIMEOUT_ENV = "DECEPTICON_HTTP_TIMEOUT"
+DEFAULT_CONCURRENCY = 20
+DEFAULT_MAX_BYTES = 256 * 1024
+DEFAULT_TIMEOUT = 10.0
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# 공격 컨테이너의 /root/data 는 저장소의 ./data (docker-compose 볼륨)
+CONTAINER_DATA_DIR = "/root/data"
+LOCAL_DATA_DIR = "data"
+
+TITLE_RE = re.compile(rb"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+LINK_RE = re.compile(rb"""(?:href|src|action)\s*=\s*["']([^"'#]+)""", re.IGNORECASE)
+BODY_PREVIEW = 2000
+MAX_WORDLIST_ENTRIES = 100000
+
+
+def resolve_wordlist(path: str) -> str:
+    """로컬 경로 우선, 없으면 컨테이너 경로(/root/data/...)를 ./data/... 로 변환"""
+    if os.path.exists(path):
+        return path
+    normalized = "/" + path.lstrip("/")
+    if normalized.startswith(CONTAINER_DATA_DIR + "/"):
+        local = os.path.join(LOCAL_DATA_DIR, normalized[len(CONTAINER_DATA_DIR) + 1:])
+        if os.path.exists(local):
+            return local
+    raise FileNotFoundError(f"Wordlist not found: {path}")
+
+
+def load_wordlist(path: str, limit: int = MAX_WORDLIST_ENTRIES) -> List[str]:
+    entries = []
+    with open(resolve_wordlist(path), encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                entries.append(line)
+                if len(entries) >= limit:
+                    break
+    return entries
+
+
+def fingerprint(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    """같은 응답 판단 기준 - 본문이 같은 리디렉션도 Location이 다르면 다른 응답 (nginx 디렉터리 301 등)"""
+    return (record.get("status"), record.get("length"), record.get("hash"), record.get("location"))
+
+
+def shape(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    """본문에 요청 경로가 반영되는 soft 404도 같은 것으로 보도록 단어/줄 수 기준"""
+    return (record.get("status"), record.get("words"), record.get("lines"))
+
+
+class HttpProber:
+    """keep-alive 연결 풀을 공유하는 HTTP 클라이언트"""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.concurrency = concurrency or int(os.getenv(HTTP_CONCURRENCY_ENV, DEFAULT_CONCURRENCY))
+        self.max_bytes = max_bytes or int(os.getenv(HTTP_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+        self.timeout = timeout or float(os.getenv(HTTP_TIMEOUT_ENV, DEFAULT_TIMEOUT))
+        self._client: Optional[httpx.AsyncClient] = None
+        self._stats = {"requests": 0, "errors": 0, "bytes": 0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 도구 호출 사이에도 같은 연결 풀을 재사용
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                verify=False,
+                follow_redirects=False,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self._client
+
+    async def fetch(
+        self,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[str] = None,
+        keep_body: bool = False,
+    ) -> Dict[str, Any]:
+        """요청 하나 → 지문 레코드 (본문은 max_bytes까지만 읽음)"""
+        started = time.perf_counter()
+        self._stats["requests"] += 1
+        record: Dict[str, Any] = {"url": url}
+        try:
+            async with self.client.stream(method, url, headers=headers, content=data) as response:
+                body = bytearray()
+                truncated = False
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        # 상한을 넘으면 나머지는 읽지 않고 연결을 닫음
+                        truncated = True
+                        del body[self.max_bytes:]
+                        break
+        except httpx.HTTPError as e:
+            self._stats["errors"] += 1
+            record["error"] = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            return record
+
+        self._stats["bytes"] += len(body)
+        record.update({
+            "status": response.status_code,
+            "length": int(response.headers.get("content-length", len(body))) if truncated else len(body),
+            "words": len(body.split()),
+            "lines": body.count(b"\n") + 1 if body else 0,
+            "hash": hashlib.sha1(body).hexdigest()[:12],
+            "ms": round((time.perf_counter() - started) * 1000),
+        })
+        if truncated:
+            record["truncated"] = True
+        content_type = response.headers.get("content-type")
+        if content_type:
+            record["type"] = content_type.split(";")[0]
+        if response.headers.get("location"):
+            record["location"] = response.headers["location"]
+        if response.headers.get("server"):
+            record["server"] = response.headers["server"]
+        title = TITLE_RE.search(body)
+        if title:
+            record["title"] = " ".join(title.group(1).decode("utf-8", errors="replace").split())[:120]
+        if keep_body:
+            record["_body"] = bytes(body)
+        return record
+
+    async def _gather(self, urls: Iterable[str], concurrency: Optional[int], **kwargs) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def bounded(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.fetch(url, **kwargs)
+
+        return await asyncio.gather(*(bounded(url) for url in urls))
+
+    async def _each(
+        self, urls: Iterable[str], concurrency: Optional[int], handle: Callable[[Dict[str, Any]], None], **kwargs,
+    ) -> None:
+        """워커 concurrency개가 URL을 하나씩 꺼내 요청하고 결과를 도착 순서대로 handle에 전달
+
+        URL마다 태스크를 만들지 않으므로 대기 중인 URL이 많아도 태스크/결과가 쌓이지 않음
+        """
+        pending = iter(urls)
+
+        async def worker() -> None:
+            # 이벤트 루프 스레드 하나에서만 next()가 호출되므로 반복자 공유 가능
+            for url in pending:
+                handle(await self.fetch(url, **kwargs))
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency or self.concurrency))))
+
+    async def fetch_many(
+        self,
+        urls: List[str],
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[str] = None,
+        include_body: bool = True,
+        crawl_depth: int = 0,
+        max_pages: int = 50,
+    ) -> Dict[str, Any]:
+        """URL 목록 조회 (crawl_depth > 0 이면 같은 호스트 링크를 따라감), 같은 본문은 한 번만 반환"""
+        seen_urls: Set[str] = set()
+        seen: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        pages: List[Dict[str, Any]] = []
+        frontier = list(dict.fromkeys(urls))
+        allowed_hosts = {urlsplit(url).netloc for url in frontier}
+
+        for depth in range(crawl_depth + 1):
+            frontier = [u for u in frontier if u not in seen_urls][:max(0, max_pages - len(seen_urls))]
+            if not frontier:
+                break
+            seen_urls.update(frontier)
+            records = await self._gather(
+                frontier, None, method=method if depth == 0 else "GET",
+                headers=headers, data=data if depth == 0 else None, keep_body=True,
+            )
+            next_frontier: List[str] = []
+            for record in records:
+                body = record.pop("_body", b"")
+                if depth < crawl_depth and "error" not in record:
+                    for link in LINK_RE.findall(body):
+                        url = urljoin(record["url"], link.decode("utf-8", errors="ignore").strip())
+                        if urlsplit(url).scheme in ("http", "https") and urlsplit(url).netloc in allowed_hosts:
+                            next_frontier.append(url.split("#")[0])
+                if "error" not in record:
+                    key = fingerprint(record)
+                    if key in seen:
+                        seen[key].setdefault("same_as", []).append(record["url"])
+                        continue
+                    seen[key] = record
+                    if include_body:
+                        text = body.decode("utf-8", errors="replace")
+                        record["body"] = text[:BODY_PREVIEW] + ("..." if len(text) > BODY_PREVIEW else "")
+                pages.append(record)
+            frontier = list(dict.fromkeys(next_frontier))
+
+        return {"pages": pages, "fetched": len(seen_urls), "stats": dict(self._stats)}
+
+    async def probe(
+        self,
+        base_url: str,
+        paths: List[str],
+        extensions: Optional[List[str]] = None,
+        filter_status: Optional[List[int]] = None,
+        concurrency: Optional[int] = None,
+        calibrate: bool = True,
+    ) -> Dict[str, Any]:
+        """기준 URL + 경로 목록을 동시에 요청하고 의미 있는 응답만 반환
+
+        제외: filter_status 상태 코드, 기준(soft 404) 응답과 같은 지문, 이미 반환한 응답과 같은 지문
+        """
+        started = time.perf_counter()
+        base = base_url if base_url.endswith("/") else base_url + "/"
+        filter_status = set(filter_status if filter_status is not None else [404])
+        suffixes = [""] + [f".{e.lstrip('.')}" for e in (extensions or [])]
+        urls = list(dict.fromkeys(
+            urljoin(base, path.lstrip("/") + suffix) for path in paths for suffix in suffixes
+        ))
+
+        baseline_hashes: Set[Tuple[Any, ...]] = set()
+        baseline_shapes: Set[Tuple[Any, ...]] = set()
+        baseline = []
+        if calibrate:
+            # 존재하지 않는 경로(확장자별)의 응답을 기준으로 사용
+            probes = [urljoin(base, uuid.uuid4().hex + suffix) for suffix in suffixes]
+            probes.append(urljoin(base, uuid.uuid4().hex + "/"))
+            for record in await self._gather(probes, concurrency):
+                if "error" in record:
+                    continue
+                baseline_hashes.add(fingerprint(record))
+                baseline_shapes.add(shape(record))
+                baseline.append({k: record[k] for k in ("status", "length", "words", "lines") if k in record})
+
+        counts = {"status": 0, "baseline": 0, "duplicate": 0, "error": 0}
+        interesting: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        errors: List[str] = []
+
+        def handle(record: Dict[str, Any]) -> None:
+            if "error" in record:
+                counts["error"] += 1
+                if len(errors) < 5:
+                    errors.append(f"{record['url']}: {record['error']}")
+                return
+            key = fingerprint(record)
+            if record["status"] in filter_status:
+                counts["status"] += 1
+            elif key in baseline_hashes or shape(record) in baseline_shapes:
+                counts["baseline"] += 1
+            elif key in interesting:
+                counts["duplicate"] += 1
+                interesting[key]["dupes"] = interesting[key].get("dupes", 0) + 1
+            else:
+                interesting[key] = record
+
+        await self._each(urls, concurrency, handle)
+
+        return {
+            "base": base,
+            "requests": len(urls),
+            "seconds": round(time.perf_counter() - started, 2),
+            "baseline": baseline,
+            "interesting": sorted(interesting.values(), key=lambda r: (r["status"], r["url"])),
+            "filtered": counts,
+            "errors": errors,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,220 @@
+"""
+장시간 도구 백그라운드 실행 (job) - MCP 서버 공용
+에이전트는 job ID만 받아 바로 다음 작업을 진행하고, 필요할 때 상태/출력을 조회
+
+    DECEPTICON_JOB_WORKERS=4            # 동시에 실행할 job 수 (나머지는 queued 상태로 대기)
+    DECEPTICON_JOB_HISTORY=100          # 보관할 종료된 job 수
+    DECEPTICON_JOB_OUTPUT_MAX=4194304   # job당 보관할 최대 출력 글자 수 (초과 시 앞부분부터 버림)
+"""
+
+import asyncio
+import os
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.utils.container.output import OutputCallback
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS_ENV = "DECEPTICON_JOB_WORKERS"
+JOB_HISTORY_ENV = "DECEPTICON_JOB_HISTORY"
+JOB_OUTPUT_MAX_ENV = "DECEPTICON_JOB_OUTPUT_MAX"
+
+DEFAULT_JOB_WORKERS = 4
+DEFAULT_JOB_HISTORY = 100
+DEFAULT_JOB_OUTPUT_MAX = 4 * 1024 * 1024
+DEFAULT_READ_LIMIT = 16 * 1024
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+# on_output 콜백을 받아 최종 결과 문자열을 반환하는 실행 함수
+JobFunc = Callable[[OutputCallback], Awaitable[str]]
+
+
+class JobOutput:
+    """오프셋으로 이어 읽을 수 있는 출력 버퍼 (앞부분을 버려도 오프셋은 유지)"""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._chunks: List[str] = []
+        self._size = 0
+        # 버려진 앞부분 길이 = 버퍼 첫 글자의 절대 오프셋
+        self.base = 0
+
+    @property
+    def end(self) -> int:
+        return self.base + self._size
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self._chunks.append(text)
+        self._size += len(text)
+        while self._size > self.max_chars and len(self._chunks) > 1:
+            dropped = self._chunks.pop(0)
+            self._size -= len(dropped)
+            self.base += len(dropped)
+
+    def read(self, offset: int, limit: int) -> str:
+        data = "".join(self._chunks)
+        self._chunks = [data] if data else []
+        start = max(offset, self.base) - self.base
+        return data[start:start + limit]
+
+
+@dataclass
+class Job:
+    id: str
+    tool: str
+    description: str
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[str] = None
+    output: Optional[JobOutput] = None
+    task: Optional[asyncio.Task] = None
+
+    def summary(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        info = {
+            "job_id": self.id,
+            "tool": self.tool,
+            "description": self.description,
+            "status": self.status,
+            "elapsed": round(end - (self.started_at or end), 1),
+            "output_length": self.output.end if self.output else 0,
+        }
+        if self.status == FAILED and self.result:
+            info["error"] = self.result[:500]
+        return info
+
+
+class JobManager:
+    """제한된 워커 수로 job 실행 및 조회"""
+
+    def __init__(self, workers: Optional[int] = None, history: Optional[int] = None,
+                 output_max: Optional[int] = None):
+        self.workers = max(1, workers or int(os.getenv(JOB_WORKERS_ENV, DEFAULT_JOB_WORKERS)))
+        self.history = history or int(os.getenv(JOB_HISTORY_ENV, DEFAULT_JOB_HISTORY))
+        self.output_max = output_max or int(os.getenv(JOB_OUTPUT_MAX_ENV, DEFAULT_JOB_OUTPUT_MAX))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(self, tool: str, description: str, func: JobFunc) -> Job:
+        """job 등록 후 바로 반환 (워커 슬롯이 비면 실행 시작)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        job = Job(id=uuid.uuid4().hex[:12], tool=tool, description=description,
+                  output=JobOutput(self.output_max))
+        job.task = asyncio.ensure_future(self._run(job, func))
+        self._jobs[job.id] = job
+        self._evict()
+        return job
+
+    async def _run(self, job: Job, func: JobFunc) -> None:
+        async def on_output(text: str) -> None:
+            job.output.append(text)
+
+        try:
+            async with self._slots:
+                job.status = RUNNING
+                job.started_at = time.time()
+                result = await func(on_output)
+        except asyncio.CancelledError:
+            job.status = CANCELLED
+            raise
+        except Exception as e:
+            job.status = FAILED
+            job.result = f"[-] Error: {str(e)} (Type: {type(e).__name__})"
+        else:
+            job.result = result
+            # 실행기는 실패 시 "[-] ..." 메시지를 반환
+            job.status = FAILED if result.startswith("[-]") else COMPLETED
+            if job.output.end == 0:
+                job.output.append(result)
+        finally:
+            job.finished_at = time.time()
+            # 새 job 제출이 없어도 종료된 job 출력이 쌓이지 않도록 종료 시점에도 정리
+            self._evict()
+
+    def _evict(self) -> None:
+        """종료된 job이 history를 넘으면 오래된 것부터 삭제 (제출/종료/조회 시 호출)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job:
+        self._evict()
+        if job_id not in self._jobs:
+            raise ValueError(f"Unknown job ID: {job_id}")
+        return self._jobs[job_id]
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        return self.get(job_id).summary()
+
+    def read_output(self, job_id: str, offset: int = 0, limit: int = DEFAULT_READ_LIMIT) -> Dict[str, Any]:
+        """offset부터 최대 limit 글자 반환 - 다음 호출에는 next_offset 사용"""
+        job = self.get(job_id)
+        offset = max(0, offset)
+        text = job.output.read(offset, limit)
+        start = max(offset, job.output.base)
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "offset": start,
+            "next_offset": start + len(text),
+            "end": job.output.end,
+            # 보관 한도를 넘어 요청한 위치의 출력이 이미 버려진 경우
+            "skipped": start - offset,
+            "complete": job.status in FINISHED_STATES and start + len(text) >= job.output.end,
+            "output": text,
+        }
+
+    async def cancel(self, job_id: str) -> Dict[str, Any]:
+        job = self.get(job_id)
+        if job.status in FINISHED_STATES:
+            return job.summary()
+
+        # 실행 함수가 취소를 받아 컨테이너 안의 프로세스 그룹/세션 명령까지 정리
+        job.task.cancel()
+        try:
+            await job.task
+        except asyncio.CancelledError:
+            pass
+        job.status = CANCELLED
+        return job.summary()
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        self._evict()
+        return [job.summary() for job in self._jobs.values()]
+
+
+def register_job_tools(mcp, manager: JobManager) -> None:
+    """job 조회/취소 도구를 FastMCP 서버에 등록 (start_job은 서버별로 정의)"""
+
+    @mcp.tool(description="Check the status of a background job")
+    async def job_status(job_id: str) -> Dict[str, Any]:
+        return manager.status(job_id)
+
+    @mcp.tool(description="Read output of a background job starting at offset (pass next_offset to continue)")
+    async def job_output(job_id: str, offset: int = 0, limit: int = DEFAULT_READ_LIMIT) -> Dict[str, Any]:
+        return manager.read_output(job_id, offset, limit)
+
+    @mcp.tool(description="Cancel a queued or running background job")
+    async def job_cancel(job_id: str) -> Dict[str, Any]:
+        return await manager.cancel(job_id)
+
+    @mcp.tool(description="List background jobs and their status")
+    async def job_list() -> List[Dict[str, Any]]:
+        return manager.list_jobs()
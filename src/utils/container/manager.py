@@ -0,0 +1,145 @@
+"""
+공격 컨테이너 상태 관리자 - MCP 서버들이 공유
+컨테이너 확인/시작은 한 번만 수행하고 결과를 캐싱
+실행 실패 또는 Docker 이벤트 스트림에서 상태 변화가 감지될 때만 다시 확인
+"""
+
+import asyncio
+import threading
+import time
+import logging
+from typing import Any, Dict, Optional
+
+from src.utils.container.backend import EventStream, ExecBackend, get_exec_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTAINER_NAME = "attacker"
+
+# 이벤트 감시가 불가능한 환경에서 캐시를 신뢰하는 시간 (초)
+FALLBACK_TTL = 5.0
+
+
+class ContainerManager:
+    """컨테이너 상태 캐시 + Docker 이벤트 감시"""
+
+    def __init__(self, container_name: str = DEFAULT_CONTAINER_NAME, backend: Optional[ExecBackend] = None):
+        self.container_name = container_name
+        self.backend = backend or get_exec_backend()
+        self._lock = threading.Lock()
+        self._ready = False
+        self._checked_at = 0.0
+        self._watcher: Optional[threading.Thread] = None
+        self._events: Optional[EventStream] = None
+        self._stats = {"probes": 0, "cache_hits": 0, "invalidations": 0}
+
+    def ensure_running(self) -> Optional[str]:
+        """컨테이너가 실행 중인지 보장
+
+        Returns:
+            Optional[str]: 실패 시 에러 메시지, 성공 시 None
+        """
+        if self._is_cache_valid():
+            self._stats["cache_hits"] += 1
+            return None
+
+        with self._lock:
+            # 다른 스레드가 이미 확인했을 수 있음
+            if self._is_cache_valid():
+                self._stats["cache_hits"] += 1
+                return None
+
+            error = self._probe_and_start()
+            if error is None:
+                self._ready = True
+                self._checked_at = time.monotonic()
+                self._start_watcher()
+            return error
+
+    async def aensure_running(self) -> Optional[str]:
+        """ensure_running의 비동기 버전 - 캐시가 유효하면 스레드 전환 없이 반환"""
+        if self._is_cache_valid():
+            self._stats["cache_hits"] += 1
+            return None
+        return await asyncio.to_thread(self.ensure_running)
+
+    def invalidate(self, reason: str = "") -> None:
+        """캐시 무효화 - 다음 호출에서 다시 확인"""
+        if self._ready:
+            logger.info(f"Container '{self.container_name}' state invalidated: {reason}")
+        self._ready = False
+        self._stats["invalidations"] += 1
+
+    def report_exec_failure(self, returncode: int, stderr: str) -> None:
+        """docker exec 실패가 컨테이너 문제로 보이면 캐시 무효화"""
+        # 125: docker 자체 에러 (컨테이너 없음/중지됨 등)
+        if returncode == 125 or "Error response from daemon" in stderr or "is not running" in stderr:
+            self.invalidate(f"exec failed ({returncode})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환 (디버깅용)"""
+        stats = dict(self._stats)
+        stats["ready"] = self._ready
+        stats["watching_events"] = self._watcher_alive()
+        return stats
+
+    def close(self) -> None:
+        """이벤트 감시 종료"""
+        if self._events is not None:
+            self._events.close()
+        self._events = None
+
+    def _is_cache_valid(self) -> bool:
+        if not self._ready:
+            return False
+        if self._watcher_alive():
+            return True
+        # 이벤트 감시가 없으면 짧은 TTL 동안만 신뢰
+        return time.monotonic() - self._checked_at < FALLBACK_TTL
+
+    def _probe_and_start(self) -> Optional[str]:
+        """컨테이너 존재/실행 여부를 확인하고 필요하면 시작"""
+        self._stats["probes"] += 1
+        return self.backend.ensure_started(self.container_name)
+
+    def _watcher_alive(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def _start_watcher(self) -> None:
+        """Docker 이벤트 스트림 감시 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._watcher_alive():
+            return
+
+        try:
+            self._events = self.backend.open_event_stream(self.container_name)
+        except OSError as e:
+            logger.warning(f"Docker event stream unavailable: {e}")
+            return
+
+        self._watcher = threading.Thread(
+            target=self._watch_events, args=(self._events,),
+            name=f"docker-events-{self.container_name}", daemon=True
+        )
+        self._watcher.start()
+
+    def _watch_events(self, events: EventStream) -> None:
+        try:
+            for action in events:
+                self.invalidate(f"docker event '{action}'")
+        except Exception as e:
+            logger.debug(f"Docker event stream error: {e}")
+        # 스트림이 끊기면 상태를 보장할 수 없으므로 무효화
+        self.invalidate("docker event stream closed")
+
+
+# 컨테이너별 전역 인스턴스
+_managers: Dict[str, ContainerManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_container_manager(container_name: str = DEFAULT_CONTAINER_NAME) -> ContainerManager:
+    """컨테이너별 전역 상태 관리자 인스턴스 반환"""
+    with _managers_lock:
+        if container_name not in _managers:
+            _managers[container_name] = ContainerManager(container_name)
+        return _managers[container_name]
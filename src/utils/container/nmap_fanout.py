@@ -0,0 +1,390 @@
+"""
+nmap 병렬 분할 스캔 - Reconnaissance MCP 서버용
+대역/다중 대상 스캔을 호스트 묶음 × 포트 범위 샤드로 나눠 동시에 실행하고 호스트별로 병합
+
+    DECEPTICON_NMAP_MAX_RATE=2000   # 모든 샤드를 합친 초당 패킷 상한 (--max-rate를 샤드 수로 나눠 적용)
+
+1. 호스트 발견(-sn)으로 응답 없는 호스트를 먼저 제외 (-Pn 지정 시 생략) - 대상은 CIDR/범위 표기 그대로 전달
+2. 대상을 주소 수 기준으로 샤드 수만큼 묶고, 호스트가 적으면 -p 포트 범위를 나눠 샤드 수를 채움
+   (큰 CIDR은 하위 CIDR로, 발견된 호스트는 연속 구간을 CIDR로 묶어 명령행 길이를 MAX_TARGET_BYTES 이하로 유지)
+3. 샤드별 XML 결과를 호스트 단위로 병합 (같은 포트는 한 번만)
+
+네트워크 프로파일(scan_profiles)이 있으면 전송률 상한/RTT 타이밍 옵션을 그 값으로 정하고
+샤드에서 측정된 RTT를 다시 프로파일에 반영
+"""
+
+import asyncio
+import ipaddress
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.container.execution import CommandRunner
+from src.utils.container.nmap_xml import NmapXMLParser, format_host_line
+from src.utils.container.output import OutputCallback, OutputThrottle
+from src.utils.container.scan_profiles import ScanProfileStore
+
+MAX_RATE_ENV = "DECEPTICON_NMAP_MAX_RATE"
+DEFAULT_MAX_RATE = 2000
+MAX_PORT = 65535
+# expand_targets(connect_scan)가 호스트 단위로 펼칠 CIDR 크기 상한 (/16)
+MAX_EXPANDED_HOSTS = 65536
+# nmap 한 번에 넘기는 대상 문자열 길이 상한 - 인자 하나 최대 길이(MAX_ARG_STRLEN, 128KiB)보다 충분히 작게
+MAX_TARGET_BYTES = 32 * 1024
+MAX_ERRORS = 5
+
+PORT_OPTION_RE = re.compile(r"(?:^|\s)-p\s*(\S+)")
+MAX_RATE_OPTION_RE = re.compile(r"(?:^|\s)--max-rate[\s=]+(\d+(?:\.\d+)?)")
+NO_PING_RE = re.compile(r"(?:^|\s)-Pn(?:\s|$)")
+
+
+def expand_targets(target: str) -> List[str]:
+    """대상 문자열을 샤딩 가능한 항목으로 분리
+
+    IP/CIDR은 호스트 단위로 펼치고, 호스트명이나 nmap 범위 표기(10.0.0.1-50)는 그대로 하나의 항목
+    """
+    items: List[str] = []
+    for item in target.replace(",", " ").split():
+        try:
+            network = ipaddress.ip_network(item, strict=False)
+        except ValueError:
+            items.append(item)
+            continue
+        if network.num_addresses == 1:
+            items.append(str(network.network_address))
+        elif network.num_addresses > MAX_EXPANDED_HOSTS:
+            items.append(item)
+        else:
+            items.extend(str(host) for host in network.hosts())
+    # 순서를 유지하며 중복 제거
+    return list(dict.fromkeys(items))
+
+
+def parse_port_spec(spec: str) -> Optional[List[Tuple[int, int]]]:
+    """"22,80,1000-2000", "-" 같은 -p 값을 병합된 범위 목록으로 (프로토콜 접두사 등 해석 불가면 None)"""
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not re.fullmatch(r"\d*-?\d*", part):
+            return None
+        if "-" in part:
+            low, high = part.split("-", 1)
+            start, end = int(low or 1), int(high or MAX_PORT)
+        else:
+            start = end = int(part)
+        if start > end or end > MAX_PORT:
+            return None
+        ranges.append((start, end))
+    if not ranges:
+        return None
+
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def split_port_ranges(ranges: List[Tuple[int, int]], parts: int) -> List[str]:
+    """포트 수가 비슷한 parts개의 -p 값으로 분할"""
+    total = sum(end - start + 1 for start, end in ranges)
+    parts = max(1, min(parts, total))
+    size = -(-total // parts)
+
+    chunks: List[List[Tuple[int, int]]] = [[]]
+    filled = 0
+    for start, end in ranges:
+        while start <= end:
+            if filled == size:
+                chunks.append([])
+                filled = 0
+            take = min(end - start + 1, size - filled)
+            chunks[-1].append((start, start + take - 1))
+            filled += take
+            start += take
+    return [
+        ",".join(str(s) if s == e else f"{s}-{e}" for s, e in chunk)
+        for chunk in chunks
+    ]
+
+
+def target_size(item: str) -> int:
+    """대상 항목의 주소 수 (호스트명/nmap 범위 표기는 1)"""
+    try:
+        return ipaddress.ip_network(item, strict=False).num_addresses
+    except ValueError:
+        return 1
+
+
+def compact_targets(hosts: List[str]) -> List[str]:
+    """IP 목록의 연속 구간을 CIDR로 묶은 nmap 대상 목록 (호스트명은 그대로)"""
+    networks: Dict[int, List[Any]] = {4: [], 6: []}
+    names: List[str] = []
+    for host in dict.fromkeys(hosts):
+        try:
+            network = ipaddress.ip_network(host, strict=False)
+        except ValueError:
+            names.append(host)
+            continue
+        networks[network.version].append(network)
+    compact = [str(net) for version in (4, 6) for net in ipaddress.collapse_addresses(networks[version])]
+    # 단일 주소는 /32 없이 표기
+    return [item.split("/")[0] if target_size(item) == 1 else item for item in compact] + names
+
+
+def shard_targets(targets: List[str], parts: int, max_bytes: int = MAX_TARGET_BYTES) -> List[List[str]]:
+    """주소 수가 비슷한 대상 묶음으로 분할 - 큰 CIDR은 하위 CIDR로 나누고 묶음 문자열은 max_bytes 이하"""
+    total = sum(target_size(item) for item in targets)
+    parts = max(1, min(parts, total))
+    quota = -(-total // parts)
+
+    units: List[Tuple[str, int]] = []
+    for item in targets:
+        size = target_size(item)
+        if size <= quota:
+            units.append((item, size))
+            continue
+        network = ipaddress.ip_network(item, strict=False)
+        # quota 이하인 가장 큰 2의 거듭제곱 크기 하위 CIDR
+        prefix = network.max_prefixlen - (quota.bit_length() - 1)
+        units.extend((str(subnet), subnet.num_addresses) for subnet in network.subnets(new_prefix=prefix))
+
+    groups: List[List[str]] = [[]]
+    count = length = 0
+    for item, size in units:
+        if groups[-1] and (count + size > quota or length + len(item) + 1 > max_bytes):
+            groups.append([])
+            count = length = 0
+        groups[-1].append(item)
+        count += size
+        length += len(item) + 1
+    return groups
+
+
+def plan_fanout(targets: List[str], port_spec: Optional[str], shards: int) -> List[Tuple[List[str], Optional[str]]]:
+    """(대상 묶음, -p 값) 샤드 목록 - 대상으로 먼저 나누고 남는 샤드 수는 포트 범위로"""
+    shards = max(1, shards)
+    host_groups = shard_targets(targets, shards)
+    ranges = parse_port_spec(port_spec) if port_spec else None
+    port_parts = shards // len(host_groups)
+    if ranges is None or port_parts <= 1:
+        return [(group, port_spec) for group in host_groups]
+    port_chunks = split_port_ranges(ranges, port_parts)
+    return [(group, chunk) for group in host_groups for chunk in port_chunks]
+
+
+def strip_fanout_options(args_str: str) -> Tuple[str, Optional[str], Optional[float]]:
+    """(샤드 공통 옵션, -p 값, --max-rate 값) - -p/--max-rate는 샤드별로 다시 지정"""
+    port = PORT_OPTION_RE.search(args_str)
+    rate = MAX_RATE_OPTION_RE.search(args_str)
+    args_str = PORT_OPTION_RE.sub(" ", args_str)
+    args_str = MAX_RATE_OPTION_RE.sub(" ", args_str)
+    return " ".join(args_str.split()), port.group(1) if port else None, float(rate.group(1)) if rate else None
+
+
+def port_key(entry: Dict[str, Any]) -> Tuple[int, str]:
+    number, _, protocol = entry.get("port", "0/").partition("/")
+    return (int(number) if number.isdigit() else 0, protocol)
+
+
+def host_key(host: str) -> Tuple[int, Any]:
+    try:
+        return (0, ipaddress.ip_address(host))
+    except ValueError:
+        return (1, host)
+
+
+def merge_hosts(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """샤드별 host 레코드를 호스트 단위로 병합 (포트는 port/protocol 기준 중복 제거)"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    ports: Dict[str, Dict[Tuple[int, str], Dict[str, Any]]] = {}
+    for record in records:
+        host = record.get("host", "?")
+        target = merged.setdefault(host, {"host": host})
+        for key, value in record.items():
+            if key in ("ports", "extraports"):
+                continue
+            if key == "scripts":
+                target.setdefault("scripts", {}).update(value)
+            else:
+                target.setdefault(key, value)
+        host_ports = ports.setdefault(host, {})
+        for entry in record.get("ports", []):
+            current = host_ports.get(port_key(entry))
+            # 서비스/버전 정보가 더 많은 레코드 유지
+            if current is None or len(entry) > len(current):
+                host_ports[port_key(entry)] = entry
+        if record.get("extraports"):
+            target.setdefault("extraports", [])
+            target["extraports"].append(record["extraports"])
+
+    result = []
+    for host in sorted(merged, key=host_key):
+        record = merged[host]
+        if ports[host]:
+            record["ports"] = [ports[host][key] for key in sorted(ports[host])]
+        if "extraports" in record:
+            record["extraports"] = "; ".join(record["extraports"])
+        result.append(record)
+    return result
+
+
+class NmapFanout:
+    """호스트 발견 → 샤드 동시 실행 → 병합"""
+
+    def __init__(
+        self,
+        runner: CommandRunner,
+        max_rate: Optional[float] = None,
+        profiles: Optional[ScanProfileStore] = None,
+    ):
+        self.runner = runner
+        self.profiles = profiles
+        if max_rate is None:
+            max_rate = float(os.getenv(MAX_RATE_ENV, DEFAULT_MAX_RATE))
+        self.max_rate = max_rate
+
+    async def _scan(
+        self,
+        args_str: str,
+        targets: List[str],
+        on_output: Optional[OutputCallback],
+        timeout: Optional[int],
+    ) -> Tuple[NmapXMLParser, Optional[str]]:
+        """nmap -oX - 한 번 실행 → (파서, 실패 시 "[-]" 첫 줄)"""
+        parser = NmapXMLParser()
+        throttle = OutputThrottle(on_output) if on_output else None
+
+        async def sink(data: bytes) -> None:
+            parser.feed(data)
+            if throttle:
+                for record in parser.pop_new_hosts():
+                    await throttle.feed(format_host_line(record).encode())
+
+        command = f"nmap -oX - {args_str} {' '.join(targets)}"
+        result = await self.runner.run(command, tool="nmap", sink=sink, timeout=timeout)
+        if throttle:
+            await throttle.flush()
+        if result.startswith("[-]"):
+            return parser, result.splitlines()[0]
+        parser.close()
+        return parser, parser.error
+
+    async def discover(
+        self,
+        targets: List[str],
+        rate: Optional[float],
+        on_output: Optional[OutputCallback] = None,
+        timeout: Optional[int] = None,
+    ) -> Tuple[List[str], Optional[str]]:
+        """-sn 호스트 발견 → (응답한 호스트, 에러)
+
+        대상 문자열이 MAX_TARGET_BYTES를 넘을 때만 나눠서 차례로 실행 (전송률 상한 유지)
+        """
+        rate_arg = f" --max-rate {rate:g}" if rate else ""
+        hosts: List[str] = []
+        error = None
+        for group in shard_targets(targets, 1):
+            parser, group_error = await self._scan(f"-sn{rate_arg}", group, None, timeout)
+            hosts.extend(record["host"] for record in parser.hosts if record.get("host"))
+            error = error or group_error
+        if on_output:
+            await on_output(f"Host discovery: {len(hosts)} host(s) up\n")
+        return hosts, error
+
+    async def run(
+        self,
+        target: str,
+        args_str: str = "",
+        shards: int = 4,
+        discovery: bool = True,
+        max_rate: Optional[float] = None,
+        on_output: Optional[OutputCallback] = None,
+        timeout: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        args_str, port_spec, requested_rate = strip_fanout_options(args_str)
+        # 호출/옵션에서 지정한 --max-rate도 전체 상한으로 해석
+        rate = max_rate or requested_rate
+        if self.profiles is not None:
+            profile = self.profiles.get(target)
+            if rate is None and profile is not None and profile.loss_samples:
+                rate = profile.rate
+            args_str, _ = self.profiles.tune_nmap_args(target, args_str, include_rate=False)
+        rate = rate or self.max_rate
+        errors: List[str] = []
+
+        # CIDR/범위 표기는 펼치지 않고 그대로 전달 (명령행 길이 제한)
+        targets = list(dict.fromkeys(target.replace(",", " ").split()))
+        addresses = sum(target_size(item) for item in targets)
+        summary: Dict[str, Any] = {"target": target, "targets": addresses}
+        if discovery and not NO_PING_RE.search(args_str) and addresses > 1:
+            hosts, error = await self.discover(targets, rate, on_output, timeout)
+            if error:
+                errors.append(f"discovery: {error}")
+            summary["hosts_up"] = len(hosts)
+            if not hosts:
+                return {**summary, "shards": {"total": 0}, "hosts": [], "errors": errors}
+            # 발견 단계에서 확인했으므로 샤드에서는 ping 생략
+            args_str = f"-Pn {args_str}".strip()
+            targets = compact_targets(hosts)
+
+        plan = plan_fanout(targets, port_spec, shards)
+        # 길이 제한으로 샤드가 요청보다 많아지면 동시에는 shards개만 실행
+        running = min(max(1, shards), len(plan))
+        semaphore = asyncio.Semaphore(running)
+        shard_rate = rate / running if rate else None
+
+        def shard_args(ports: Optional[str]) -> str:
+            parts = [args_str]
+            if ports:
+                parts.append(f"-p {ports}")
+            if shard_rate:
+                parts.append(f"--max-rate {max(shard_rate, 1):g}")
+            return " ".join(p for p in parts if p)
+
+        async def run_shard(group: List[str], ports: Optional[str]) -> Tuple[NmapXMLParser, Optional[str]]:
+            async with semaphore:
+                return await self._scan(shard_args(ports), group, on_output, timeout)
+
+        results = await asyncio.gather(
+            *(run_shard(group, ports) for group, ports in plan),
+            return_exceptions=True,
+        )
+
+        records: List[Dict[str, Any]] = []
+        timings: List[Tuple[str, float, float]] = []
+        failed = 0
+        for (group, ports), result in zip(plan, results):
+            if isinstance(result, BaseException):
+                failed += 1
+                errors.append(str(result))
+                continue
+            parser, error = result
+            timings.extend(parser.timings)
+            # 실패한 샤드도 그때까지 파싱된 호스트는 병합
+            records.extend(parser.hosts)
+            if error:
+                failed += 1
+                label = f"{group[0]}..{group[-1]}" if len(group) > 1 else group[0]
+                errors.append(f"{label}{f' -p {ports}' if ports else ''}: {error}")
+
+        if self.profiles is not None:
+            self.profiles.observe_rtts(timings)
+        summary["shards"] = {
+            "total": len(plan),
+            "failed": failed,
+            "max_rate_per_shard": round(shard_rate, 1) if shard_rate else None,
+        }
+        summary["hosts"] = merge_hosts(records)
+        summary["errors"] = errors[:MAX_ERRORS]
+        return summary
+
+
+def to_json(summary: Dict[str, Any]) -> str:
+    """토큰 절약을 위해 공백 없는 JSON으로 직렬화"""
+    return json.dumps(summary, separators=(",", ":"), ensure_ascii=False)
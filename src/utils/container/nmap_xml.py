@@ -0,0 +1,186 @@
+"""
+nmap XML(-oX -) 출력 스트리밍 파서
+출력이 들어오는 대로 XMLPullParser로 host 단위 처리 후 요소를 비워 메모리 사용량 일정 유지
+(/16 대역 스캔도 전체 XML을 메모리에 올리지 않음)
+
+결과는 host/port/service/script 위주의 간결한 레코드로 변환
+"""
+
+import json
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+
+# 스크립트 출력은 길어질 수 있어 레코드에는 앞부분만 유지
+SCRIPT_OUTPUT_LIMIT = 300
+
+
+def _service_version(service: ET.Element) -> str:
+    parts = [service.get("product"), service.get("version"), service.get("extrainfo")]
+    version = " ".join(p for p in parts[:2] if p)
+    if parts[2]:
+        version = f"{version} ({parts[2]})" if version else parts[2]
+    return version
+
+
+def _scripts(parent: ET.Element) -> Dict[str, str]:
+    scripts = {}
+    for script in parent.findall("script"):
+        output = " ".join((script.get("output") or "").split())
+        if len(output) > SCRIPT_OUTPUT_LIMIT:
+            output = output[:SCRIPT_OUTPUT_LIMIT] + "..."
+        scripts[script.get("id", "")] = output
+    return scripts
+
+
+def parse_host(host: ET.Element) -> Optional[Dict[str, Any]]:
+    """<host> 요소를 간결한 레코드로 변환 (down 호스트는 None)"""
+    status = host.find("status")
+    if status is not None and status.get("state") != "up":
+        return None
+
+    record: Dict[str, Any] = {}
+    for address in host.findall("address"):
+        addrtype = address.get("addrtype")
+        if addrtype in ("ipv4", "ipv6") and "host" not in record:
+            record["host"] = address.get("addr")
+        elif addrtype == "mac":
+            record["mac"] = address.get("addr")
+            if address.get("vendor"):
+                record["vendor"] = address.get("vendor")
+
+    hostnames = [h.get("name") for h in host.findall("hostnames/hostname") if h.get("name")]
+    if hostnames:
+        record["hostname"] = hostnames[0]
+
+    osmatch = host.find("os/osmatch")
+    if osmatch is not None:
+        record["os"] = f"{osmatch.get('name')} ({osmatch.get('accuracy')}%)"
+
+    ports: List[Dict[str, Any]] = []
+    for port in host.findall("ports/port"):
+        state = port.find("state")
+        entry: Dict[str, Any] = {
+            "port": f"{port.get('portid')}/{port.get('protocol')}",
+            "state": state.get("state") if state is not None else "unknown",
+        }
+        service = port.find("service")
+        if service is not None:
+            if service.get("name"):
+                entry["service"] = service.get("name")
+            version = _service_version(service)
+            if version:
+                entry["version"] = version
+        scripts = _scripts(port)
+        if scripts:
+            entry["scripts"] = scripts
+        ports.append(entry)
+    if ports:
+        record["ports"] = ports
+
+    # 표시되지 않은 포트 요약 (예: "997 closed")
+    extraports = [
+        f"{e.get('count')} {e.get('state')}" for e in host.findall("ports/extraports")
+    ]
+    if extraports:
+        record["extraports"] = ", ".join(extraports)
+
+    host_scripts = host.find("hostscript")
+    if host_scripts is not None:
+        record["scripts"] = _scripts(host_scripts)
+
+    return record
+
+
+class NmapXMLParser:
+    """nmap XML 조각을 받아 host 레코드를 점진적으로 생성"""
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ET.Element] = None
+        self.hosts: List[Dict[str, Any]] = []
+        self.scan: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        # (호스트, srtt_ms, rttvar_ms) - nmap이 측정한 호스트별 RTT (스캔 프로파일용)
+        self.timings: List[Tuple[str, float, float]] = []
+        self._new = 0
+
+    def feed(self, data: bytes) -> None:
+        if self.error:
+            return
+        try:
+            self._parser.feed(data)
+            self._drain()
+        except ET.ParseError as e:
+            self.error = f"Invalid nmap XML: {e}"
+
+    def close(self) -> None:
+        if self.error:
+            return
+        try:
+            self._parser.close()
+            self._drain()
+        except ET.ParseError as e:
+            self.error = f"Invalid nmap XML: {e}"
+        if self._root is None and not self.error:
+            self.error = "nmap produced no XML output"
+
+    def pop_new_hosts(self) -> List[Dict[str, Any]]:
+        """마지막 호출 이후 새로 파싱된 host 레코드"""
+        new = self.hosts[len(self.hosts) - self._new:] if self._new else []
+        self._new = 0
+        return new
+
+    def _drain(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if elem.tag == "nmaprun":
+                    self._root = elem
+                    self.scan["args"] = elem.get("args")
+                continue
+
+            if elem.tag == "host":
+                record = parse_host(elem)
+                if record is not None:
+                    self.hosts.append(record)
+                    self._new += 1
+                    times = elem.find("times")
+                    if times is not None and record.get("host") and times.get("srtt", "").isdigit():
+                        # 마이크로초 단위
+                        self.timings.append((
+                            record["host"], int(times.get("srtt")) / 1000, int(times.get("rttvar", "0") or 0) / 1000,
+                        ))
+                # 처리한 host 요소는 트리에서 제거해 메모리 해제
+                elem.clear()
+                if self._root is not None:
+                    try:
+                        self._root.remove(elem)
+                    except ValueError:
+                        pass
+            elif elem.tag == "finished":
+                self.scan["elapsed"] = elem.get("elapsed")
+                if elem.get("errormsg"):
+                    self.scan["error"] = elem.get("errormsg")
+            elif elem.tag == "hosts" and self._root is not None:
+                self.scan["hosts_up"] = int(elem.get("up", 0))
+                self.scan["hosts_total"] = int(elem.get("total", 0))
+
+    def summary(self, xml_artifact: Optional[str] = None) -> Dict[str, Any]:
+        result = dict(self.scan)
+        if xml_artifact:
+            result["xml_artifact"] = xml_artifact
+        result["hosts"] = self.hosts
+        return result
+
+    def to_json(self, xml_artifact: Optional[str] = None) -> str:
+        """토큰 절약을 위해 공백 없는 JSON으로 직렬화"""
+        return json.dumps(self.summary(xml_artifact), separators=(",", ":"), ensure_ascii=False)
+
+
+def format_host_line(record: Dict[str, Any]) -> str:
+    """진행 상황 스트리밍용 한 줄 요약"""
+    ports = ", ".join(
+        f"{p['port']} {p.get('service', '')}".strip()
+        for p in record.get("ports", []) if p.get("state") == "open"
+    )
+    name = f" ({record['hostname']})" if record.get("hostname") else ""
+    return f"{record.get('host', '?')}{name}: {ports or 'no open ports'}\n"
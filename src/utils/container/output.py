@@ -0,0 +1,164 @@
+"""
+명령 출력 버퍼링/스트리밍 유틸리티
+- BoundedOutput: 출력이 수 MB여도 앞/뒤 일부만 유지 (메모리 상한)
+- OutputThrottle: 출력 조각을 모아 일정 간격/크기로 클라이언트에 전달
+- mcp_output_emitter: FastMCP Context로 로그/진행 알림 전송
+- format_timeout: 시간 초과로 중단된 명령의 부분 출력 결과
+"""
+
+import codecs
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, Tuple
+
+MAX_OUTPUT_ENV = "DECEPTICON_MAX_OUTPUT_BYTES"
+DEFAULT_MAX_OUTPUT = 1024 * 1024
+
+# 클라이언트가 도구 출력 알림을 구분하는 로거 이름 접두사
+# 로거 이름 = 접두사 + 도구 이름 + "#" + 요청의 progressToken (호출 하나에 알림을 대응시킴)
+STREAM_LOGGER_PREFIX = "decepticon.tool_output."
+STREAM_TOKEN_SEPARATOR = "#"
+
+OutputCallback = Callable[[str], Awaitable[None]]
+
+
+class BoundedOutput:
+    """앞부분(head)과 최근 출력(tail)만 유지하는 출력 버퍼"""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv(MAX_OUTPUT_ENV, DEFAULT_MAX_OUTPUT))
+        self.head_limit = max_bytes // 4
+        self.tail_limit = max_bytes - self.head_limit
+        self._head = bytearray()
+        self._tail: "deque[bytes]" = deque()
+        self._tail_size = 0
+        self.total = 0
+        self.dropped = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+
+        room = self.head_limit - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if not data:
+            return
+
+        self._tail.append(data)
+        self._tail_size += len(data)
+        # tail 상한을 넘으면 오래된 조각부터 버림
+        while self._tail_size > self.tail_limit:
+            excess = self._tail_size - self.tail_limit
+            oldest = self._tail[0]
+            if len(oldest) <= excess:
+                self._tail.popleft()
+                self._tail_size -= len(oldest)
+                self.dropped += len(oldest)
+            else:
+                self._tail[0] = oldest[excess:]
+                self._tail_size -= excess
+                self.dropped += excess
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped > 0
+
+    def getvalue(self) -> str:
+        head = bytes(self._head).decode("utf-8", errors="ignore")
+        tail = b"".join(self._tail).decode("utf-8", errors="ignore")
+        if self.dropped:
+            return f"{head}\n[... {self.dropped} bytes truncated ...]\n{tail}"
+        return head + tail
+
+
+class OutputThrottle:
+    """출력 조각을 모아 interval 초마다 또는 chunk_size 이상일 때 전송
+
+    전송 대기 버퍼도 max_pending을 넘으면 앞부분을 버려 메모리 상한 유지
+    """
+
+    def __init__(self, callback: OutputCallback, interval: float = 0.25,
+                 chunk_size: int = 4096, max_pending: int = 64 * 1024):
+        self.callback = callback
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._pending = ""
+        self._last_flush = time.monotonic()
+        self._skipped = 0
+
+    async def feed(self, data: bytes) -> None:
+        self._pending += self._decoder.decode(data)
+        if len(self._pending) > self.max_pending:
+            cut = len(self._pending) - self.max_pending
+            self._skipped += cut
+            self._pending = self._pending[cut:]
+
+        if len(self._pending) >= self.chunk_size or time.monotonic() - self._last_flush >= self.interval:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        text = self._pending
+        if self._skipped:
+            text = f"[... {self._skipped} chars skipped ...]\n{text}"
+            self._skipped = 0
+        self._pending = ""
+        self._last_flush = time.monotonic()
+        try:
+            await self.callback(text)
+        except Exception:
+            # 클라이언트 알림 실패가 명령 실행을 중단시키지 않도록 무시
+            pass
+
+
+def stream_logger_name(tool: str, progress_token=None) -> str:
+    """도구 출력 로그 알림의 로거 이름"""
+    if progress_token is None:
+        return f"{STREAM_LOGGER_PREFIX}{tool}"
+    return f"{STREAM_LOGGER_PREFIX}{tool}{STREAM_TOKEN_SEPARATOR}{progress_token}"
+
+
+def parse_stream_logger_name(logger_name: str) -> Optional[Tuple[str, Optional[str]]]:
+    """로거 이름 → (도구 이름, progressToken 문자열) - 도구 출력 알림이 아니면 None"""
+    if not logger_name.startswith(STREAM_LOGGER_PREFIX):
+        return None
+    tool, separator, token = logger_name[len(STREAM_LOGGER_PREFIX):].partition(STREAM_TOKEN_SEPARATOR)
+    return tool, (token if separator else None)
+
+
+def request_progress_token(ctx):
+    """현재 요청의 progressToken (클라이언트가 보내지 않았거나 요청 밖이면 None)"""
+    try:
+        meta = ctx.request_context.meta
+    except Exception:
+        return None
+    return getattr(meta, "progressToken", None) if meta else None
+
+
+def mcp_output_emitter(ctx, tool: str) -> OutputCallback:
+    """FastMCP Context로 출력 조각을 로그 알림 + 진행률 알림으로 전송"""
+    sent = 0
+    logger_name = stream_logger_name(tool, request_progress_token(ctx))
+
+    async def emit(text: str) -> None:
+        nonlocal sent
+        sent += len(text)
+        await ctx.log("info", text, logger_name=logger_name)
+        # 진행률은 클라이언트가 progressToken을 보냈을 때만 전송됨
+        await ctx.report_progress(sent)
+
+    return emit
+
+
+def format_timeout(timeout: float, output: str) -> str:
+    """시간 초과 결과 ("[-]"로 시작하므로 캐시되지 않고 job은 failed로 표시)"""
+    return (
+        f"[-] Command timed out after {timeout:g}s and was killed. "
+        f"Pass a larger timeout or use start_job for long runs. Partial output:\n{output or '(no output)'}"
+    )
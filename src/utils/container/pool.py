@@ -0,0 +1,194 @@
+"""
+공격 컨테이너 풀 + 부하 기반 스케줄러 - MCP 서버 공용
+여러 Kali 컨테이너에 명령을 분산해 동시 작업이 한 컨테이너의 CPU/네트워크를 나눠 쓰지 않도록 함
+
+    DECEPTICON_CONTAINERS=attacker,attacker-2,attacker-3   # 풀에 포함할 컨테이너 (기본: attacker)
+
+- 일반 명령: 실행 중인 명령 수가 가장 적은 컨테이너에 배치 (같으면 누적 배치 수가 적은 쪽)
+- tmux 세션: 세션 수가 가장 적은 컨테이너에서 생성하고 이후 명령은 항상 같은 컨테이너로 (sticky)
+- 시작/확인에 실패한 컨테이너는 잠시 제외하고 다음 후보로 넘어감
+"""
+
+import os
+import time
+import threading
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from src.utils.container.manager import ContainerManager, DEFAULT_CONTAINER_NAME, get_container_manager
+
+logger = logging.getLogger(__name__)
+
+CONTAINERS_ENV = "DECEPTICON_CONTAINERS"
+
+# 시작/확인에 실패한 컨테이너를 후보에서 제외하는 시간(초)
+UNAVAILABLE_BACKOFF = 30.0
+
+
+class ContainerUnavailableError(Exception):
+    """풀의 모든 컨테이너를 사용할 수 없음 (message는 마지막 "[-] ..." 에러)"""
+
+
+def parse_container_names(spec: str) -> List[str]:
+    names = []
+    for name in spec.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+@dataclass
+class PooledContainer:
+    name: str
+    manager: ContainerManager
+    running: int = 0
+    dispatched: int = 0
+    failures: int = 0
+    unavailable_until: float = 0.0
+    sessions: Set[str] = field(default_factory=set)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.unavailable_until
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "available": self.available,
+            "running": self.running,
+            "dispatched": self.dispatched,
+            "sessions": len(self.sessions),
+            "failures": self.failures,
+        }
+
+
+class ContainerPool:
+    """컨테이너 선택/세션 고정/사용률 집계"""
+
+    def __init__(
+        self,
+        names: Optional[List[str]] = None,
+        managers: Optional[Dict[str, ContainerManager]] = None,
+        backoff: float = UNAVAILABLE_BACKOFF,
+    ):
+        if names is None:
+            names = parse_container_names(os.getenv(CONTAINERS_ENV, "")) or [DEFAULT_CONTAINER_NAME]
+        if not names:
+            raise ValueError("Container pool needs at least one container")
+        managers = managers or {}
+        self.backoff = backoff
+        self.containers: Dict[str, PooledContainer] = {
+            name: PooledContainer(name, managers.get(name) or get_container_manager(name)) for name in names
+        }
+        # 세션 ID → 세션을 만든 컨테이너
+        self._sessions: Dict[str, str] = {}
+
+    @property
+    def primary(self) -> str:
+        """단일 컨테이너로 충분한 작업(예: ExploitDB CSV 읽기)에 쓰는 첫 번째 컨테이너"""
+        return next(iter(self.containers))
+
+    def candidates(self, for_session: bool = False) -> List[PooledContainer]:
+        """부하가 낮은 순서의 후보 (제외 중인 컨테이너는 마지막)"""
+        if for_session:
+            load = lambda c: (not c.available, len(c.sessions), c.running, c.dispatched)
+        else:
+            load = lambda c: (not c.available, c.running, c.dispatched)
+        return sorted(self.containers.values(), key=load)
+
+    async def _ensure(self, container: PooledContainer) -> Optional[str]:
+        error = await container.manager.aensure_running()
+        if error:
+            container.failures += 1
+            container.unavailable_until = time.monotonic() + self.backoff
+            logger.warning(f"Container '{container.name}' unavailable: {error}")
+        else:
+            container.unavailable_until = 0.0
+        return error
+
+    async def select(self, for_session: bool = False) -> PooledContainer:
+        """실행 가능한 컨테이너 중 가장 한가한 것 반환
+
+        Raises:
+            ContainerUnavailableError: 모든 컨테이너 확인/시작 실패
+        """
+        error = None
+        for container in self.candidates(for_session):
+            error = await self._ensure(container)
+            if error is None:
+                return container
+        raise ContainerUnavailableError(error)
+
+    @asynccontextmanager
+    async def lease(self, session_id: Optional[str] = None) -> AsyncIterator[PooledContainer]:
+        """명령 실행 동안 컨테이너 점유 - session_id가 있으면 그 세션의 컨테이너"""
+        if session_id is not None:
+            container = self.containers[self.container_for(session_id)]
+            error = await container.manager.aensure_running()
+            if error:
+                raise ContainerUnavailableError(error)
+        else:
+            container = await self.select()
+
+        container.running += 1
+        container.dispatched += 1
+        try:
+            yield container
+        finally:
+            container.running -= 1
+
+    def pin(self, session_id: str, name: str) -> None:
+        self.unpin(session_id)
+        self._sessions[session_id] = name
+        self.containers[name].sessions.add(session_id)
+
+    def unpin(self, session_id: str) -> Optional[str]:
+        name = self._sessions.pop(session_id, None)
+        if name is not None:
+            self.containers[name].sessions.discard(session_id)
+        return name
+
+    def has_session(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def clear_sessions(self) -> None:
+        self._sessions.clear()
+        for container in self.containers.values():
+            container.sessions.clear()
+
+    def container_for(self, session_id: str) -> str:
+        """세션이 있는 컨테이너 (모르는 세션은 기본 컨테이너 - 서버 재시작 전 세션 등)"""
+        return self._sessions.get(session_id, self.primary)
+
+    def get_stats(self) -> Dict[str, Any]:
+        containers = [c.summary() for c in self.containers.values()]
+        return {
+            "containers": containers,
+            "running": sum(c["running"] for c in containers),
+            "sessions": len(self._sessions),
+        }
+
+
+_pool: Optional[ContainerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_container_pool() -> ContainerPool:
+    """전역 컨테이너 풀 인스턴스 반환"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ContainerPool()
+        return _pool
+
+
+def register_pool_tools(mcp, pool: Optional[ContainerPool] = None) -> None:
+    """container_pool_status 도구를 FastMCP 서버에 등록"""
+    pool = pool or get_container_pool()
+
+    @mcp.tool(description="Show attacker container pool utilization (running commands and sessions per container)")
+    async def container_pool_status() -> Dict[str, Any]:
+        return pool.get_stats()
@@ -0,0 +1,215 @@
+"""
+도구 결과 캐시 - MCP 서버 공용
+같은 도구 + 같은 인자(정규화)로 반복 호출되면 docker exec 없이 이전 결과 반환
+
+    DECEPTICON_CACHE_TTL="dig=300,whois=86400,searchsploit=86400,nmap=0"  # 도구별 TTL(초), 0이면 캐시 안 함
+                                       # nmap은 대상 상태가 계속 바뀌므로 기본 0 (nmap=600 등으로 켬)
+    DECEPTICON_CACHE_MAX_ENTRIES=512   # 메모리 LRU 최대 항목 수
+    DECEPTICON_CACHE_DB=cache/tool_results.sqlite3   # 지정하면 SQLite 디스크 계층 사용 (재시작 후에도 유지)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shlex
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_ENV = "DECEPTICON_CACHE_TTL"
+CACHE_MAX_ENTRIES_ENV = "DECEPTICON_CACHE_MAX_ENTRIES"
+CACHE_DB_ENV = "DECEPTICON_CACHE_DB"
+
+DEFAULT_TTLS = {"dig": 300.0, "whois": 86400.0, "searchsploit": 86400.0, "nmap": 0.0}
+DEFAULT_MAX_ENTRIES = 512
+
+
+def parse_ttls(spec: str) -> Dict[str, float]:
+    """"dig=300,nmap=0" 형식 파싱 (잘못된 항목은 무시)"""
+    ttls = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, value = item.split("=", 1)
+        try:
+            ttls[name.strip()] = max(0.0, float(value))
+        except ValueError:
+            logger.warning(f"Invalid {CACHE_TTL_ENV} entry: '{item}'")
+    return ttls
+
+
+def normalize_args(args: Dict[str, Any]) -> Dict[str, Any]:
+    """공백 차이/리스트·문자열 표기 차이를 없앤 인자
+
+    문자열은 셸 규칙으로 토큰화해 따옴표 밖의 공백만 정규화 (따옴표 안 공백이 다른 명령은 다른 키)
+    """
+    normalized = {}
+    for name, value in args.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = " ".join(str(v) for v in value)
+        if isinstance(value, str):
+            try:
+                value = shlex.split(value)
+            except ValueError:
+                # 따옴표가 닫히지 않은 인자는 명령 그대로 구분
+                value = value.strip()
+            if not value:
+                continue
+        normalized[name] = value
+    return normalized
+
+
+def cache_key(tool: str, args: Dict[str, Any]) -> str:
+    payload = json.dumps({"tool": tool.lower(), "args": normalize_args(args)}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SQLiteTier:
+    """재시작 후에도 유지되는 디스크 캐시 계층"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results ("
+                "key TEXT PRIMARY KEY, tool TEXT NOT NULL, created REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        with self._lock:
+            row = self._conn.execute("SELECT created, value FROM tool_results WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, tool: str, created: float, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_results (key, tool, created, value) VALUES (?, ?, ?, ?)",
+                (key, tool, created, value),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ToolResultCache:
+    """도구별 TTL + 메모리 LRU + 선택적 SQLite 계층"""
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: Optional[int] = None,
+        db_path: Optional[str] = None,
+    ):
+        if ttls is None:
+            ttls = {**DEFAULT_TTLS, **parse_ttls(os.getenv(CACHE_TTL_ENV, ""))}
+        self.ttls = ttls
+        self.max_entries = max_entries or int(os.getenv(CACHE_MAX_ENTRIES_ENV, DEFAULT_MAX_ENTRIES))
+        db_path = db_path if db_path is not None else os.getenv(CACHE_DB_ENV, "")
+        self.disk = SQLiteTier(db_path) if db_path else None
+
+        # key → (생성 시각(epoch), 결과)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    def ttl_for(self, tool: str) -> float:
+        return self.ttls.get(tool, self.ttls.get("*", 0.0))
+
+    async def lookup(self, tool: str, key: str) -> Optional[Tuple[float, str]]:
+        """TTL 안의 (생성 시각, 결과) 반환"""
+        ttl = self.ttl_for(tool)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            if now - entry[0] < ttl:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            del self._memory[key]
+
+        if self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None and now - entry[0] < ttl:
+                self._remember(key, entry)
+                self._stats["disk_hits"] += 1
+                return entry
+
+        return None
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def store(self, tool: str, key: str, value: str) -> None:
+        entry = (time.time(), value)
+        self._remember(key, entry)
+        self._stats["stores"] += 1
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.put, key, tool, entry[0], value)
+            except sqlite3.Error as e:
+                logger.warning(f"Tool result cache write failed: {e}")
+
+    async def get_or_run(
+        self,
+        tool: str,
+        args: Dict[str, Any],
+        func: Callable[[], Awaitable[str]],
+        fresh: bool = False,
+    ) -> str:
+        """캐시된 결과가 있으면 반환, 없거나 fresh=True면 실행 후 저장
+
+        캐시된 결과 앞에는 캐시 여부와 경과 시간을 표시
+        """
+        if self.ttl_for(tool) <= 0:
+            return await func()
+
+        key = cache_key(tool, args)
+        if fresh:
+            self._stats["bypassed"] += 1
+        else:
+            entry = await self.lookup(tool, key)
+            if entry is not None:
+                age = int(time.time() - entry[0])
+                return f"[cached result, {age}s old - pass fresh=True to re-run]\n{entry[1]}"
+            self._stats["misses"] += 1
+
+        result = await func()
+        # 실패 결과("[-] ...")는 캐시하지 않음
+        if not result.startswith("[-]"):
+            await self.store(tool, key, result)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "entries": len(self._memory), "disk": self.disk is not None}
+
+
+_cache: Optional[ToolResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ToolResultCache:
+    """전역 도구 결과 캐시 인스턴스 반환"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ToolResultCache()
+        return _cache
@@ -0,0 +1,251 @@
+"""
+네트워크별 스캔 속도 프로파일 - Reconnaissance MCP 서버용
+완료된 스캔에서 관측한 RTT와 손실률로 같은 네트워크의 다음 스캔 타이밍/병렬도/배치 크기를 조정
+(LLM이 -T/--max-rate 등을 추측하지 않아도 되도록)
+
+    DECEPTICON_SCAN_PROFILES=cache/scan_profiles.json   # 프로파일 저장 위치 (재시작 후에도 유지, 빈 값이면 메모리만)
+
+- 네트워크 단위: IPv4 /24, IPv6 /64, 그 외 호스트명은 이름 그대로
+- RTT: nmap XML의 <times srtt rttvar>, connect_scan의 연결 응답 시간 (EWMA)
+- 손실률: connect_scan에서 첫 시도는 시간 초과였지만 재시도에 응답한 포트 비율
+  (모든 시도가 시간 초과인 포트는 방화벽 필터링으로 보고 제외 - 일부 포트만 DROP하는 호스트도 손실로 보지 않음)
+- 전송률: 손실이 크면 절반으로, 거의 없으면 1.5배로 (AIMD)
+"""
+
+import ipaddress
+import json
+import os
+import re
+import threading
+import time
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCAN_PROFILES_ENV = "DECEPTICON_SCAN_PROFILES"
+DEFAULT_PROFILES_PATH = os.path.join("cache", "scan_profiles.json")
+
+INITIAL_RATE = 1000.0
+MIN_RATE = 50.0
+MAX_RATE = 20000.0
+HIGH_LOSS = 0.05
+LOW_LOSS = 0.01
+MIN_LOSS_PROBES = 20
+EWMA_WEIGHT = 0.3
+
+# 사용자가 직접 지정하면 자동 조정하지 않는 nmap 타이밍 옵션
+TIMING_OPTION_RE = re.compile(
+    r"(?:^|\s)(?:-T\s*[0-5]|--(?:min|max)-rate|--max-retries|--(?:min|max|initial)-rtt-timeout"
+    r"|--(?:min|max)-parallelism|--(?:min|max)-hostgroup|--(?:max-)?scan-delay)\b"
+)
+
+
+def network_key(host: str) -> str:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        try:
+            # CIDR 대상은 대표 네트워크로
+            network = ipaddress.ip_network(host, strict=False)
+            address = network.network_address
+        except ValueError:
+            return host.lower()
+    prefix = 24 if address.version == 4 else 64
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+@dataclass
+class ScanProfile:
+    network: str
+    srtt_ms: Optional[float] = None
+    rttvar_ms: float = 0.0
+    loss: float = 0.0
+    rate: float = INITIAL_RATE
+    rtt_samples: int = 0
+    loss_samples: int = 0
+    updated: float = 0.0
+
+    def observe_rtt(self, srtt_ms: float, rttvar_ms: float) -> None:
+        if self.srtt_ms is None:
+            self.srtt_ms, self.rttvar_ms = srtt_ms, rttvar_ms
+        else:
+            self.srtt_ms += EWMA_WEIGHT * (srtt_ms - self.srtt_ms)
+            self.rttvar_ms += EWMA_WEIGHT * (rttvar_ms - self.rttvar_ms)
+        self.rtt_samples += 1
+        self.updated = time.time()
+
+    def observe_loss(self, loss: float) -> None:
+        self.loss = loss if not self.loss_samples else self.loss + EWMA_WEIGHT * (loss - self.loss)
+        self.loss_samples += 1
+        if loss > HIGH_LOSS:
+            self.rate = max(MIN_RATE, self.rate * 0.5)
+        elif loss < LOW_LOSS:
+            self.rate = min(MAX_RATE, self.rate * 1.5)
+        self.updated = time.time()
+
+    def rtt_timeouts_ms(self) -> Tuple[int, int, int]:
+        """(min, initial, max) RTT timeout (ms)"""
+        srtt = self.srtt_ms or 100.0
+        initial = srtt + 4 * self.rttvar_ms
+        return (
+            max(10, round(srtt)),
+            max(50, round(initial)),
+            max(100, round(min(3000.0, 3 * initial))),
+        )
+
+    def nmap_flags(self, include_rate: bool = True) -> List[str]:
+        """관측값 기반 nmap 타이밍 옵션 (include_rate=False면 전송률/병렬도는 호출자가 정함)"""
+        flags: List[str] = []
+        if self.srtt_ms is not None:
+            min_rtt, initial_rtt, max_rtt = self.rtt_timeouts_ms()
+            flags += [
+                "--min-rtt-timeout", f"{min_rtt}ms",
+                "--initial-rtt-timeout", f"{initial_rtt}ms",
+                "--max-rtt-timeout", f"{max_rtt}ms",
+            ]
+        if self.loss_samples:
+            retries = 1 if self.loss < LOW_LOSS else 2 if self.loss < HIGH_LOSS else 4
+            hostgroup = 256 if self.loss < LOW_LOSS else 64 if self.loss < HIGH_LOSS else 16
+            flags += ["--max-retries", str(retries), "--max-hostgroup", str(hostgroup)]
+            if include_rate:
+                flags += ["--max-rate", f"{self.rate:g}", "--max-parallelism", str(self.parallelism())]
+        return flags
+
+    def parallelism(self) -> int:
+        """전송률 × RTT (대역폭-지연 곱) 만큼의 동시 탐침"""
+        srtt = (self.srtt_ms or 100.0) / 1000
+        return int(min(1024, max(10, self.rate * srtt * 2)))
+
+    def connect_settings(self) -> Dict[str, Any]:
+        """connect_scan 초기 대기 시간과 동시 연결 수 (손실이 관측된 네트워크만 동시 연결 수 제한)"""
+        settings: Dict[str, Any] = {}
+        if self.srtt_ms is not None:
+            settings["initial_timeout"] = self.rtt_timeouts_ms()[1] / 1000
+        if self.loss_samples and self.loss >= LOW_LOSS:
+            # 연결 하나가 최대 initial_timeout 동안 자리를 차지하므로 rate × timeout 개면 목표 전송률 유지
+            timeout = settings.get("initial_timeout", 1.0)
+            settings["concurrency"] = int(min(1024, max(10, self.rate * timeout)))
+        return settings
+
+    def summary(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["srtt_ms"] = round(self.srtt_ms, 2) if self.srtt_ms is not None else None
+        result["rttvar_ms"] = round(self.rttvar_ms, 2)
+        result["loss"] = round(self.loss, 4)
+        result["nmap_flags"] = " ".join(self.nmap_flags())
+        return result
+
+
+class ScanProfileStore:
+    """네트워크별 프로파일 보관 + JSON 파일 저장"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = os.getenv(SCAN_PROFILES_ENV, DEFAULT_PROFILES_PATH) if path is None else path
+        self.profiles: Dict[str, ScanProfile] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for network, data in json.load(f).items():
+                    self.profiles[network] = ScanProfile(**{**data, "network": network})
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable scan profiles {self.path}: {e}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({n: asdict(p) for n, p in self.profiles.items()}, f, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save scan profiles: {e}")
+
+    def _profile(self, network: str) -> ScanProfile:
+        if network not in self.profiles:
+            self.profiles[network] = ScanProfile(network)
+        return self.profiles[network]
+
+    def get(self, target: str) -> Optional[ScanProfile]:
+        """대상(첫 번째 항목)의 네트워크 프로파일"""
+        items = target.replace(",", " ").split()
+        return self.profiles.get(network_key(items[0])) if items else None
+
+    def observe_rtts(self, samples: Iterable[Tuple[str, float, float]]) -> None:
+        """(호스트, srtt_ms, rttvar_ms) 표본 반영 - 네트워크별 평균으로 한 번씩"""
+        grouped: Dict[str, List[Tuple[float, float]]] = {}
+        for host, srtt_ms, rttvar_ms in samples:
+            grouped.setdefault(network_key(host), []).append((srtt_ms, rttvar_ms))
+        if not grouped:
+            return
+        with self._lock:
+            for network, values in grouped.items():
+                self._profile(network).observe_rtt(
+                    sum(v[0] for v in values) / len(values), sum(v[1] for v in values) / len(values),
+                )
+            self._save()
+
+    def observe_probes(self, samples: Iterable[Tuple[str, int, int]]) -> None:
+        """(호스트, 응답한 포트 수, 그중 첫 시도를 잃은 포트 수) 반영 - 네트워크별 손실률 계산
+
+        끝까지 응답하지 않은 (필터링된) 포트는 호출자가 두 값 모두에서 제외
+        """
+        grouped: Dict[str, List[int]] = {}
+        for host, answered, lost in samples:
+            if answered <= 0:
+                continue
+            totals = grouped.setdefault(network_key(host), [0, 0])
+            totals[0] += answered
+            totals[1] += lost
+        observed = {n: t for n, t in grouped.items() if t[0] >= MIN_LOSS_PROBES}
+        if not observed:
+            return
+        with self._lock:
+            for network, (answered, lost) in observed.items():
+                self._profile(network).observe_loss(lost / answered)
+            self._save()
+
+    def tune_nmap_args(self, target: str, args_str: str, include_rate: bool = True) -> Tuple[str, Optional[str]]:
+        """타이밍 옵션이 없으면 프로파일 옵션 추가 → (옵션, 적용한 옵션 또는 None)"""
+        profile = self.get(target)
+        if profile is None or TIMING_OPTION_RE.search(args_str):
+            return args_str, None
+        flags = " ".join(profile.nmap_flags(include_rate))
+        if not flags:
+            return args_str, None
+        return f"{args_str} {flags}".strip(), flags
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"path": self.path or None, "profiles": [p.summary() for p in self.profiles.values()]}
+
+
+_store: Optional[ScanProfileStore] = None
+_store_lock = threading.Lock()
+
+
+def get_scan_profiles() -> ScanProfileStore:
+    """전역 스캔 프로파일 저장소 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ScanProfileStore()
+        return _store
+
+
+def register_profile_tools(mcp, store: Optional[ScanProfileStore] = None) -> None:
+    """scan_profiles 도구를 FastMCP 서버에 등록"""
+    store = store or get_scan_profiles()
+
+    @mcp.tool(description="Show learned per-network scan profiles (RTT, loss, rate) and the nmap timing flags applied automatically")
+    async def scan_profiles() -> Dict[str, Any]:
+        return store.get_stats()
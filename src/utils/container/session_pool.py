@@ -0,0 +1,262 @@
+"""
+tmux 세션 풀 - terminal MCP 서버 공용
+미리 띄워 둔 유휴 세션을 rename만으로 넘겨줘 create_session에서 셸 기동 비용 제거
+서버가 재시작되면 컨테이너에 남아 있던 풀 세션을 max_idle까지 다시 풀에 넣고 나머지는 종료
+
+    DECEPTICON_SESSION_POOL_SIZE=2        # 항상 준비해 둘 유휴 세션 수 (0이면 풀 비활성화)
+    DECEPTICON_SESSION_POOL_MAX_IDLE=4    # 반환된 세션을 보관할 최대 수 (초과분은 바로 종료)
+    DECEPTICON_SESSION_POOL_IDLE_TTL=300  # SIZE를 넘는 유휴 세션을 정리하기까지의 시간(초)
+"""
+
+import asyncio
+import os
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.utils.container.backend import ExecBackend
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE_ENV = "DECEPTICON_SESSION_POOL_SIZE"
+POOL_MAX_IDLE_ENV = "DECEPTICON_SESSION_POOL_MAX_IDLE"
+POOL_IDLE_TTL_ENV = "DECEPTICON_SESSION_POOL_IDLE_TTL"
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_IDLE_TTL = 300.0
+REAP_INTERVAL = 30.0
+
+# 에이전트에게 보이지 않는 풀 세션 이름 접두사
+POOL_SESSION_PREFIX = "decepticon-pool-"
+
+
+def chain(*commands: List[str]) -> List[str]:
+    """여러 tmux 명령을 ';'로 연결해 exec 한 번으로 실행"""
+    args: List[str] = []
+    for command in commands:
+        if args:
+            args.append(";")
+        args.extend(command)
+    return args
+
+
+class TmuxSessionPool:
+    """미리 초기화된 tmux 세션 풀"""
+
+    def __init__(
+        self,
+        backend: ExecBackend,
+        container_name: str,
+        size: Optional[int] = None,
+        max_idle: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        reap_interval: float = REAP_INTERVAL,
+    ):
+        self.backend = backend
+        self.container_name = container_name
+        self.size = max(0, size if size is not None else int(os.getenv(POOL_SIZE_ENV, DEFAULT_POOL_SIZE)))
+        if max_idle is None:
+            max_idle = int(os.getenv(POOL_MAX_IDLE_ENV, self.size * 2))
+        self.max_idle = max(self.size, max_idle)
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv(POOL_IDLE_TTL_ENV, DEFAULT_IDLE_TTL))
+        self.reap_interval = reap_interval
+
+        # 유휴 세션 이름 → 풀에 들어온 시각
+        self._idle: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._refill_lock = asyncio.Lock()
+        self._refill_task: Optional[asyncio.Task] = None
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._adopted = False
+
+        self._stats = {"hits": 0, "misses": 0, "created": 0, "recycled": 0, "reaped": 0, "adopted": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @staticmethod
+    def is_pool_session(name: str) -> bool:
+        return name.startswith(POOL_SESSION_PREFIX)
+
+    async def _tmux(self, args: List[str]):
+        return await self.backend.aexec(self.container_name, ["tmux"] + args)
+
+    def ensure_started(self) -> None:
+        """유휴 세션 채우기와 정리 작업 시작 (이벤트 루프 안에서 호출)"""
+        if not self.enabled:
+            return
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.ensure_future(self._reap_loop())
+        self._schedule_refill()
+
+    def _schedule_refill(self) -> None:
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.ensure_future(self._refill())
+
+    async def _refill(self) -> None:
+        """유휴 세션이 size보다 적으면 부족한 만큼 한 번에 생성"""
+        async with self._refill_lock:
+            if not self._adopted:
+                await self._adopt_existing()
+            missing = self.size - len(self._idle)
+            if missing <= 0:
+                return
+
+            names = [f"{POOL_SESSION_PREFIX}{uuid.uuid4().hex[:8]}" for _ in range(missing)]
+            result = await self._tmux(chain(*(["new-session", "-d", "-s", name] for name in names)))
+            if result.returncode != 0:
+                # 중간에 실패하면 앞선 세션만 생성되므로 실제 존재하는 세션만 반영
+                logger.warning(f"Session pool refill failed: {result.stderr.strip()}")
+                existing = set(await self._list_sessions())
+                names = [name for name in names if name in existing]
+
+            now = time.monotonic()
+            async with self._lock:
+                for name in names:
+                    self._idle[name] = now
+            self._stats["created"] += len(names)
+
+    async def _adopt_existing(self) -> None:
+        """이전 서버 프로세스가 남긴 풀 세션을 max_idle까지 풀에 넣고 나머지는 종료
+
+        풀 세션은 list_sessions에서 숨겨지므로 여기서 회수하지 않으면 재시작할 때마다 셸이 누적됨
+        """
+        result = await self._tmux(["list-sessions", "-F", "#{session_name}"])
+        if result.returncode != 0:
+            # tmux 서버가 없으면 남은 세션도 없음
+            self._adopted = any(m in result.stderr for m in ("no server running", "error connecting to", "no sessions"))
+            if not self._adopted:
+                logger.warning(f"Session pool could not list sessions: {result.stderr.strip()}")
+            return
+        self._adopted = True
+        leftover = [
+            line.strip() for line in result.stdout.splitlines()
+            if self.is_pool_session(line.strip())
+        ]
+        if not leftover:
+            return
+
+        now = time.monotonic()
+        async with self._lock:
+            leftover = [name for name in leftover if name not in self._idle]
+            room = max(0, self.max_idle - len(self._idle))
+            adopt, excess = leftover[:room], leftover[room:]
+            for name in adopt:
+                self._idle[name] = now
+        self._stats["adopted"] += len(adopt)
+        if excess:
+            await self._tmux(chain(*(["kill-session", "-t", name] for name in excess)))
+            self._stats["reaped"] += len(excess)
+        logger.info(f"Session pool adopted {len(adopt)} and killed {len(excess)} leftover sessions in {self.container_name}")
+
+    async def _list_sessions(self) -> List[str]:
+        result = await self._tmux(["list-sessions", "-F", "#{session_name}"])
+        if result.returncode != 0:
+            return []
+        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+    async def acquire(self, name: str) -> bool:
+        """이름이 name인 세션 준비 (풀 세션 rename, 없으면 새로 생성)
+
+        Returns:
+            bool: 풀에서 가져왔으면 True (hit)
+
+        Raises:
+            Exception: 세션 생성 실패 (이름 중복 등)
+        """
+        self.ensure_started()
+
+        async with self._lock:
+            pooled = self._idle.popitem(last=False)[0] if self._idle else None
+
+        if pooled is not None:
+            result = await self._tmux(["rename-session", "-t", pooled, name])
+            if result.returncode == 0:
+                self._stats["hits"] += 1
+                self._schedule_refill()
+                return True
+            if "duplicate session" in result.stderr:
+                # 요청한 이름이 이미 있음 - 풀 세션은 되돌려 두고 아래에서 기존과 같은 에러 반환
+                async with self._lock:
+                    self._idle[pooled] = time.monotonic()
+            # 그 외에는 풀 세션이 사라진 경우 (kill-server 등)
+
+        self._stats["misses"] += 1
+        result = await self._tmux(["new-session", "-d", "-s", name])
+        if result.returncode != 0:
+            raise Exception(f"Failed to create session '{name}': {result.stderr}")
+        self._schedule_refill()
+        return False
+
+    async def release(self, name: str):
+        """세션 반환 - 셸을 새로 띄워 초기화한 뒤 풀에 보관, 풀이 가득 차면 종료
+
+        Returns:
+            subprocess.CompletedProcess: 마지막으로 실행한 tmux 명령 결과
+        """
+        async with self._lock:
+            keep = self.enabled and len(self._idle) < self.max_idle
+
+        if not keep:
+            return await self._tmux(["kill-session", "-t", name])
+
+        pooled = f"{POOL_SESSION_PREFIX}{uuid.uuid4().hex[:8]}"
+        # 다른 창/패인 정리 → 셸 재시작(환경 변수/작업 디렉터리 초기화) → 스크롤백 삭제 → 이름 변경
+        result = await self._tmux(chain(
+            ["kill-window", "-a", "-t", name],
+            ["kill-pane", "-a", "-t", name],
+            ["respawn-pane", "-k", "-t", name],
+            ["clear-history", "-t", name],
+            ["rename-session", "-t", name, pooled],
+        ))
+        if result.returncode != 0:
+            # 재활용 실패 시 기존처럼 종료
+            return await self._tmux(["kill-session", "-t", name])
+
+        async with self._lock:
+            self._idle[pooled] = time.monotonic()
+        self._stats["recycled"] += 1
+        return result
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.warning(f"Session pool reap failed: {e}")
+
+    async def reap(self) -> int:
+        """size를 넘는 유휴 세션 중 idle_ttl이 지난 것부터 종료"""
+        now = time.monotonic()
+        async with self._lock:
+            surplus = len(self._idle) - self.size
+            expired = [
+                name for name, since in self._idle.items()
+                if now - since >= self.idle_ttl
+            ][:max(0, surplus)]
+            for name in expired:
+                del self._idle[name]
+
+        if expired:
+            await self._tmux(chain(*(["kill-session", "-t", name] for name in expired)))
+            self._stats["reaped"] += len(expired)
+        return len(expired)
+
+    def reset(self) -> None:
+        """tmux 서버가 종료된 경우 유휴 세션 목록 비우기"""
+        self._idle.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 hit/miss 통계 반환"""
+        requests = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "idle": len(self._idle),
+            "size": self.size,
+            "max_idle": self.max_idle,
+            "hit_rate": round(self._stats["hits"] / requests, 3) if requests else 0.0,
+        }
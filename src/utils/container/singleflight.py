@@ -0,0 +1,91 @@
+"""
+동일 명령 single-flight 병합 - MCP 서버 공용
+같은 명령이 실행 중일 때 들어온 요청은 새로 실행하지 않고 진행 중인 실행에 합류해 같은 결과를 받음
+(예: Planner 핸드오프 직후 여러 에이전트/세션이 같은 호스트에 nmap -sV)
+
+    DECEPTICON_COALESCE=1   # 0이면 병합하지 않음
+"""
+
+import asyncio
+import os
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from src.utils.container.output import OutputCallback
+
+logger = logging.getLogger(__name__)
+
+COALESCE_ENV = "DECEPTICON_COALESCE"
+
+# 실행 중 출력을 모든 대기자에게 전달할 emit 콜백을 받아 결과를 반환하는 함수
+FlightFunc = Callable[[Optional[OutputCallback]], Awaitable[Any]]
+
+
+@dataclass
+class Flight:
+    task: Optional[asyncio.Task] = None
+    waiters: int = 0
+    listeners: List[OutputCallback] = field(default_factory=list)
+
+    async def emit(self, text: str) -> None:
+        for listener in list(self.listeners):
+            try:
+                await listener(text)
+            except Exception as e:
+                logger.debug(f"Coalesced output listener failed: {e}")
+
+
+class SingleFlight:
+    """키별로 하나의 실행만 유지하고 나머지 요청은 결과를 공유"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv(COALESCE_ENV, "1").lower() not in ("0", "false", "no")
+        self.enabled = enabled
+        self._flights: Dict[Hashable, Flight] = {}
+        # saved: 진행 중인 실행에 합류해 생략된 실행 수
+        self._stats = {"executions": 0, "saved": 0}
+
+    async def do(self, key: Hashable, func: FlightFunc, on_output: Optional[OutputCallback] = None) -> Any:
+        """key가 실행 중이면 합류, 아니면 func 실행
+
+        합류한 요청은 합류 이후의 출력만 on_output으로 받고 최종 결과는 동일
+        대기자가 모두 취소된 경우에만 실행을 취소
+        """
+        if not self.enabled:
+            self._stats["executions"] += 1
+            return await func(on_output)
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = Flight()
+            flight.task = asyncio.ensure_future(func(flight.emit))
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self._flights[key] = flight
+            self._stats["executions"] += 1
+        else:
+            self._stats["saved"] += 1
+            logger.info(f"Coalesced duplicate execution: {key}")
+
+        flight.waiters += 1
+        if on_output:
+            flight.listeners.append(on_output)
+        try:
+            # 한 대기자의 취소가 공유 실행을 취소하지 않도록 shield
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+            if on_output:
+                flight.listeners.remove(on_output)
+
+    def _finish(self, key: Hashable, flight: Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "in_flight": len(self._flights)}
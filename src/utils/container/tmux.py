@@ -0,0 +1,162 @@
+"""
+tmux 세션 명령 실행 - terminal MCP 서버 공용
+명령 전송 / 완료 대기 / 출력 / 종료 코드 회수 / 임시 파일 정리를 docker exec 한 번으로 처리
+
+    send-keys → (세션 셸에서 명령 실행) → wait-for 신호
+    같은 exec 안에서 tail --pid 로 출력 파일을 스트리밍하고, 종료 코드는 stderr 마커로 전달
+
+시간 초과/취소 시에는 세션의 전경 프로세스 그룹을 중단하고 대기 중인 exec를 풀어 줌
+"""
+
+import asyncio
+import re
+import shlex
+import uuid
+from typing import Optional, Tuple
+
+from src.utils.container.artifacts import ArtifactStore
+from src.utils.container.backend import ExecBackend
+from src.utils.container.engine import STREAM_STDERR
+from src.utils.container.output import BoundedOutput, OutputCallback, OutputThrottle, format_timeout
+
+EXIT_MARKER = "__DECEPTICON_EXIT__="
+EXIT_MARKER_RE = re.compile(re.escape(EXIT_MARKER) + r"(-?\d+)")
+
+# tail --pid 폴링 간격 (기본 1초면 명령마다 최대 1초 지연)
+TAIL_POLL_INTERVAL = 0.05
+
+# C-c 후 전경 프로세스 그룹을 강제 종료하기까지 기다리는 시간(초)
+INTERRUPT_GRACE_PERIOD = 1
+
+
+class CommandTimeoutError(Exception):
+    """세션 명령이 시간 제한을 넘겨 중단됨 (output: 그때까지의 출력)"""
+
+    def __init__(self, timeout: float, output: str):
+        super().__init__(format_timeout(timeout, output))
+        self.timeout = timeout
+        self.output = output
+
+
+def session_channel(session_id: str, token: str) -> str:
+    return f"done-{session_id}-{token}"
+
+
+def build_session_script(session_id: str, command: str, token: str) -> str:
+    """세션 명령 실행용 셸 스크립트 생성
+
+    명령은 tmux 세션 셸에서 실행되므로 cd/export 등 세션 상태는 그대로 유지
+    """
+    channel = session_channel(session_id, token)
+    output_file = f"/tmp/cmd_output_{session_id}_{token}.txt"
+    status_file = f"/tmp/cmd_status_{session_id}_{token}.txt"
+
+    # 세션 셸에서 실행될 명령 (기존과 동일한 파일 리다이렉션 + 완료 신호)
+    full_command = f"({command}) > {output_file} 2>&1; echo $? > {status_file}; tmux wait-for -S {channel}"
+
+    out, status = shlex.quote(output_file), shlex.quote(status_file)
+    return (
+        f"tmux send-keys -t {shlex.quote(session_id)} {shlex.quote(full_command)} Enter || exit $?; "
+        f"touch {out}; "
+        f"tmux wait-for {shlex.quote(channel)} & w=$!; "
+        # wait-for 프로세스가 끝나면 tail이 마지막으로 한 번 더 읽고 종료
+        f"tail -s {TAIL_POLL_INTERVAL} -c +1 -f --pid=$w {out} 2>/dev/null; "
+        f"wait $w; rc=$?; "
+        f"echo \"{EXIT_MARKER}$(cat {status} 2>/dev/null)\" >&2; "
+        f"rm -f {out} {status}; "
+        f"exit $rc"
+    )
+
+
+def build_interrupt_script(session_id: str, token: str, grace: int = INTERRUPT_GRACE_PERIOD) -> str:
+    """실행 중인 세션 명령 중단 스크립트
+
+    C-c 전송 → 남아 있으면 전경 프로세스 그룹(셸 제외) SIGKILL →
+    완료 신호를 대신 보내 대기 중인 tail/wait-for와 임시 파일 정리
+    """
+    session = shlex.quote(session_id)
+    return (
+        f"tmux send-keys -t {session} C-c; sleep {grace}; "
+        f"pid=$(tmux display-message -p -t {session} '#{{pane_pid}}' 2>/dev/null); "
+        f"pg=$(ps -o tpgid= -p \"$pid\" 2>/dev/null | tr -d ' '); "
+        f"if [ -n \"$pg\" ] && [ \"$pg\" -gt 0 ] && [ \"$pg\" != \"$pid\" ]; then kill -KILL -$pg 2>/dev/null; fi; "
+        f"tmux wait-for -S {shlex.quote(session_channel(session_id, token))}; exit 0"
+    )
+
+
+async def interrupt_session(backend: ExecBackend, container: str, session_id: str, token: str) -> None:
+    try:
+        await backend.aexec(container, ["sh", "-c", build_interrupt_script(session_id, token)])
+    except Exception:
+        # 세션이 이미 사라진 경우 등 - 중단 실패가 결과 반환을 막지 않도록 무시
+        pass
+
+
+async def run_in_session(
+    backend: ExecBackend,
+    container: str,
+    session_id: str,
+    command: str,
+    on_output: Optional[OutputCallback] = None,
+    artifacts: Optional[ArtifactStore] = None,
+    timeout: Optional[float] = None,
+) -> Tuple[int, str]:
+    """tmux 세션에서 명령 실행 후 (종료 코드, 출력) 반환
+
+    artifacts가 있으면 임계값을 넘는 출력은 저장하고 요약을 대신 반환
+    timeout을 넘기거나 취소되면 세션의 명령을 중단 (세션 자체는 유지)
+
+    Raises:
+        CommandTimeoutError: timeout 초과 (부분 출력 포함)
+        Exception: 명령 전송/완료 대기 실패 또는 종료 코드를 읽지 못한 경우
+    """
+    token = uuid.uuid4().hex[:8]
+    script = build_session_script(session_id, command, token)
+
+    stdout = BoundedOutput()
+    stderr = BoundedOutput()
+    artifact = artifacts.writer() if artifacts else None
+    throttle = OutputThrottle(on_output) if on_output else None
+
+    async def on_chunk(stream_type: int, data: bytes) -> None:
+        if stream_type == STREAM_STDERR:
+            stderr.write(data)
+            return
+        stdout.write(data)
+        if artifact:
+            artifact.write(data)
+        if throttle:
+            await throttle.feed(data)
+
+    def collect_output() -> str:
+        output = stdout.getvalue().strip()
+        artifact_id = artifact.commit() if artifact else None
+        return artifacts.summarize(output, artifact_id, "command_exec", raw_head=artifact.head) if artifact_id else output
+
+    try:
+        try:
+            returncode = await asyncio.wait_for(
+                backend.aexec_stream(container, ["sh", "-c", script], on_chunk), timeout
+            )
+        except asyncio.TimeoutError:
+            await interrupt_session(backend, container, session_id, token)
+            if throttle:
+                await throttle.flush()
+            raise CommandTimeoutError(timeout, collect_output())
+        except asyncio.CancelledError:
+            await asyncio.shield(interrupt_session(backend, container, session_id, token))
+            raise
+        if throttle:
+            await throttle.flush()
+
+        errors = stderr.getvalue()
+        match = EXIT_MARKER_RE.search(errors)
+        if returncode != 0 or not match:
+            errors = EXIT_MARKER_RE.sub("", errors).replace(EXIT_MARKER, "").strip()
+            raise Exception(f"Command execution monitoring failed: {errors or f'exit code {returncode}'}")
+
+        return int(match.group(1)), collect_output()
+
+    finally:
+        if artifact:
+            artifact.discard()
@@ -16,6 +16,7 @@ from src.utils.llm.config_manager import (
     get_current_llm_config,
     get_current_llm
 )
+from src.utils.llm.configurable import with_model
 from src.utils.message import (
     extract_message_content,
     get_message_type,
@@ -83,8 +84,10 @@ class Executor:
             
             # LLM 인스턴스 생성
             self._current_llm = get_current_llm()
+            # 이 스레드에서 사용할 모델 (swarm은 실행 시 config로 모델 선택)
+            self._config = with_model(self._config, self._current_model)
             
-            # 동적으로 swarm 생성 
+            # 동적으로 swarm 생성 (같은 도구 구성이면 컴파일된 swarm 재사용)
             self._swarm = await create_dynamic_swarm()
             
             # 초기화 완료
@@ -105,7 +108,7 @@ class Executor:
             raise Exception("Executor not ready - swarm not initialized")
         
         # config가 제공되면 사용, 없으면 기본 config 사용
-        execution_config = config if config else self._config
+        execution_config = with_model(config if config else self._config, self._current_model)
         
         # 메시지 ID 추적 초기화
         self._processed_message_ids = set()
@@ -238,8 +241,10 @@ class Executor:
             # 새로운 LLM 인스턴스 생성
             self._current_llm = get_current_llm()
             
-            # 새로운 모델로 에이전트들 재생성
-            self._swarm = await create_dynamic_swarm()
+            # 에이전트는 다시 만들지 않고 실행 config의 모델만 교체
+            self._config = with_model(self._config, model_info)
+            if self._swarm is None:
+                self._swarm = await create_dynamic_swarm()
             
             return True
             
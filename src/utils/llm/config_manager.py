@@ -3,7 +3,7 @@
 """
 
 from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from .models import load_llm_model, ModelProvider
 
 
@@ -31,6 +31,8 @@ class MemoryConfigManager:
         if not getattr(self, '_initialized', False):
             self._config: Optional[LLMConfig] = None
             self._llm_instance: Optional[Any] = None
+            # (provider, model)별 LLM 인스턴스 - 이전에 쓰던 모델로 바꿀 때 다시 생성하지 않음
+            self._llm_cache: Dict[Tuple[str, str], Any] = {}
             self._initialized = True
     
     @property
@@ -54,13 +56,9 @@ class MemoryConfigManager:
             temperature=0.0  # 고정값
         )
         
-        # LLM 인스턴스도 새로 생성
+        # LLM 인스턴스도 새로 생성 (이미 만든 모델이면 재사용)
         try:
-            self._llm_instance = load_llm_model(
-                model_name=model_name,
-                provider=provider,
-                temperature=0.0
-            )
+            self._llm_instance = self.get_llm(model_name, provider)
         except Exception as e:
             print(f"Warning: Failed to load LLM model: {e}")
             self._llm_instance = None
@@ -69,21 +67,29 @@ class MemoryConfigManager:
         """현재 LLM 인스턴스 반환 (없으면 기본값으로 생성)"""
         if self._llm_instance is None and self._config is not None:
             try:
-                self._llm_instance = load_llm_model(
-                    model_name=self._config.model_name,
-                    provider=self._config.provider,
-                    temperature=0.0
-                )
+                self._llm_instance = self.get_llm(self._config.model_name, self._config.provider)
             except Exception as e:
                 print(f"Warning: Failed to load LLM model: {e}")
                 return None
         
         return self._llm_instance
     
+    def get_llm(self, model_name: str, provider: str) -> Any:
+        """(provider, model) LLM 인스턴스 반환 (처음 요청될 때 한 번만 생성)"""
+        key = (provider, model_name)
+        if key not in self._llm_cache:
+            self._llm_cache[key] = load_llm_model(
+                model_name=model_name,
+                provider=provider,
+                temperature=0.0
+            )
+        return self._llm_cache[key]
+    
     def reset(self) -> None:
         """설정 초기화"""
         self._config = None
         self._llm_instance = None
+        self._llm_cache.clear()
 
 
 # 전역 인스턴스 (싱글톤)
@@ -118,6 +124,11 @@ def get_current_llm():
     return get_memory_config_manager().get_current_llm()
 
 
+def get_llm(model_name: str, provider: str):
+    """지정한 모델의 LLM 인스턴스 반환 (모델별로 캐시)"""
+    return get_memory_config_manager().get_llm(model_name, provider)
+
+
 def reset_config() -> None:
     """설정 초기화"""
     get_memory_config_manager().reset()
@@ -130,5 +141,6 @@ __all__ = [
     "get_current_llm_config", 
     "update_llm_config",
     "get_current_llm",
+    "get_llm",
     "reset_config"
 ]
@@ -0,0 +1,97 @@
+"""
+실행 시점 모델 선택 - 컴파일된 swarm을 다시 만들지 않고 LLM 교체
+
+에이전트는 특정 LLM 인스턴스 대신 ConfigurableLLM을 사용하고,
+실제 모델은 호출할 때마다 config["configurable"]에서 결정
+
+    config = {"configurable": {"thread_id": ..., "model_name": "gpt-4o", "provider": "openai"}}
+
+- model_name/provider가 없으면 전역 설정(update_llm_config)의 모델, 그것도 없으면 기본 Claude 모델
+- LLM 인스턴스와 도구 바인딩은 (provider, model)별로 한 번만 생성
+- 스레드(대화)마다 다른 모델을 동시에 사용 가능
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.utils.llm.config_manager import get_current_llm, get_llm
+
+MODEL_NAME_KEY = "model_name"
+PROVIDER_KEY = "provider"
+DEFAULT_MODEL = ("claude-3-5-sonnet-latest", "anthropic")
+
+_default_warned = False
+
+
+def resolve_llm(config: Optional[RunnableConfig] = None):
+    """config의 모델 → 전역 설정 모델 → 기본 모델 순으로 LLM 인스턴스 반환"""
+    configurable = (config or {}).get("configurable", {})
+    model_name, provider = configurable.get(MODEL_NAME_KEY), configurable.get(PROVIDER_KEY)
+    if model_name and provider:
+        return get_llm(model_name, provider)
+    llm = get_current_llm()
+    if llm is None:
+        global _default_warned
+        if not _default_warned:
+            print("Warning: Using default LLM model (Claude 3.5 Sonnet)")
+            _default_warned = True
+        llm = get_llm(*DEFAULT_MODEL)
+    return llm
+
+
+def with_model(config: Optional[Dict[str, Any]], model_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """config에 모델 선택(model_info의 model_name/provider)을 넣은 사본"""
+    config = dict(config or {})
+    configurable = dict(config.get("configurable", {}))
+    if model_info:
+        configurable[MODEL_NAME_KEY] = model_info["model_name"]
+        configurable[PROVIDER_KEY] = model_info["provider"]
+    config["configurable"] = configurable
+    return config
+
+
+class ConfigurableLLM(Runnable):
+    """호출 시점에 config로 모델을 고르는 채팅 모델 래퍼 (create_react_agent에 그대로 전달)"""
+
+    def __init__(self, tools: Optional[Sequence[Any]] = None, bind_kwargs: Optional[Dict[str, Any]] = None):
+        self.tools: List[Any] = list(tools or [])
+        self.bind_kwargs = bind_kwargs or {}
+        # 모델 인스턴스별 도구 바인딩 (인스턴스는 config_manager에 캐시되어 id가 유지됨)
+        self._bound: Dict[int, Runnable] = {}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ConfigurableLLM":
+        return ConfigurableLLM(tools, kwargs)
+
+    def _model(self, config: Optional[RunnableConfig]) -> Runnable:
+        llm = resolve_llm(config)
+        if not self.tools:
+            return llm
+        bound = self._bound.get(id(llm))
+        if bound is None:
+            bound = self._bound[id(llm)] = llm.bind_tools(self.tools, **self.bind_kwargs)
+        return bound
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self._model(config).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return await self._model(config).ainvoke(input, config, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        yield from self._model(config).stream(input, config, **kwargs)
+
+    async def astream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        async for chunk in self._model(config).astream(input, config, **kwargs):
+            yield chunk
+
+
+_configurable_llm: Optional[ConfigurableLLM] = None
+
+
+def get_configurable_llm() -> ConfigurableLLM:
+    """에이전트 공용 ConfigurableLLM 반환"""
+    global _configurable_llm
+    if _configurable_llm is None:
+        _configurable_llm = ConfigurableLLM()
+    return _configurable_llm
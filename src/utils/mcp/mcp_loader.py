@@ -1,30 +1,192 @@
+"""
+MCP 도구 로더 - 에이전트별 MCP 서버 도구 조회
+서버 도구 목록(스키마)은 프로세스 전역 레지스트리에 보관해 에이전트 생성/모델 변경마다 다시 조회하지 않음
+
+    DECEPTICON_MCP_DISCOVERY_TIMEOUT=15   # 서버별 도구 조회 제한 시간 (초)
+
+- 여러 서버는 asyncio.gather로 동시에 조회 (응답 없는 서버는 제한 시간 후 건너뜀)
+- mcp_config.json 수정 시각이 바뀌거나 refresh_mcp_tools() 호출 시 다시 조회
+- 조회에 실패한 서버는 저장하지 않음 (다음 호출에서 다시 시도)
+- 반환하는 도구는 서버별 장기 세션으로 호출 (session_manager)
+"""
+
+import hashlib
 import json
-from langchain_mcp_adapters.client import MultiServerMCPClient
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 
-async def load_mcp_tools(agent_name=None):
-    with open("mcp_config.json", "r") as f:
-        config = json.load(f)
+from src.utils.mcp.session_manager import get_mcp_sessions, to_langchain_tool
 
-    if agent_name:
-        selected_agents = {agent: config[agent] for agent in agent_name if agent in config}
-    else:
-        selected_agents = config
+logger = logging.getLogger(__name__)
 
-    tools = []
+MCP_CONFIG_PATH = "mcp_config.json"
+MCP_DISCOVERY_TIMEOUT_ENV = "DECEPTICON_MCP_DISCOVERY_TIMEOUT"
+DEFAULT_DISCOVERY_TIMEOUT = 15.0
+
+
+def server_key(server_name: str, server_config: Dict[str, Any]) -> str:
+    """같은 이름이라도 연결 설정이 다르면 다른 서버로 구분"""
+    connection = {k: v for k, v in server_config.items() if k != "session_kwargs"}
+    return f"{server_name}:{json.dumps(connection, sort_keys=True, default=str)}"
+
+
+def prepare_server_config(server_config: Dict[str, Any]) -> Dict[str, Any]:
+    config = dict(server_config)
+    if "transport" not in config:
+        config["transport"] = "streamable_http" if "url" in config else "stdio"
+    return config
+
+
+class MCPToolRegistry:
+    """서버별 도구 목록 캐시 + 동시 조회"""
+
+    def __init__(self, path: str = MCP_CONFIG_PATH, timeout: Optional[float] = None):
+        self.path = path
+        self.timeout = timeout or float(os.getenv(MCP_DISCOVERY_TIMEOUT_ENV, DEFAULT_DISCOVERY_TIMEOUT))
+        self._config: Dict[str, Dict[str, Any]] = {}
+        self._mtime: Optional[float] = None
+        self._tools: Dict[str, List[Any]] = {}
+        self._errors: Dict[str, str] = {}
+        # 같은 서버를 동시에 조회하면 진행 중인 조회 결과를 공유
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._stats = {"discoveries": 0, "hits": 0, "failures": 0, "invalidations": 0}
+
+    def config(self) -> Dict[str, Dict[str, Any]]:
+        """mcp_config.json (수정 시각이 바뀌면 다시 읽고 도구 캐시 무효화)"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            if self._mtime is not None:
+                logger.info(f"{self.path} changed - reloading MCP tool registry")
+            self.invalidate()
+            self._mtime = mtime
+            try:
+                with open(self.path, "r") as f:
+                    self._config = json.load(f)
+            except FileNotFoundError:
+                self._config = {}
+        return self._config
+
+    def invalidate(self) -> None:
+        self._tools.clear()
+        self._errors.clear()
+        self._stats["invalidations"] += 1
+
+    def refresh(self) -> None:
+        """다음 조회 때 설정과 도구 목록을 다시 읽도록 초기화"""
+        self._mtime = None
+        self._config = {}
+        self.invalidate()
 
-    for agent_name, servers in selected_agents.items():
-        if not servers:
-            continue
+    async def _discover(self, key: str, server_name: str, server_config: Dict[str, Any]) -> List[Any]:
+        started = time.perf_counter()
+        self._stats["discoveries"] += 1
+        try:
+            # 도구 호출은 서버별 장기 세션으로 (조회에 쓴 세션을 그대로 재사용)
+            connection = prepare_server_config(server_config)
+            sessions = get_mcp_sessions()
+            mcp_tools = await asyncio.wait_for(sessions.list_tools(server_name, connection), self.timeout)
+            tools = [to_langchain_tool(sessions, server_name, connection, tool) for tool in mcp_tools]
+        except asyncio.TimeoutError:
+            self._errors[key] = f"no response within {self.timeout:g}s"
+        except Exception as e:
+            self._errors[key] = str(e) or type(e).__name__
+        else:
+            self._tools[key] = tools
+            self._errors.pop(key, None)
+            logger.debug(f"Discovered {len(tools)} tools from {server_name} in {time.perf_counter() - started:.2f}s")
+            return tools
+        self._stats["failures"] += 1
+        logger.warning(f"MCP server {server_name} tool discovery failed: {self._errors[key]}")
+        return []
 
-        for server_name, server_config in servers.items():
-            if "transport" not in server_config:
-                server_config["transport"] = "streamable_http" if "url" in server_config else "stdio"
+    async def server_tools(self, server_name: str, server_config: Dict[str, Any]) -> List[Any]:
+        key = server_key(server_name, server_config)
+        if key in self._tools:
+            self._stats["hits"] += 1
+            return self._tools[key]
+        task = self._pending.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._discover(key, server_name, server_config))
+            self._pending[key] = task
+        try:
+            # 대기하던 호출자가 취소돼도 조회는 끝까지 진행 (다른 호출자와 공유)
+            return await asyncio.shield(task)
+        finally:
+            if task.done() and self._pending.get(key) is task:
+                del self._pending[key]
 
-            client = MultiServerMCPClient({server_name: server_config})
-            current_tools = await client.get_tools() if client else []
+    async def discover(
+        self, agent_names: Optional[List[str]] = None, refresh: bool = False,
+    ) -> Dict[str, Dict[str, Tuple[Dict[str, Any], List[Any]]]]:
+        """{에이전트: {서버: (설정, 도구 목록)}} - 모든 서버를 동시에 조회"""
+        if refresh:
+            self.refresh()
+        config = self.config()
+        selected = {a: config[a] for a in agent_names if a in config} if agent_names else config
 
-            if current_tools:
-                tools.extend(current_tools)
+        servers = [(agent, name, cfg) for agent, entries in selected.items() for name, cfg in (entries or {}).items()]
+        results = await asyncio.gather(*(self.server_tools(name, cfg) for _, name, cfg in servers))
 
-    return tools if tools else []
\ No newline at end of file
+        discovered: Dict[str, Dict[str, Tuple[Dict[str, Any], List[Any]]]] = {agent: {} for agent in selected}
+        for (agent, name, cfg), tools in zip(servers, results):
+            discovered[agent][name] = (cfg, tools)
+        return discovered
+
+    def error(self, server_name: str, server_config: Dict[str, Any]) -> Optional[str]:
+        return self._errors.get(server_key(server_name, server_config))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "servers": len(self._tools),
+            "tools": sum(len(tools) for tools in self._tools.values()),
+            "errors": dict(self._errors),
+        }
+
+
+_registry: Optional[MCPToolRegistry] = None
+
+
+def get_mcp_registry() -> MCPToolRegistry:
+    """전역 MCP 도구 레지스트리 반환"""
+    global _registry
+    if _registry is None:
+        _registry = MCPToolRegistry()
+    return _registry
+
+
+def refresh_mcp_tools() -> None:
+    """MCP 서버 도구가 바뀐 경우 (서버 재시작 등) 캐시된 도구 목록 폐기"""
+    get_mcp_registry().refresh()
+
+
+async def mcp_tools_fingerprint(agent_name=None) -> str:
+    """에이전트별 도구 구성(이름/설명/인자 스키마) 해시 - 컴파일된 swarm 캐시 키용"""
+    discovered = await get_mcp_registry().discover(agent_name)
+    digest = hashlib.sha256()
+    for agent in sorted(discovered):
+        for server_name in sorted(discovered[agent]):
+            for tool in sorted(discovered[agent][server_name][1], key=lambda t: t.name):
+                schema = getattr(tool, "args_schema", None)
+                if hasattr(schema, "model_json_schema"):
+                    schema = schema.model_json_schema()
+                digest.update(json.dumps(
+                    [agent, server_name, tool.name, tool.description, schema], sort_keys=True, default=str,
+                ).encode())
+    return digest.hexdigest()[:16]
+
+
+async def load_mcp_tools(agent_name=None, refresh: bool = False):
+    discovered = await get_mcp_registry().discover(agent_name, refresh=refresh)
+
+    tools = []
+    for servers in discovered.values():
+        for _, server_tools in servers.values():
+            tools.extend(server_tools)
+    return tools
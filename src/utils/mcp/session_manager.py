@@ -0,0 +1,350 @@
+"""
+MCP 클라이언트 세션 관리자 - 서버별로 초기화된 세션 하나를 프로세스(이벤트 루프) 단위로 유지
+도구 호출마다 세션 생성/initialize 핸드셰이크/TCP 연결을 반복하지 않음
+
+- 세션은 백그라운드 태스크가 열고 닫음 (streamable HTTP 클라이언트의 태스크 그룹은 연 태스크에서 닫아야 함)
+- 동시 도구 호출은 같은 세션에서 요청 ID로 다중화
+- 전송 오류(서버 재시작/연결 끊김)가 감지되면 진행 중인 호출을 중단하고 SessionBroken
+  (요청이 이미 서버에서 실행됐을 수 있으므로 도구 호출은 다시 보내지 않음, 연결 실패와 도구 목록 조회만 재시도)
+- 서버별 호출 지연 시간 히스토그램 (get_stats)
+- 도구 호출마다 progressToken을 붙여 보내고, 같은 토큰이 달린 도구 출력 로그 알림만 그 호출의
+  LangGraph custom 스트림으로 전달 (대상이 불분명한 알림은 버림)
+"""
+
+import asyncio
+import bisect
+import itertools
+import time
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from langchain_mcp_adapters.sessions import create_session
+from langgraph.config import get_stream_writer
+from mcp import types
+
+from src.utils.container.output import parse_stream_logger_name
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 구간 상한 (ms) - 마지막 구간은 그 이상
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+CLOSE_TIMEOUT = 5.0
+
+
+class SessionBroken(ConnectionError):
+    """세션 전송 계층 오류 - 새 세션으로 다시 연결해야 함"""
+
+
+def server_label(server_name: str, connection: Dict[str, Any]) -> str:
+    """통계 표시용 서버 이름 (같은 이름의 서버가 여러 개일 수 있어 주소 포함)"""
+    address = connection.get("url") or connection.get("command")
+    return f"{server_name} ({address})" if address else server_name
+
+
+class LatencyHistogram:
+    """고정 구간 지연 시간 히스토그램"""
+
+    def __init__(self, buckets_ms: Tuple[int, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """구간 상한 기준 근사값"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return float(self.buckets_ms[index]) if index < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        labels = [f"<={b}ms" for b in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+class ServerStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.connects = 0
+        self.reconnects = 0
+        self.in_flight = 0
+        self.last_connect_ms: Optional[float] = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.latency.count,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "last_connect_ms": self.last_connect_ms,
+            "latency": self.latency.summary(),
+        }
+
+
+class ServerSession:
+    """서버 하나의 장기 세션 (이벤트 루프 하나에 속함)"""
+
+    def __init__(self, server_name: str, connection: Dict[str, Any], stats: ServerStats):
+        self.server_name = server_name
+        self.connection = connection
+        self.stats = stats
+        self._session = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._broken = asyncio.Event()
+        self._lock = asyncio.Lock()
+        # progressToken → 진행 중인 호출의 (도구 이름, 스트림 writer) - 도구 출력 로그 알림 전달용
+        self._writers: Dict[str, Tuple[str, Callable[[Any], None]]] = {}
+        self._tokens = itertools.count()
+
+    def _alive(self) -> bool:
+        return self._session is not None and self._task is not None and not self._task.done() and not self._broken.is_set()
+
+    async def get(self):
+        """초기화된 세션 반환 (없거나 끊겼으면 새로 연결)"""
+        if self._alive():
+            return self._session
+        async with self._lock:
+            if self._alive():
+                return self._session
+            reconnect = self._task is not None
+            await self._stop_task()
+            started = time.perf_counter()
+            ready = asyncio.get_running_loop().create_future()
+            self._stop = asyncio.Event()
+            self._broken = asyncio.Event()
+            self._task = asyncio.create_task(self._run(ready, self._stop, self._broken))
+            self._session = await ready
+            self.stats.connects += 1
+            self.stats.reconnects += reconnect
+            self.stats.last_connect_ms = round((time.perf_counter() - started) * 1000, 1)
+            return self._session
+
+    async def _run(self, ready: asyncio.Future, stop: asyncio.Event, broken: asyncio.Event) -> None:
+        kwargs = dict(self.connection.get("session_kwargs") or {})
+        kwargs["logging_callback"] = self._forward_log
+        kwargs["message_handler"] = lambda message: self._handle_message(message, broken)
+        connection = {**self.connection, "session_kwargs": kwargs}
+        try:
+            async with create_session(connection) as session:
+                await session.initialize()
+                if ready.done():
+                    # 연결을 기다리던 호출자가 취소됨
+                    return
+                ready.set_result(session)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(SessionBroken(f"{self.server_name}: {e or type(e).__name__}"))
+            else:
+                logger.info(f"MCP session to {self.server_name} closed: {e}")
+        finally:
+            broken.set()
+            if not ready.done():
+                ready.set_exception(SessionBroken(f"{self.server_name}: session closed during initialize"))
+
+    async def _handle_message(self, message: Any, broken: asyncio.Event) -> None:
+        # 응답이 아닌 예외가 수신 스트림으로 오면 전송 계층 오류 (요청 응답이 오지 않으므로 세션 폐기)
+        if isinstance(message, Exception):
+            logger.warning(f"MCP session to {self.server_name} failed: {message}")
+            broken.set()
+
+    async def _forward_log(self, params) -> None:
+        """도구 출력 로그 알림을 progressToken이 같은 호출의 스트림으로만 전달
+
+        토큰이 없거나 진행 중인 호출과 맞지 않으면 다른 대화로 섞이지 않도록 버림
+        """
+        parsed = parse_stream_logger_name(params.logger or "")
+        if parsed is None:
+            return
+        tool_name, token = parsed
+        target = self._writers.get(token) if token is not None else None
+        if target is None or target[0] != tool_name:
+            logger.debug(f"Dropping {tool_name} output without a matching call (token={token!r})")
+            return
+        try:
+            target[1]({"type": "tool_output", "tool_name": tool_name, "content": str(params.data)})
+        except Exception as e:
+            logger.debug(f"Tool output writer failed: {e}")
+
+    async def _stop_task(self) -> None:
+        task, stop = self._task, self._stop
+        self._session = None
+        self._task = None
+        if task is None:
+            return
+        if stop is not None:
+            stop.set()
+        try:
+            await asyncio.wait_for(task, CLOSE_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.CancelledError, Exception) as e:
+            logger.debug(f"MCP session to {self.server_name} did not close cleanly: {e!r}")
+
+    async def call_tool(self, tool: str, arguments: Dict[str, Any]) -> Any:
+        """progressToken을 붙여 도구 호출 - 같은 토큰의 출력 알림만 이 호출의 스트림으로 전달됨"""
+        token = f"decepticon-{next(self._tokens)}"
+        try:
+            self._writers[token] = (tool, get_stream_writer())
+        except Exception:
+            # 그래프 실행 컨텍스트 밖 (출력 스트림 없음)
+            pass
+        request = types.ClientRequest(types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(
+                name=tool, arguments=arguments, _meta=types.RequestParams.Meta(progressToken=token),
+            ),
+        ))
+        try:
+            return await self.request(lambda s: s.send_request(request, types.CallToolResult))
+        finally:
+            self._writers.pop(token, None)
+
+    async def request(self, op: Callable[[Any], Awaitable[Any]], idempotent: bool = False) -> Any:
+        """세션에서 요청 실행
+
+        요청을 보내기 전(연결/initialize 중) 실패하면 새로 연결해 한 번 재시도
+        요청 중 세션이 끊기면 idempotent 요청만 재시도하고 그 외에는 SessionBroken (에이전트가 재실행 여부 판단)
+        """
+        for attempt in range(2):
+            try:
+                session = await self.get()
+            except SessionBroken:
+                if attempt:
+                    raise
+                logger.info(f"Reconnecting MCP session to {self.server_name}")
+                continue
+            broken = self._broken
+            call = asyncio.ensure_future(op(session))
+            watch = asyncio.ensure_future(broken.wait())
+            try:
+                done, _ = await asyncio.wait({call, watch}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                watch.cancel()
+                if not call.done():
+                    call.cancel()
+            if call in done:
+                return call.result()
+            if attempt or not idempotent:
+                raise SessionBroken(
+                    f"MCP session to {self.server_name} was lost during the request "
+                    f"(it may already have run on the server)"
+                )
+            logger.info(f"Reconnecting MCP session to {self.server_name}")
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._stop_task()
+
+
+class MCPSessionManager:
+    """(이벤트 루프, 서버)별 장기 세션 + 서버별 지연 시간 통계"""
+
+    def __init__(self):
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ServerSession]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats: Dict[str, ServerStats] = {}
+
+    def session(self, server_name: str, connection: Dict[str, Any]) -> ServerSession:
+        loop = asyncio.get_running_loop()
+        label = server_label(server_name, connection)
+        sessions = self._sessions.setdefault(loop, {})
+        if label not in sessions:
+            stats = self._stats.setdefault(label, ServerStats())
+            sessions[label] = ServerSession(server_name, connection, stats)
+        return sessions[label]
+
+    async def list_tools(self, server_name: str, connection: Dict[str, Any]) -> List[Any]:
+        session = self.session(server_name, connection)
+        result = await session.request(lambda s: s.list_tools(), idempotent=True)
+        return list(result.tools)
+
+    async def call_tool(self, server_name: str, connection: Dict[str, Any], tool: str, arguments: Dict[str, Any]) -> Any:
+        session = self.session(server_name, connection)
+        stats = session.stats
+        stats.in_flight += 1
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await session.call_tool(tool, arguments)
+            failed = bool(getattr(result, "isError", False))
+            return result
+        finally:
+            stats.in_flight -= 1
+            stats.errors += failed
+            stats.latency.observe((time.perf_counter() - started) * 1000)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {label: stats.summary() for label, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 세션 모두 종료"""
+        sessions = self._sessions.pop(asyncio.get_running_loop(), {})
+        await asyncio.gather(*(s.close() for s in sessions.values()), return_exceptions=True)
+
+
+def convert_call_tool_result(result) -> Tuple[Any, Optional[List[Any]]]:
+    """MCP 도구 결과 → (텍스트 내용, 텍스트 외 내용) - 도구 오류는 ToolException"""
+    texts, artifacts = [], []
+    for content in result.content:
+        if getattr(content, "type", None) == "text":
+            texts.append(content.text)
+        else:
+            artifacts.append(content)
+    output = texts[0] if len(texts) == 1 else texts
+    if result.isError:
+        raise ToolException(output)
+    return output, artifacts or None
+
+
+def to_langchain_tool(
+    manager: "MCPSessionManager", server_name: str, connection: Dict[str, Any], tool: Any,
+) -> BaseTool:
+    """MCP 도구 정의 → 장기 세션으로 호출하는 LangChain 도구"""
+
+    async def call_tool(**arguments: Any) -> Tuple[Any, Optional[List[Any]]]:
+        result = await manager.call_tool(server_name, connection, tool.name, arguments)
+        return convert_call_tool_result(result)
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description or "",
+        args_schema=tool.inputSchema,
+        coroutine=call_tool,
+        response_format="content_and_artifact",
+    )
+
+
+_manager: Optional[MCPSessionManager] = None
+
+
+def get_mcp_sessions() -> MCPSessionManager:
+    """전역 MCP 세션 관리자 반환"""
+    global _manager
+    if _manager is None:
+        _manager = MCPSessionManager()
+    return _manager
@@ -1,6 +1,6 @@
 import re
 
-from langchain_core.messages import ToolMessage
+from langchain_core.messages import AnyMessage, HumanMessage, ToolMessage
 from langchain_core.tools import BaseTool, InjectedToolCallId, tool
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import InjectedState, ToolNode
@@ -16,6 +16,26 @@ def _normalize_agent_name(agent_name: str) -> str:
     return WHITESPACE_RE.sub("_", agent_name.strip()).lower()
 
 
+def _is_turn_start(message: AnyMessage) -> bool:
+    """Whether the message starts an agent turn (user input or a handoff into the agent)."""
+    if isinstance(message, HumanMessage):
+        return True
+    return isinstance(message, ToolMessage) and METADATA_KEY_HANDOFF_DESTINATION in message.response_metadata
+
+
+def get_turn_messages(messages: list[AnyMessage]) -> list[AnyMessage]:
+    """Return the messages the current agent added since its turn started.
+
+    Everything up to and including the message that started the turn is already
+    in the parent graph's state, so a handoff only needs to send the rest.
+    Falls back to the full list if no turn start is found.
+    """
+    for index in range(len(messages) - 1, -1, -1):
+        if _is_turn_start(messages[index]):
+            return messages[index + 1:]
+    return messages
+
+
 def create_handoff_tool(
     *, agent_name: str, name: str | None = None, description: str | None = None
 ) -> BaseTool:
@@ -48,11 +68,15 @@ def create_handoff_tool(
             content=f"Successfully transferred to {agent_name}",
             name=name,
             tool_call_id=tool_call_id,
+            response_metadata={METADATA_KEY_HANDOFF_DESTINATION: agent_name},
         )
+        # Only send this agent's turn (its tool calls and results) plus the handoff message:
+        # the rest of the history is already in the parent state, and re-sending it makes
+        # every handoff cost O(history) in the add_messages reducer and checkpoint writes.
         return Command(
             goto=agent_name,
             graph=Command.PARENT,
-            update={"messages": state["messages"] + [tool_message], "active_agent": agent_name},
+            update={"messages": get_turn_messages(state["messages"]) + [tool_message], "active_agent": agent_name},
         )
 
     handoff_to_agent.metadata = {METADATA_KEY_HANDOFF_DESTINATION: agent_name}
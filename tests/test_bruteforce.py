@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from src.utils.container.bruteforce import ConnectionBudget, run_sharded_hydra, target_key, with_tasks
+
+
+@pytest.mark.parametrize("target, options, key", [
+    ("ssh://10.0.0.5", "", "10.0.0.5:/ssh"),
+    ("ssh://10.0.0.5:2222", "", "10.0.0.5:2222/ssh"),
+    ("10.0.0.5 http-post-form \"/login:u=^USER^&p=^PASS^:F=failed\"", "-s 8080", "10.0.0.5:8080/http-post-form"),
+])
+def test_target_key(target, options, key):
+    assert target_key(target, options) == key
+
+
+def test_with_tasks_replaces_t():
+    assert with_tasks("-f -t 64 -V", 4).split() == ["-f", "-V", "-t", "4"]
+
+
+class FakeRunner:
+    """hydra 대신 -t 값을 기록하고 잠시 대기"""
+
+    def __init__(self):
+        self.tasks = []
+        self.release = asyncio.Event()
+
+    async def run(self, command, tool, on_output=None, timeout=None):
+        self.tasks.append(int(command.split(" -t ")[1].split()[0]))
+        await self.release.wait()
+        return ""
+
+
+def test_concurrent_calls_share_target_budget():
+    async def run():
+        budget = ConnectionBudget(limit=8)
+        runner = FakeRunner()
+        common = dict(login="root", password_file="/tmp/p.txt", shards=2, budget=budget)
+        first = asyncio.ensure_future(run_sharded_hydra(runner, "ssh://10.0.0.5", max_connections=6, **common))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(run_sharded_hydra(runner, "ssh://10.0.0.5", **common))
+        await asyncio.sleep(0.01)
+        assert budget.in_use("10.0.0.5:/ssh") == 8
+        third = asyncio.ensure_future(run_sharded_hydra(runner, "ssh://10.0.0.5", **common))
+        await asyncio.sleep(0.01)
+        # 예산이 모두 사용 중이면 대기
+        assert len(runner.tasks) == 4
+        runner.release.set()
+        results = await asyncio.gather(first, second, third)
+        assert budget.in_use("10.0.0.5:/ssh") == 0
+        return results
+
+    first, second, third = asyncio.run(run())
+    assert first["connections"]["total"] == 6
+    assert second["connections"]["total"] == 2
+    assert third["connections"]["queued_seconds"] >= 0
+    assert third["shards"]["completed"] == 2
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import shutil
+
+import pytest
+
+from src.utils.container.exploitdb import ExploitIndex, SearchsploitEngine, extract_version_ranges
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "exploitdb")
+
+
+@pytest.fixture(scope="module")
+def index():
+    return ExploitIndex.from_csv(os.path.join(FIXTURE_DIR, "files_exploits.csv"))
+
+
+def titles(rows):
+    return [row["description"] for row in rows]
+
+
+def test_range_products():
+    ranges = extract_version_ranges("Apache Tomcat < 9.0.1 (Beta) / < 8.5.23 / < 8.0.47 / < 7.0.8 - JSP Upload Bypass")
+    assert [r.product for r in ranges] == ["tomcat"] * 4
+    assert extract_version_ranges("OpenSSH 2.3 < 7.7 - Username Enumeration")[0].product == "openssh"
+
+
+@pytest.mark.parametrize("query", ["OpenSSH 7.4", "openssh 7.2p2", "ssh 7.2p2"])
+def test_version_in_product_range(index, query):
+    assert titles(index.search(query)) == ["OpenSSH 2.3 < 7.7 - Username Enumeration"]
+
+
+def test_version_outside_range(index):
+    assert index.search("OpenSSH 7.8p1") == []
+
+
+def test_range_belongs_to_other_product(index):
+    # "apache"는 Tomcat 범위 바로 앞 단어가 아님
+    result = titles(index.search("apache 2.4.49"))
+    assert "Apache HTTP Server 2.4.49 - Path Traversal & Remote Code Execution (RCE)" in result
+    assert not any("Tomcat" in title for title in result)
+    assert titles(index.search("apache 2.4.20")) == [
+        "Apache 2.4.17 < 2.4.38 - 'apache2ctl graceful' 'logrotate' Local Privilege Escalation"
+    ]
+
+
+def test_chained_ranges_inherit_product(index):
+    assert titles(index.search("tomcat 8.5.20")) == [
+        "Apache Tomcat < 9.0.1 (Beta) / < 8.5.23 / < 8.0.47 / < 7.0.8 - JSP Upload Bypass / Remote Code Execution (2)"
+    ]
+
+
+def test_version_without_product_is_literal(index):
+    assert titles(index.search("2.4.49")) == [
+        "Apache HTTP Server 2.4.49 - Path Traversal & Remote Code Execution (RCE)"
+    ]
+    assert titles(index.search("2.3.4")) == ["vsftpd 2.3.4 - Backdoor Command Execution (Metasploit)"]
+
+
+def test_major_only_version_is_literal(index):
+    assert titles(index.search("windows 7")) == ["Microsoft Windows 7 SP1 - Kernel Pool Overflow"]
+
+
+def test_rebuilds_only_when_mtime_changes(tmp_path):
+    for name in ("files_exploits.csv", "files_shellcodes.csv"):
+        shutil.copy(os.path.join(FIXTURE_DIR, name), tmp_path / name)
+    engine = SearchsploitEngine(csv_dir=str(tmp_path))
+
+    async def run():
+        first = await engine.search("vsftpd 2.3.4")
+        builds = engine.get_stats()["builds"]
+        await engine.search("vsftpd 2.3.4")
+        assert engine.get_stats()["builds"] == builds
+
+        path = tmp_path / "files_exploits.csv"
+        with open(path, "a") as f:
+            f.write("99999,exploits/unix/remote/99999.py,vsftpd 2.3.4 - Second Backdoor,2024-01-01,x,remote,unix,21,"
+                    "2024-01-01,2024-01-01,0,,,,,,\n")
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        second = await engine.search("vsftpd 2.3.4")
+        assert engine.get_stats()["builds"] == builds + 1
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert "Second Backdoor" not in first
+    assert "Second Backdoor" in second
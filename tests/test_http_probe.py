@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+
+from src.utils.container.http_probe import HttpProber
+
+REDIRECT_BODY = b"<html><head><title>301 Moved Permanently</title></head></html>\n"
+DIRECTORIES = {"admin", "images", "uploads"}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path.strip("/")
+    if path in DIRECTORIES:
+        # nginx: 모든 디렉터리에 같은 301 본문, Location만 다름
+        return httpx.Response(301, content=REDIRECT_BODY, headers={"location": f"/{path}/"})
+    if path == "index.php":
+        return httpx.Response(200, content=b"<title>home</title>")
+    return httpx.Response(404, content=b"not found")
+
+
+def run_probe(paths, concurrency=3, on_fetch=None):
+    prober = HttpProber(concurrency=concurrency)
+    prober._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    if on_fetch:
+        fetch = prober.fetch
+
+        async def observed_fetch(url, **kwargs):
+            on_fetch()
+            return await fetch(url, **kwargs)
+
+        prober.fetch = observed_fetch
+
+    async def run():
+        try:
+            return await prober.probe("http://target/", paths, concurrency=concurrency)
+        finally:
+            await prober.aclose()
+
+    return asyncio.run(run())
+
+
+def test_redirects_to_different_locations_are_kept():
+    result = run_probe(sorted(DIRECTORIES) + ["index.php", "missing"])
+    locations = sorted(r.get("location") for r in result["interesting"] if r["status"] == 301)
+    assert locations == ["/admin/", "/images/", "/uploads/"]
+    assert result["filtered"]["duplicate"] == 0
+    assert result["filtered"]["status"] == 1
+
+
+def test_large_wordlist_uses_fixed_workers():
+    peak_tasks = []
+    result = run_probe(
+        [f"missing{i}" for i in range(500)], concurrency=4,
+        on_fetch=lambda: peak_tasks.append(len(asyncio.all_tasks())),
+    )
+    assert result["requests"] == 500
+    assert result["filtered"]["status"] == 500
+    # 메인 태스크 + 워커 4개 (URL 수와 무관)
+    assert max(peak_tasks) <= 5